@@ -0,0 +1,9 @@
+from django.views.decorators.http import require_GET
+from ambulance_management.async_api import async_login_required, json_response
+from .serializers import UserSerializer
+
+@require_GET
+@async_login_required
+async def user_profile(request):
+    """Get current user's profile (async)"""
+    return json_response(UserSerializer(request.user).data)
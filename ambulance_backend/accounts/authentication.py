@@ -0,0 +1,54 @@
+import copy
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from ambulance_management.lru import ExpiringLRUCache
+
+# token key -> (user, token); entries are dropped by the signal handlers in
+# accounts.signals when a token is deleted or its user changes. Changes made
+# in other processes or with QuerySet.update() send no signal here, so every
+# hit is also checked against the user's AUTH_FIELDS in the database.
+token_cache = ExpiringLRUCache(
+    getattr(settings, 'TOKEN_AUTH_CACHE_SIZE', 4096),
+    getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 300)
+)
+
+# The user fields that decide what a request may do
+AUTH_FIELDS = ('role', 'is_active', 'active', 'is_staff', 'is_superuser')
+
+def auth_stamp(user):
+    return tuple(getattr(user, field) for field in AUTH_FIELDS)
+
+def evict_user(user_id):
+    """Forget every cached token that belongs to the given user"""
+    return token_cache.evict(lambda key, value: value[0].pk == user_id)
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that keeps the token -> user mapping in memory.
+    After the first hit a request only reads AUTH_FIELDS through the token's
+    primary key instead of loading the full Token and User rows. A deleted
+    token or a changed role or active flag fails that check and reloads.
+    Users switched off with `User.active` are rejected like inactive ones.
+    """
+    
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            current = self.get_model().objects.filter(key=key).values_list(
+                *(f'user__{field}' for field in AUTH_FIELDS)
+            ).first()
+            if current != auth_stamp(cached[0]):
+                token_cache.pop(key)
+                cached = None
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            if not user.active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+            cached = (user, token)
+            token_cache.set(key, cached)
+        
+        user, token = cached
+        # Each request gets its own instance so changes to request.user never leak between requests
+        return copy.copy(user), token
@@ -3,6 +3,8 @@ from django.utils import timezone
 from datetime import date, timedelta
 from accounts.models import User
 from ambulances.models import Ambulance
+from hospitals.models import Hospital
+from inventory.models import AmbulanceStock, Consumable
 from patients.models import Patient
 
 class Command(BaseCommand):
@@ -169,6 +171,23 @@ class Command(BaseCommand):
         ]
         
         for patient_data in patients_data:
+            hospital, created = Hospital.objects.get_or_create(
+                name=patient_data['hospital_name'],
+                defaults={
+                    'address': patient_data['destination_address'],
+                    'latitude': patient_data['destination_latitude'],
+                    'longitude': patient_data['destination_longitude'],
+                    'specialties': ['emergency'],
+                    'total_beds': 200,
+                    'available_beds': 25,
+                    'ed_capacity': 30,
+                    'ed_available': 8,
+                }
+            )
+            if created:
+                self.stdout.write(f'Created hospital: {hospital.name}')
+            patient_data['hospital'] = hospital
+            
             patient, created = Patient.objects.get_or_create(
                 name=patient_data['name'],
                 defaults=patient_data
@@ -176,4 +195,30 @@ class Command(BaseCommand):
             if created:
                 self.stdout.write(f'Created patient: {patient.name}')
         
+        # Create consumables and stock every ambulance to its par level
+        consumables_data = [
+            {'name': 'Nitrile Gloves (pair)', 'unit': 'pairs', 'per_trip_usage': 4, 'default_min_level': 20, 'default_par_level': 100},
+            {'name': 'Saline 500ml', 'unit': 'bags', 'per_trip_usage': 1, 'default_min_level': 4, 'default_par_level': 12},
+            {'name': 'Gauze Pads', 'unit': 'pcs', 'per_trip_usage': 2, 'default_min_level': 10, 'default_par_level': 50},
+            {'name': 'Oxygen Mask', 'unit': 'pcs', 'per_trip_usage': 1, 'default_min_level': 3, 'default_par_level': 10},
+        ]
+        
+        for consumable_data in consumables_data:
+            consumable, created = Consumable.objects.get_or_create(
+                name=consumable_data['name'],
+                defaults=consumable_data
+            )
+            if created:
+                self.stdout.write(f'Created consumable: {consumable.name}')
+            for ambulance in created_ambulances:
+                AmbulanceStock.objects.get_or_create(
+                    ambulance=ambulance,
+                    consumable=consumable,
+                    defaults={
+                        'quantity': consumable.default_par_level,
+                        'min_level': consumable.default_min_level,
+                        'par_level': consumable.default_par_level,
+                    }
+                )
+        
         self.stdout.write(self.style.SUCCESS('Successfully populated database with sample data!'))
@@ -1,8 +1,9 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('users/', views.UserListCreateView.as_view(), name='user-list-create'),
     path('users/<int:pk>/', views.UserDetailView.as_view(), name='user-detail'),
     path('profile/', views.user_profile, name='user-profile'),
+    path('async/profile/', async_views.user_profile, name='async-user-profile'),
 ]
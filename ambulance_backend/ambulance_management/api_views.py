@@ -33,6 +33,42 @@ def api_root(request):
                 'detail': '/api/patients/{id}/',
                 'description': 'Patient management'
             },
+            'hospitals': {
+                'list': '/api/hospitals/',
+                'detail': '/api/hospitals/{id}/',
+                'capacity': '/api/hospitals/{id}/capacity/',
+                'recommend': '/api/hospitals/recommend/?latitude=&longitude=&specialty=',
+                'description': 'Hospital directory, live capacity and destination recommendations'
+            },
+            'sync': {
+                'url': '/api/sync/',
+                'description': 'POST queued device mutations and receive changes since the last sync_token'
+            },
+            'inventory': {
+                'consumables': '/api/inventory/consumables/',
+                'stock': '/api/inventory/stock/',
+                'restock': '/api/inventory/restock/',
+                'low_stock': '/api/inventory/low-stock/',
+                'description': 'Per-ambulance consumable stock, restocks and low-stock alerts'
+            },
+            'roster': {
+                'shifts': '/api/roster/shifts/',
+                'on_duty': '/api/roster/on-duty/?at=',
+                'crewed': '/api/roster/crewed/?at=',
+                'description': 'Crew shift roster and who is on which ambulance'
+            },
+            'jobs': {
+                'list': '/api/jobs/',
+                'detail': '/api/jobs/{id}/',
+                'description': 'Queue background jobs and poll their status and results'
+            },
+            'async': {
+                'available_ambulances': '/api/async/ambulances/available/',
+                'pending_calls': '/api/async/emergency-calls/pending/',
+                'active_trips': '/api/async/trips/active/',
+                'profile': '/api/async/profile/',
+                'description': 'Streaming async versions of the hot read endpoints, for ASGI deployments'
+            },
             'admin': {
                 'url': '/admin/',
                 'description': 'Django admin interface'
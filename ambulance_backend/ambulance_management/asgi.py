@@ -2,6 +2,9 @@
 ASGI config for ambulance_management project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with any ASGI server (e.g. ``uvicorn ambulance_management.asgi:application``)
+to get the streaming async endpoints under /api/async/ without tying up a
+worker per request; see ambulance_management.async_api.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -0,0 +1,96 @@
+"""
+Shared plumbing for the async (ASGI) read endpoints.
+
+DRF views are synchronous. Under WSGI a slow client holds a worker for the
+whole response, and under ASGI every sync view shares one thread. The
+views in each app's async_views.py are plain Django coroutines instead.
+They authenticate with the API's own authentication classes, read with
+the async ORM and stream their JSON, so a request waiting on the database
+or on a slow client only costs a suspended coroutine.
+
+Output is byte-for-byte that of the synchronous endpoints. Rows go through
+the same serializers and DRF's JSONRenderer. Callers select_related
+everything those serializers read, so serialization never queries from
+the event loop.
+"""
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+JSON_CONTENT_TYPE = 'application/json'
+STREAM_BATCH_SIZE = 100
+
+_renderer = JSONRenderer()
+
+def render_json(data):
+    return _renderer.render(data)
+
+def json_response(data, status=200, headers=None):
+    return HttpResponse(render_json(data), status=status, content_type=JSON_CONTENT_TYPE, headers=headers)
+
+def _authenticate(request):
+    """Resolve the user as DRF would; returns an error response or None"""
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        user = drf_request.user
+    except exceptions.AuthenticationFailed as error:
+        user, failure = None, error
+    else:
+        failure = exceptions.NotAuthenticated()
+    if user is not None and user.is_authenticated:
+        request.user = user
+        return None
+    # DRF answers 401 when the first authenticator names a scheme, 403 otherwise
+    challenge = drf_request.authenticators[0].authenticate_header(drf_request) if drf_request.authenticators else None
+    if challenge:
+        return json_response({'detail': failure.detail}, status=401, headers={'WWW-Authenticate': challenge})
+    return json_response({'detail': failure.detail}, status=403)
+
+def async_login_required(view):
+    """Authenticate an async view like a DRF view with IsAuthenticated"""
+    
+    @wraps(view)
+    async def wrapped(request, *args, **kwargs):
+        error = await sync_to_async(_authenticate)(request)
+        if error is not None:
+            return error
+        return await view(request, *args, **kwargs)
+    
+    return wrapped
+
+async def _batches(rows, size):
+    batch = []
+    if isinstance(rows, QuerySet):
+        async for row in rows:
+            batch.append(row)
+            if len(batch) == size:
+                yield batch
+                batch = []
+    else:
+        for row in rows:
+            batch.append(row)
+            if len(batch) == size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+async def _json_array(rows, serializer_class, batch_size):
+    yield b'['
+    first = True
+    async for batch in _batches(rows, batch_size):
+        items = [render_json(item) for item in serializer_class(batch, many=True).data]
+        yield (b',' if not first else b'') + b','.join(items)
+        first = False
+    yield b']'
+
+def stream_json_list(rows, serializer_class, batch_size=STREAM_BATCH_SIZE):
+    """Stream `rows` (a queryset or a list of instances) as the JSON array `serializer_class(rows, many=True)` renders to"""
+    return StreamingHttpResponse(
+        _json_array(rows, serializer_class, batch_size), content_type=JSON_CONTENT_TYPE
+    )
@@ -0,0 +1,195 @@
+"""
+Compiled read-only serializers for list endpoints.
+
+Serializing a list with a ModelSerializer costs more than the query.
+DRF deep-copies the declared fields for each serializer instance. Per
+row it then resolves every source with getattr, builds nested model
+instances and calls each field's to_representation. That adds up when a
+page of calls nests an ambulance, its crew's names, a dispatcher and a
+patient.
+
+compiled_serializer() reads a serializer's fields once and generates a
+plain function. It turns one ``values_list()`` tuple into the dict the
+serializer would have produced. Nested ModelSerializers on forward
+relations become joins into the same tuple. ``<relation>.get_full_name``
+sources read first_name and last_name. Fields whose representation is
+the database value itself (text, integers, primary keys, JSON) are
+copied as they are. Every other field still goes through its own
+to_representation, so dates, times and decimals render exactly as DRF
+renders them.
+
+A serializer that uses anything else cannot be compiled, for example a
+SerializerMethodField, a reverse relation or a custom source.
+compiled_serializer() then returns None and callers fall back to DRF.
+"""
+from functools import lru_cache
+from django.contrib.auth.models import AbstractUser
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.response import Response
+
+class NotCompilable(Exception):
+    pass
+
+def _identity_representation(field, model_field):
+    """Whether `field` renders values of `model_field` unchanged"""
+    representation = type(field).to_representation
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None or representation is not serializers.PrimaryKeyRelatedField.to_representation:
+            raise NotCompilable(f'{field.field_name}: custom primary key representation')
+        # values_list() already yields the related primary key
+        return True
+    if model_field.is_relation:
+        raise NotCompilable(f'{field.field_name}: relation rendered by {type(field).__name__}')
+    if representation is serializers.ReadOnlyField.to_representation:
+        return True
+    if representation is serializers.CharField.to_representation:
+        return isinstance(model_field, (models.CharField, models.TextField))
+    if representation is serializers.IntegerField.to_representation:
+        return isinstance(model_field, models.IntegerField)
+    if representation is serializers.ChoiceField.to_representation:
+        return isinstance(model_field, models.CharField) and all(isinstance(key, str) for key in field.choices)
+    if representation is serializers.JSONField.to_representation:
+        return not field.binary
+    return False
+
+def _model_field(model, name):
+    try:
+        model_field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        raise NotCompilable(f'{model.__name__}.{name} is not a model field')
+    if not model_field.concrete or model_field.many_to_many:
+        raise NotCompilable(f'{model.__name__}.{name} is not a column')
+    return model_field
+
+def _forward_relation(model, name):
+    model_field = _model_field(model, name)
+    if not (model_field.many_to_one or model_field.one_to_one):
+        raise NotCompilable(f'{model.__name__}.{name} is not a forward relation')
+    return model_field
+
+class _Compiler:
+    def __init__(self):
+        self.lookups = []
+        self.columns = {}
+        self.namespace = {}
+        self.sources = []
+    
+    def column(self, lookup):
+        """Expression for `lookup` within the row tuple"""
+        if lookup not in self.columns:
+            self.columns[lookup] = f'row[{len(self.lookups)}]'
+            self.lookups.append(lookup)
+        return self.columns[lookup]
+    
+    def constant(self, value):
+        name = f'_convert{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+    
+    def compile(self, serializer, prefix=''):
+        """Generate the function for `serializer` on the model reached through `prefix`; returns its name"""
+        if not isinstance(serializer, serializers.ModelSerializer):
+            raise NotCompilable(f'{type(serializer).__name__} is not a ModelSerializer')
+        model = serializer.Meta.model
+        index = len(self.sources)
+        name = f'_serialize{index}'
+        self.sources.append(None)
+        lines = ['item = {}']
+        
+        for field in serializer._readable_fields:
+            key = repr(field.field_name)
+            source = field.source_attrs
+            if isinstance(field, serializers.BaseSerializer):
+                if len(source) != 1:
+                    raise NotCompilable(f'{field.field_name}: nested serializer on {field.source!r}')
+                relation = _forward_relation(model, source[0])
+                if not isinstance(field, serializers.ModelSerializer) or field.Meta.model is not relation.related_model:
+                    raise NotCompilable(f'{field.field_name}: nested {type(field).__name__}')
+                nested = self.compile(field, f'{prefix}{relation.name}__')
+                foreign_key = self.column(prefix + relation.name)
+                lines.append(f'item[{key}] = None if {foreign_key} is None else {nested}(row)')
+            elif len(source) == 2 and source[1] == 'get_full_name':
+                relation = _forward_relation(model, source[0])
+                if getattr(relation.related_model, 'get_full_name', None) is not AbstractUser.get_full_name:
+                    raise NotCompilable(f'{field.field_name}: custom get_full_name')
+                foreign_key = self.column(prefix + relation.name)
+                first_name = self.column(f'{prefix}{relation.name}__first_name')
+                last_name = self.column(f'{prefix}{relation.name}__last_name')
+                # DRF skips a read-only field whose source cannot be reached
+                lines.append(f'if {foreign_key} is not None:')
+                lines.append(f"    item[{key}] = ('%s %s' % ({first_name}, {last_name})).strip()")
+            elif len(source) == 1:
+                model_field = _model_field(model, source[0])
+                value = self.column(prefix + model_field.name)
+                if _identity_representation(field, model_field):
+                    lines.append(f'item[{key}] = {value}')
+                else:
+                    convert = self.constant(field.to_representation)
+                    lines.append(f'item[{key}] = None if {value} is None else {convert}({value})')
+            else:
+                raise NotCompilable(f'{field.field_name}: source {field.source!r}')
+        
+        lines.append('return item')
+        self.sources[index] = (
+            f'def {name}(row):\n' + ''.join(f'    {line}\n' for line in lines)
+        )
+        return name
+
+class CompiledSerializer:
+    """A serializer class compiled to a function over `values_list(*lookups)` rows"""
+    
+    def __init__(self, serializer_class, lookups, function, source):
+        self.serializer_class = serializer_class
+        self.lookups = lookups
+        self.function = function
+        self.source = source
+    
+    def rows(self, queryset):
+        return queryset.values_list(*self.lookups)
+    
+    def many(self, rows):
+        serialize = self.function
+        return [serialize(row) for row in rows]
+    
+    def __call__(self, row):
+        return self.function(row)
+
+def compile_serializer(serializer_class):
+    """Compile `serializer_class`; raises NotCompilable when a field cannot be expressed over rows"""
+    compiler = _Compiler()
+    name = compiler.compile(serializer_class())
+    source = '\n'.join(compiler.sources)
+    namespace = dict(compiler.namespace)
+    exec(compile(source, f'<compiled {serializer_class.__name__}>', 'exec'), namespace)
+    return CompiledSerializer(serializer_class, tuple(compiler.lookups), namespace[name], source)
+
+@lru_cache(maxsize=None)
+def compiled_serializer(serializer_class):
+    """The cached compiled form of `serializer_class`, or None when it cannot be compiled"""
+    try:
+        return compile_serializer(serializer_class)
+    except NotCompilable:
+        return None
+
+def serialize_list(serializer_class, queryset):
+    """`serializer_class(queryset, many=True).data`, through the compiled form when there is one"""
+    compiled = compiled_serializer(serializer_class)
+    if compiled is None:
+        return serializer_class(queryset, many=True).data
+    return compiled.many(compiled.rows(queryset))
+
+class CompiledListMixin:
+    """Serve a generic view's list() from compiled rows instead of model instances"""
+    
+    def list(self, request, *args, **kwargs):
+        compiled = compiled_serializer(self.get_serializer_class())
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+        
+        rows = compiled.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.many(page))
+        return Response(compiled.many(rows))
@@ -0,0 +1,119 @@
+"""
+Database configuration profiles.
+
+settings.DATABASES is built here from the environment, read with
+python-decouple so a .env file works too. DATABASE_PROFILE selects one of:
+
+* ``sqlite`` (default): the SQLite file at SQLITE_PATH, tuned for many
+  concurrent writers. The tuning is WAL journaling, so readers never block
+  the writer, and a busy timeout, so writers queue instead of failing with
+  "database is locked". It also enables memory-mapped reads and
+  synchronous=NORMAL. In WAL mode that setting survives application
+  crashes and can only lose the last commits on power loss. Write
+  transactions begin IMMEDIATE so two writers cannot deadlock upgrading a
+  read lock.
+* ``sqlite-basic``: the same file with SQLite's defaults, kept as the
+  baseline for the benchmark_location_pings command.
+* ``postgres``: the POSTGRES_* connection settings, with persistent
+  connections (DATABASE_CONN_MAX_AGE) and health checks. When
+  DATABASE_POOL is set and psycopg_pool is installed, it uses psycopg's
+  connection pool instead of persistent connections.
+
+Each profile also defines the ``replica`` alias used by
+ambulance_management.db_routers. For SQLite that is a read-only
+connection to the same file. For Postgres it is POSTGRES_REPLICA_HOST,
+and the alias is left out when that is unset.
+
+SQLite pragmas live under the SQLITE_PRAGMAS key of a database's
+settings. They are applied to every new connection by the
+connection_created hook below.
+"""
+from importlib.util import find_spec
+from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+PROFILES = ('sqlite', 'sqlite-basic', 'postgres')
+
+def sqlite_pragmas(read_only=False):
+    pragmas = {
+        'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),  # milliseconds
+        'mmap_size': config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),  # bytes
+        'cache_size': -config('SQLITE_CACHE_KB', default=20000, cast=int),  # negative means KiB
+        'temp_store': 'MEMORY',
+    }
+    # The journal mode is a property of the file, set by the writable connection
+    if not read_only:
+        pragmas['journal_mode'] = 'WAL'
+        pragmas['synchronous'] = 'NORMAL'
+    return pragmas
+
+def sqlite_database(path, tuned=True):
+    database = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+    }
+    if tuned:
+        database['OPTIONS'] = {'transaction_mode': 'IMMEDIATE'}
+        database['SQLITE_PRAGMAS'] = sqlite_pragmas()
+    return database
+
+def sqlite_replica(path, tuned=True):
+    database = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{path}?mode=ro',
+        'TEST': {'MIRROR': 'default'},
+    }
+    if tuned:
+        database['SQLITE_PRAGMAS'] = sqlite_pragmas(read_only=True)
+    return database
+
+def postgres_database(host=None):
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('POSTGRES_DB', default='ambulance_management'),
+        'USER': config('POSTGRES_USER', default='postgres'),
+        'PASSWORD': config('POSTGRES_PASSWORD', default=''),
+        'HOST': host or config('POSTGRES_HOST', default='localhost'),
+        'PORT': config('POSTGRES_PORT', default='5432'),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+    # Django's pool needs psycopg 3 with psycopg_pool, and replaces persistent connections
+    if config('DATABASE_POOL', default=False, cast=bool) and find_spec('psycopg_pool') is not None:
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = {
+            'min_size': config('DATABASE_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DATABASE_POOL_MAX_SIZE', default=20, cast=int),
+        }
+    else:
+        database['CONN_MAX_AGE'] = config('DATABASE_CONN_MAX_AGE', default=60, cast=int)
+    return database
+
+def database_settings(profile, base_dir):
+    """DATABASES for a profile"""
+    if profile in ('sqlite', 'sqlite-basic'):
+        path = config('SQLITE_PATH', default=str(base_dir / 'db.sqlite3'))
+        tuned = profile == 'sqlite'
+        return {
+            'default': sqlite_database(path, tuned),
+            'replica': sqlite_replica(path, tuned),
+        }
+    if profile == 'postgres':
+        databases = {'default': postgres_database()}
+        replica_host = config('POSTGRES_REPLICA_HOST', default='')
+        if replica_host:
+            databases['replica'] = postgres_database(replica_host)
+            databases['replica']['TEST'] = {'MIRROR': 'default'}
+        return databases
+    raise ImproperlyConfigured(f"DATABASE_PROFILE must be one of {', '.join(PROFILES)}, not {profile!r}")
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = connection.settings_dict.get('SQLITE_PRAGMAS') or {}
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,145 @@
+"""
+Primary/replica routing for report queries.
+
+Report and export code runs inside ``use_replica()`` (a context manager
+that also works as a decorator), and the ORM reads made there go to the
+``replica`` database. Everything else, dispatch reads included, and every
+write go to ``default``. Heavy aggregates therefore never compete with
+call assignment for the primary.
+
+A replica lags behind the primary, so reads fall back to the primary
+where they could miss a user's own changes:
+
+* once a ``use_replica()`` block writes, its later reads stay on the
+  primary;
+* ReadYourWritesMiddleware pins a user to the primary for
+  DATABASE_REPLICA_PIN_SECONDS after each successful mutating request.
+  The pin is a short-lived signed cookie that names the user, so it holds
+  whichever worker serves the next request.
+
+Without a ``replica`` entry in DATABASES, or when it mirrors ``default``
+under the test runner, every read goes to ``default``.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+MUTATING_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+PIN_COOKIE = 'primary_pin'
+PIN_SALT = 'ambulance_management.db_routers.pin'
+
+# Where reads go in the current context: None (default routing), 'replica' or 'primary'
+_read_target = ContextVar('read_target', default=None)
+# The request being handled, so use_replica() can honour its user's pin
+_current_request = ContextVar('current_request', default=None)
+
+def pin_seconds():
+    return getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 5)
+
+def replica_alias():
+    """The alias replica reads go to: `replica`, or `default` when there is no separate replica"""
+    if REPLICA_DB_ALIAS not in settings.DATABASES:
+        return DEFAULT_DB_ALIAS
+    # Under the test runner the replica mirrors default; a second connection would not see the test's transaction
+    if connections[REPLICA_DB_ALIAS].settings_dict['NAME'] == connections[DEFAULT_DB_ALIAS].settings_dict['NAME']:
+        return DEFAULT_DB_ALIAS
+    return REPLICA_DB_ALIAS
+
+def _request_pinned():
+    request = _current_request.get()
+    user = getattr(request, 'user', None) if request is not None else None
+    if user is None or not user.is_authenticated:
+        return False
+    # The signature carries the time it was set, so an old cookie no longer pins
+    pinned_user = request.get_signed_cookie(PIN_COOKIE, default=None, salt=PIN_SALT, max_age=pin_seconds())
+    return pinned_user == str(user.pk)
+
+@contextmanager
+def use_replica():
+    """Send the reads made inside the block to the replica, unless the caller must read its own writes"""
+    if _read_target.get() == 'primary' or _request_pinned():
+        target = 'primary'
+    else:
+        target = 'replica'
+    token = _read_target.set(target)
+    try:
+        yield
+    finally:
+        _read_target.reset(token)
+
+@contextmanager
+def use_primary():
+    """Keep the reads made inside the block on the primary, even within use_replica()"""
+    token = _read_target.set('primary')
+    try:
+        yield
+    finally:
+        _read_target.reset(token)
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _read_target.get() == 'replica':
+            return replica_alias()
+        return DEFAULT_DB_ALIAS
+    
+    def db_for_write(self, model, **hints):
+        # Whatever the block reads next must see this write
+        if _read_target.get() == 'replica':
+            _read_target.set('primary')
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica follows the primary's schema; it is never migrated directly
+        if db == REPLICA_DB_ALIAS:
+            return False
+        return None
+
+class ReadYourWritesMiddleware:
+    """Pin a user's reads to the primary for a few seconds after each of their successful writes"""
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        self.pin_writer(request, response)
+        return response
+    
+    async def __acall__(self, request):
+        token = _current_request.set(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        self.pin_writer(request, response)
+        return response
+    
+    def pin_writer(self, request, response):
+        # DRF copies the authenticated user (token or session) onto the Django request
+        user = getattr(request, 'user', None)
+        if (
+            request.method in MUTATING_METHODS
+            and response.status_code < 400
+            and user is not None and user.is_authenticated
+        ):
+            response.set_signed_cookie(
+                PIN_COOKIE, str(user.pk), salt=PIN_SALT, max_age=pin_seconds(),
+                secure=request.is_secure(), httponly=True, samesite='Lax'
+            )
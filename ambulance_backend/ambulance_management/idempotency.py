@@ -0,0 +1,170 @@
+"""
+Idempotency-Key support for mutating endpoints.
+
+A client that retries a request sends the same `Idempotency-Key` header.
+The first request inserts a sync.IdempotencyRecord row for the key, and the
+unique constraint makes that insert the claim. It runs the view and stores
+the response (status, headers and body) in the row. Replays get that
+response back without running the view. A duplicate that arrives while the
+first request is still running polls the row until the response is stored.
+Records live in the database, so a retry that reaches another worker is
+still answered from the first response.
+"""
+import hashlib
+import threading
+import time
+from datetime import timedelta
+from functools import wraps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from sync.models import IdempotencyRecord
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MUTATING_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+# How often a waiting duplicate re-reads the claim, and how often expired records are pruned
+POLL_INTERVAL = 0.05
+PRUNE_INTERVAL = 60
+
+class IdempotencyStore:
+    """Claims and stored responses in the IdempotencyRecord table"""
+    
+    def __init__(self, ttl, wait_timeout, claim_timeout):
+        self.ttl = timedelta(seconds=ttl)
+        self.wait_timeout = wait_timeout
+        self.claim_timeout = timedelta(seconds=claim_timeout)
+        self._last_pruned = None
+        self._lock = threading.Lock()
+    
+    def claim(self, key, fingerprint):
+        """
+        Return ('owner', None) when the caller must run the view, ('cached',
+        record) when a response is stored, or ('busy', None) when another
+        request still holds the key after waiting `wait_timeout` seconds.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                with transaction.atomic():
+                    IdempotencyRecord.objects.create(key=key, fingerprint=fingerprint)
+                self._prune()
+                return 'owner', None
+            except IntegrityError:
+                pass
+            
+            record = IdempotencyRecord.objects.filter(key=key).first()
+            if record is None:
+                # Released between the insert and the read
+                continue
+            now = timezone.now()
+            expired = record.created_at < now - self.ttl
+            # A claim this old belonged to a worker that died before storing its response
+            abandoned = record.status is None and record.created_at < now - self.claim_timeout
+            if expired or abandoned:
+                IdempotencyRecord.objects.filter(pk=record.pk, created_at=record.created_at).delete()
+                continue
+            if record.status is not None:
+                return 'cached', record
+            if time.monotonic() >= deadline:
+                return 'busy', None
+            time.sleep(POLL_INTERVAL)
+    
+    def release(self, key, entry=None):
+        """Store the response for `key`, or drop the claim so the request can be retried"""
+        records = IdempotencyRecord.objects.filter(key=key, status__isnull=True)
+        if entry is None:
+            records.delete()
+        else:
+            records.update(**entry)
+    
+    def clear(self):
+        IdempotencyRecord.objects.all().delete()
+    
+    def _prune(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._last_pruned is not None and now - self._last_pruned < PRUNE_INTERVAL:
+                return
+            self._last_pruned = now
+        IdempotencyRecord.objects.filter(created_at__lt=timezone.now() - self.ttl).delete()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = IdempotencyStore(
+                    getattr(settings, 'IDEMPOTENCY_TTL', 24 * 60 * 60),
+                    getattr(settings, 'IDEMPOTENCY_WAIT_TIMEOUT', 30),
+                    getattr(settings, 'IDEMPOTENCY_CLAIM_TIMEOUT', 300)
+                )
+    return _store
+
+def _store_key(request, idempotency_key):
+    # Scope keys to the caller's credentials so one client can never replay another's response
+    credentials = request.headers.get('Authorization', '') + '|' + request.COOKIES.get(settings.SESSION_COOKIE_NAME, '')
+    return hashlib.sha256(
+        '\n'.join([credentials, request.method, request.path, idempotency_key]).encode()
+    ).hexdigest()
+
+def _replay(record):
+    response = HttpResponse(bytes(record.content), status=record.status)
+    for name, value in record.headers:
+        response[name] = value
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+def idempotent(view):
+    """Make a view honour the Idempotency-Key header on mutating requests"""
+    
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key or request.method not in MUTATING_METHODS:
+            return view(request, *args, **kwargs)
+        if len(idempotency_key) > 255:
+            return JsonResponse(
+                {'error': f'{IDEMPOTENCY_HEADER} must be at most 255 characters'},
+                status=400
+            )
+        
+        store = get_store()
+        key = _store_key(request, idempotency_key)
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+        
+        state, record = store.claim(key, fingerprint)
+        if state == 'cached':
+            if record.fingerprint != fingerprint:
+                return JsonResponse(
+                    {'error': f'{IDEMPOTENCY_HEADER} was already used with a different request body'},
+                    status=422
+                )
+            return _replay(record)
+        if state == 'busy':
+            return JsonResponse(
+                {'error': f'A request with this {IDEMPOTENCY_HEADER} is still being processed'},
+                status=409
+            )
+        
+        entry = None
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+            # Server errors are not cached so the client can retry them
+            if response.status_code < 500 and not response.streaming:
+                entry = {
+                    'status': response.status_code,
+                    'headers': list(response.items()),
+                    'content': response.content,
+                }
+            return response
+        finally:
+            store.release(key, entry)
+    
+    return wrapped
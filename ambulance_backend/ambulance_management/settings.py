@@ -11,6 +11,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+from decouple import config
+from ambulance_management.db_profiles import database_settings
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -45,6 +47,12 @@ INSTALLED_APPS = [
     'patients',
     'dispatch',
     'reports',
+    'sync',
+    'routing',
+    'hospitals',
+    'jobs',
+    'inventory',
+    'roster',
 
 ]
 
@@ -55,6 +63,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'ambulance_management.db_routers.ReadYourWritesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -82,12 +91,13 @@ WSGI_APPLICATION = 'ambulance_management.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+# Chosen by DATABASE_PROFILE: sqlite (tuned, the default), sqlite-basic or
+# postgres; see ambulance_management.db_profiles. The `replica` alias serves
+# report and export reads (see ambulance_management.db_routers).
+DATABASE_PROFILE = config('DATABASE_PROFILE', default='sqlite')
+DATABASES = database_settings(DATABASE_PROFILE, BASE_DIR)
+
+DATABASE_ROUTERS = ['ambulance_management.db_routers.PrimaryReplicaRouter']
 
 
 # Password validation
@@ -144,7 +154,7 @@ CORS_ALLOWED_ORIGINS = [
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -152,4 +162,121 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
-}
\ No newline at end of file
+}
+
+# In-process token -> user cache used by CachedTokenAuthentication; each hit still
+# rechecks the token and the user's role and active flags with one narrow query
+TOKEN_AUTH_CACHE_SIZE = 4096
+TOKEN_AUTH_CACHE_TTL = 300  # seconds
+
+# Per-user cache of the ambulance ids a crew member may see, reused only while
+# the CrewAssignmentVersion row is unchanged
+AMBULANCE_SCOPE_CACHE_SIZE = 4096
+AMBULANCE_SCOPE_CACHE_TTL = 60  # seconds
+
+# ETA engine. Point ROAD_NETWORK_FILE at a CSV edge list or an OSM extract to
+# route over real roads; without one, ETAs use straight-line distance. Run the
+# build_eta_cache command after changing the file: workers never contract it.
+ROAD_NETWORK_FILE = None
+ETA_CACHE_SIZE = 100000  # memoised node-to-node routes
+ETA_OFFROAD_SPEED_KPH = 15  # between a point and its nearest road node
+ETA_FALLBACK_SPEED_KPH = 40
+ETA_DETOUR_FACTOR = 1.3
+
+# Trip pricing by call priority: base fare plus a per-km rate ('default' covers the rest)
+TRIP_TARIFFS = {
+    'critical': {'base_fare': '80.00', 'per_km': '3.50'},
+    'high': {'base_fare': '65.00', 'per_km': '3.00'},
+    'default': {'base_fare': '50.00', 'per_km': '2.50'},
+}
+
+# Geohash length used to bin calls for the demand heatmap (7 is about 150 m)
+CALL_HEATMAP_PRECISION = 7
+
+# Idle-fleet repositioning: demand cell size (geohash length, 6 is about 1 km),
+# travel time a waiting point should cover, number of candidate waiting points
+# the age after which the stored plan is reported as stale, and how many plans
+# the command and the job keep
+REPOSITIONING_PRECISION = 6
+REPOSITIONING_COVERAGE_MINUTES = 8
+REPOSITIONING_MAX_SITES = 1000
+REPOSITIONING_PLAN_MAX_AGE = 15 * 60
+REPOSITIONING_PLANS_KEPT = 100
+
+# Call volume forecasting: zone size (geohash length, 5 is about 5 km),
+# smoothing factors for the level and the hour-of-week seasonal terms,
+# and how many hours ahead forecasts are stored
+CALL_FORECAST_ZONE_PRECISION = 5
+CALL_FORECAST_ALPHA = 0.1
+CALL_FORECAST_GAMMA = 0.3
+CALL_FORECAST_HORIZON_HOURS = 168
+
+# Geofences that move a call to at_scene / at_hospital when a location ping
+# arrives within these distances of the scene or the patient's destination
+GEOFENCE_SCENE_RADIUS_M = 100
+GEOFENCE_HOSPITAL_RADIUS_M = 200
+GEOFENCE_INDEX_SIZE = 4096  # ambulances with a cached fence
+GEOFENCE_INDEX_TTL = 300  # seconds
+GEOFENCE_NO_FENCE_TTL = 5  # seconds an ambulance without an active call is trusted to stay so
+
+# Hospital destination recommendations: hospitals routed per request, how
+# much a full emergency department stretches the drive time score, and how
+# often each process rebuilds its in-memory hospital index
+HOSPITAL_RECOMMEND_CANDIDATES = 8
+HOSPITAL_LOAD_WEIGHT = 1.0
+HOSPITAL_INDEX_TTL = 60  # seconds
+
+# Pending call scheduling: seconds of waiting each priority starts with, and
+# how often each process reloads its in-memory queue from the database
+PENDING_CALL_PRIORITY_HEADSTART = {'critical': 1200, 'high': 600, 'medium': 300, 'low': 0}
+PENDING_CALL_QUEUE_TTL = 30  # seconds
+
+# Background jobs (run_jobs_worker): pool size, attempts before a job fails,
+# base retry delay (doubled per attempt) and how long a running job may go
+# before it is assumed lost and retried
+JOB_WORKER_THREADS = 4
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BACKOFF = 30  # seconds
+JOB_LEASE_SECONDS = 600
+
+# Maintenance planning: service interval by odometer, how far back mileage
+# trends look, days a service takes, and the cap on vehicles off the road
+# per day (MAINTENANCE_MAX_OFFLINE, or this share of the fleet when unset)
+MAINTENANCE_SERVICE_INTERVAL_KM = 10000
+MAINTENANCE_MILEAGE_WINDOW_DAYS = 90
+MAINTENANCE_DURATION_DAYS = 1
+MAINTENANCE_MAX_OFFLINE_FRACTION = 0.15
+MAINTENANCE_PLAN_HORIZON_DAYS = 60
+
+# Inspection telemetry: rolling window in readings, default lookback, and
+# what counts as a sudden fuel drop (at least this many percent of the tank,
+# and this many times what the distance driven explains)
+TELEMETRY_WINDOW = 5
+TELEMETRY_LOOKBACK_DAYS = 90
+TELEMETRY_FUEL_DROP_PERCENT = 25
+TELEMETRY_FUEL_DROP_FACTOR = 3
+
+# Crew roster: roles that must be on shift for an ambulance to count as
+# crewed, the window of shifts held in memory around now, and how often
+# each process reloads it
+ROSTER_CREWED_ROLES = ('driver',)
+ROSTER_INDEX_LOOKBACK_HOURS = 24
+ROSTER_INDEX_LOOKAHEAD_HOURS = 48
+ROSTER_INDEX_TTL = 300
+
+# Dispatch archive: closed calls and their trips untouched for this many
+# days move to the archive tables, this many calls per transaction
+DISPATCH_ARCHIVE_AFTER_DAYS = 180
+DISPATCH_ARCHIVE_BATCH_SIZE = 500
+
+# After a successful write a user's reads stay on the primary database for
+# this long, so reports never show them a replica that has not caught up
+DATABASE_REPLICA_PIN_SECONDS = 5
+
+# MessagePack responses carry coordinates as integers in units of 1/scale degree
+WIRE_COORDINATE_SCALE = 1_000_000
+
+# Idempotency-Key replay records (sync.IdempotencyRecord) for mutating dispatch endpoints
+IDEMPOTENCY_TTL = 24 * 60 * 60  # seconds a stored response can be replayed
+IDEMPOTENCY_WAIT_TIMEOUT = 30  # seconds a concurrent duplicate waits for the first request
+IDEMPOTENCY_CLAIM_TIMEOUT = 300  # seconds before an unfinished claim counts as abandoned
\ No newline at end of file
@@ -26,6 +26,11 @@ urlpatterns = [
     path('api/', include('accounts.urls')),
     path('api/', include('ambulances.urls')),
     path('api/', include('patients.urls')),
+    path('api/', include('hospitals.urls')),
     path('api/', include('dispatch.urls')),
     path('api/', include('reports.urls')),
+    path('api/', include('sync.urls')),
+    path('api/', include('jobs.urls')),
+    path('api/', include('inventory.urls')),
+    path('api/', include('roster.urls')),
 ]
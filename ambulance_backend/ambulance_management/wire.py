@@ -0,0 +1,114 @@
+"""
+MessagePack wire format for the crew app.
+
+Location and status traffic is small but constant, and JSON's field
+names, quotes and decimal strings make up most of each message. Views
+decorated with @compact_wire also speak MessagePack. Clients send
+``Accept: application/msgpack`` (or ``?format=msgpack``) to receive it,
+and ``Content-Type: application/msgpack`` to send it. JSON stays the
+default.
+
+Coordinates travel as scaled integers. Any key ending in ``latitude`` or
+``longitude`` holds ``round(degrees * WIRE_COORDINATE_SCALE)``, which is
+1e6 by default, the precision of the coordinate DecimalFields. Responses
+state the scale in an ``X-Coordinate-Scale`` header. The parser turns
+incoming integers back into exact decimal strings, so serializers
+validate them as usual.
+"""
+from decimal import Decimal, InvalidOperation
+import msgpack
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+COORDINATE_SUFFIXES = ('latitude', 'longitude')
+
+def coordinate_scale():
+    return getattr(settings, 'WIRE_COORDINATE_SCALE', 1_000_000)
+
+def _is_coordinate(key):
+    return isinstance(key, str) and key.endswith(COORDINATE_SUFFIXES)
+
+def _scaled(value, scale):
+    if isinstance(value, (str, int, float, Decimal)) and not isinstance(value, bool):
+        try:
+            degrees = Decimal(str(value))
+        except InvalidOperation:
+            return value
+        if degrees.is_finite():
+            return int((degrees * scale).to_integral_value())
+        return value
+    # Not a coordinate value after all, e.g. a list of validation errors
+    return scale_coordinates(value, scale)
+
+def scale_coordinates(data, scale):
+    """Copy of `data` with every coordinate as a scaled integer"""
+    if isinstance(data, dict):
+        return {
+            key: _scaled(value, scale) if _is_coordinate(key) else scale_coordinates(value, scale)
+            for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [scale_coordinates(item, scale) for item in data]
+    return data
+
+def unscale_coordinates(data, scale):
+    """Copy of `data` with every scaled-integer coordinate back as a decimal string"""
+    if isinstance(data, dict):
+        return {
+            key: (
+                format(Decimal(value) / scale, 'f')
+                if _is_coordinate(key) and isinstance(value, int) and not isinstance(value, bool)
+                else unscale_coordinates(value, scale)
+            )
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [unscale_coordinates(item, scale) for item in data]
+    return data
+
+_encoder = JSONEncoder()
+
+def _default(obj):
+    # Whatever DRF's JSON encoder can express (dates, decimals, UUIDs, lazy strings...)
+    return _encoder.default(obj)
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        scale = coordinate_scale()
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['X-Coordinate-Scale'] = str(scale)
+        return msgpack.packb(scale_coordinates(data, scale), default=_default, use_bin_type=True)
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            data = msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as error:
+            raise ParseError(f'MessagePack parse error - {error}')
+        return unscale_coordinates(data, coordinate_scale())
+
+WIRE_RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
+WIRE_PARSER_CLASSES = [*api_settings.DEFAULT_PARSER_CLASSES, MessagePackParser]
+
+def compact_wire(view):
+    """
+    Let a DRF view render and parse MessagePack as well as the defaults.
+    Decorate a view class, or a view function below @api_view.
+    """
+    view.renderer_classes = WIRE_RENDERER_CLASSES
+    view.parser_classes = WIRE_PARSER_CLASSES
+    return view
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Ambulance
+from .models import Ambulance, AmbulanceLocation, RepositioningPlan
 
 @admin.register(Ambulance)
 class AmbulanceAdmin(admin.ModelAdmin):
@@ -29,3 +29,16 @@ class AmbulanceAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(AmbulanceLocation)
+class AmbulanceLocationAdmin(admin.ModelAdmin):
+    list_display = ('ambulance', 'latitude', 'longitude', 'recorded_at')
+    list_filter = ('ambulance',)
+    date_hierarchy = 'recorded_at'
+
+
+@admin.register(RepositioningPlan)
+class RepositioningPlanAdmin(admin.ModelAdmin):
+    list_display = ('created_at',)
+    readonly_fields = ('created_at', 'plan')
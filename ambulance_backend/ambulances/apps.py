@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AmbulancesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ambulances'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
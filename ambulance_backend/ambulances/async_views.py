@@ -0,0 +1,18 @@
+from asgiref.sync import sync_to_async
+from django.views.decorators.http import require_GET
+from ambulance_management.async_api import async_login_required, stream_json_list
+from .models import Ambulance
+from .scoping import scope_queryset, visible_ambulance_ids
+from .serializers import AmbulanceSerializer
+
+# Everything AmbulanceSerializer reads beyond the ambulance row
+AMBULANCE_RELATED = ('assigned_driver', 'assigned_paramedic')
+
+@require_GET
+@async_login_required
+async def available_ambulances(request):
+    """Get list of available ambulances (async, streamed)"""
+    # Resolve the crew scope off the event loop; scope_queryset() then reuses it without querying
+    await sync_to_async(visible_ambulance_ids)(request)
+    ambulances = scope_queryset(Ambulance.objects.filter(status='available'), request, ('id',))
+    return stream_json_list(ambulances.select_related(*AMBULANCE_RELATED), AmbulanceSerializer)
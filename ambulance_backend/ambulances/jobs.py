@@ -0,0 +1,9 @@
+from jobs.queue import STAFF_ROLES, register_job
+from .models import RepositioningPlan
+from .repositioning import compute_plan, prune_plans
+
+@register_job('ambulances.plan_repositioning', max_attempts=1, roles=STAFF_ROLES)
+def plan_repositioning():
+    plan = RepositioningPlan.objects.create(plan=compute_plan())
+    prune_plans()
+    return {'plan_id': plan.id, 'ambulances': len(plan.plan['recommendations']), 'coverage': plan.plan['coverage']}
@@ -0,0 +1,136 @@
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DatabaseError, OperationalError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from ambulance_management.db_profiles import PROFILES, postgres_database, sqlite_database
+from ambulances.models import Ambulance, AmbulanceLocation
+
+class Command(BaseCommand):
+    help = (
+        'Measure concurrent location-ping write throughput under each database profile, '
+        'on a scratch database created and dropped for the run'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=['sqlite-basic', 'sqlite'],
+                            help='Profiles to compare (postgres uses the POSTGRES_* settings and needs CREATEDB)')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent writers')
+        parser.add_argument('--pings', type=int, default=250, help='Pings sent by each writer')
+        parser.add_argument('--ambulances', type=int, default=20)
+    
+    def handle(self, *args, **options):
+        if min(options['threads'], options['pings'], options['ambulances']) < 1:
+            raise CommandError('--threads, --pings and --ambulances must be positive')
+        
+        with tempfile.TemporaryDirectory() as scratch:
+            for profile in options['profiles']:
+                try:
+                    result = self.run_profile(profile, Path(scratch), options)
+                except (ImproperlyConfigured, DatabaseError) as error:
+                    self.stdout.write(self.style.ERROR(f'{profile:>12}: could not run ({error})'))
+                    continue
+                latency = result['latencies']
+                self.stdout.write(self.style.SUCCESS(
+                    f"{profile:>12}: {result['pings']} pings in {result['elapsed']:.2f}s = "
+                    f"{result['pings'] / result['elapsed']:.0f} pings/s, "
+                    f"p50 {statistics.median(latency) * 1000:.1f} ms, "
+                    f"p95 {statistics.quantiles(latency, n=20)[-1] * 1000:.1f} ms, "
+                    f"{result['errors']} failed"
+                ) if latency else self.style.ERROR(f"{profile:>12}: every ping failed ({result['errors']})"))
+    
+    def run_profile(self, profile, scratch, options):
+        alias = f"benchmark_{profile.replace('-', '_')}"
+        if profile == 'postgres':
+            database = postgres_database()
+            database['TEST'] = {'NAME': f"{database['NAME']}_location_pings"}
+        else:
+            database = sqlite_database(str(scratch / f'{alias}.sqlite3'), tuned=profile == 'sqlite')
+            database['TEST'] = {'NAME': str(scratch / f'{alias}.sqlite3')}
+        # Build the tables straight from the models: data migrations would read the real database
+        database['TEST']['MIGRATE'] = False
+        
+        settings.DATABASES[alias] = database
+        connections.settings[alias] = connections.configure_settings(settings.DATABASES)[alias]
+        creation = connections[alias].creation
+        old_name = connections[alias].settings_dict['NAME']
+        created = False
+        try:
+            creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            created = True
+            ambulance_ids = self.seed(alias, options['ambulances'])
+            return self.hammer(alias, ambulance_ids, options['threads'], options['pings'])
+        finally:
+            if created:
+                creation.destroy_test_db(old_name, verbosity=0)
+            del connections[alias]
+            connections.settings.pop(alias, None)
+            settings.DATABASES.pop(alias, None)
+    
+    def seed(self, alias, count):
+        today = date.today()
+        Ambulance.objects.using(alias).bulk_create([
+            Ambulance(
+                vehicle_number=f'BENCH-{number}', license_number=f'BENCH-{number}',
+                model='Benchmark', year=today.year,
+                latitude=-6.8, longitude=39.28,
+                last_maintenance=today, next_maintenance=today + timedelta(days=90),
+                insurance_expiry=today + timedelta(days=365),
+            )
+            for number in range(count)
+        ])
+        return list(Ambulance.objects.using(alias).values_list('id', flat=True))
+    
+    def hammer(self, alias, ambulance_ids, threads, pings):
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+        start = threading.Barrier(threads + 1)
+        
+        def writer(worker):
+            own = []
+            failed = 0
+            connections[alias].ensure_connection()
+            start.wait()
+            for ping in range(pings):
+                ambulance_id = ambulance_ids[(worker + ping * threads) % len(ambulance_ids)]
+                began = time.perf_counter()
+                try:
+                    # What a location update writes: the ambulance's position and one track point.
+                    # bulk_create skips the geofence signal, which would query the real database.
+                    with transaction.atomic(using=alias):
+                        Ambulance.objects.using(alias).filter(id=ambulance_id).update(
+                            latitude=F('latitude') + 0.0001, updated_at=timezone.now()
+                        )
+                        AmbulanceLocation.objects.using(alias).bulk_create([AmbulanceLocation(
+                            ambulance_id=ambulance_id, latitude=-6.8 + ping * 1e-5, longitude=39.28
+                        )])
+                except OperationalError:
+                    failed += 1
+                    continue
+                own.append(time.perf_counter() - began)
+            connections[alias].close()
+            with lock:
+                latencies.extend(own)
+                errors.append(failed)
+        
+        workers = [threading.Thread(target=writer, args=(worker,)) for worker in range(threads)]
+        for thread in workers:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in workers:
+            thread.join()
+        return {
+            'pings': len(latencies),
+            'errors': sum(errors),
+            'elapsed': time.perf_counter() - started,
+            'latencies': latencies,
+        }
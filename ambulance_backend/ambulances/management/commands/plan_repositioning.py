@@ -0,0 +1,22 @@
+import time
+from django.core.management.base import BaseCommand
+from ambulances.models import RepositioningPlan
+from ambulances.repositioning import compute_plan, prune_plans
+
+class Command(BaseCommand):
+    help = 'Compute and store a repositioning plan for the available ambulances (run on a schedule, e.g. every 15 minutes)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, help='Number of stored plans to keep (defaults to settings.REPOSITIONING_PLANS_KEPT)')
+    
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        plan = RepositioningPlan.objects.create(plan=compute_plan())
+        elapsed = time.perf_counter() - started
+        
+        prune_plans(options['keep'])
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored plan {plan.id}: {len(plan.plan['recommendations'])} ambulances, "
+            f"{plan.plan['coverage']:.1%} of expected demand covered ({elapsed:.2f}s)"
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ambulances', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AmbulanceLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ambulance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='locations', to='ambulances.ambulance')),
+            ],
+            options={
+                'ordering': ['recorded_at'],
+                'indexes': [models.Index(fields=['ambulance', 'recorded_at'], name='ambulances__ambulan_fff4d8_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-19 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ambulances', '0003_repositioningplan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrewAssignmentVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -56,5 +57,69 @@ class Ambulance(models.Model):
     def __str__(self):
         return f"{self.vehicle_number} - {self.model}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_crew()
+        instance.remember_equipment()
+        return instance
+    
+    def remember_crew(self):
+        """Record the crew assignment as loaded, so saves can tell whether it changed"""
+        self._loaded_crew = (self.__dict__.get('assigned_driver_id'), self.__dict__.get('assigned_paramedic_id'))
+    
+    def crew_changed(self):
+        return getattr(self, '_loaded_crew', None) != (self.assigned_driver_id, self.assigned_paramedic_id)
+    
+    def remember_equipment(self):
+        """Record the equipment list as loaded, so saves can tell whether it changed"""
+        equipment = self.__dict__.get('equipment')
+        self._loaded_equipment = list(equipment) if isinstance(equipment, list) else equipment
+    
+    def equipment_changed(self):
+        # A deferred equipment field was never loaded, so it cannot have been edited
+        if 'equipment' not in self.__dict__:
+            return False
+        return getattr(self, '_loaded_equipment', None) != self.equipment
+    
     class Meta:
         ordering = ['vehicle_number']
+
+
+class AmbulanceLocation(models.Model):
+    """One GPS fix from an ambulance; the ordered fixes form its track"""
+    ambulance = models.ForeignKey(Ambulance, on_delete=models.CASCADE, related_name='locations')
+    
+    # Floats rather than decimals: this table takes every ping and is read back as arrays
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    recorded_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"{self.ambulance.vehicle_number} @ {self.latitude}, {self.longitude} ({self.recorded_at})"
+    
+    class Meta:
+        ordering = ['recorded_at']
+        indexes = [
+            models.Index(fields=['ambulance', 'recorded_at']),
+        ]
+
+
+class RepositioningPlan(models.Model):
+    """A stored run of the idle-fleet repositioning recommender"""
+    created_at = models.DateTimeField(auto_now_add=True)
+    plan = models.JSONField(default=dict)
+    
+    def __str__(self):
+        return f"Repositioning plan {self.created_at}"
+    
+    class Meta:
+        ordering = ['-created_at']
+
+
+class CrewAssignmentVersion(models.Model):
+    """A single row whose version is bumped in the same transaction as every crew assignment change"""
+    version = models.PositiveBigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"Crew assignment version {self.version}"
@@ -0,0 +1,188 @@
+"""
+Idle-fleet repositioning.
+
+Expected demand for the coming hour comes from the call heatmap
+(dispatch.CallDemandCell). It blends the current and next hour-of-week
+bins and weights each bin by priority. Waiting points are chosen with a
+greedy maximum-coverage pass over the busiest cells: a site covers a cell
+when it is within REPOSITIONING_COVERAGE_MINUTES at the ETA fallback speed.
+Available ambulances are then matched to the chosen sites, nearest pairs
+first.
+"""
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.db.models import Sum
+from django.db.models.functions import Substr
+from django.utils import timezone
+from dispatch.heatmap import hour_of_week
+from dispatch.models import CallDemandCell
+from routing.geo import geohash_center, haversine_m_array, project_m
+from .models import Ambulance, RepositioningPlan
+
+DEFAULT_PRIORITY_WEIGHTS = {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+def expected_demand(now=None):
+    """Return (cells, latitudes, longitudes, weights) of expected demand over the next hour"""
+    now = now or timezone.now()
+    precision = _setting('REPOSITIONING_PRECISION', 6)
+    priority_weights = _setting('REPOSITIONING_PRIORITY_WEIGHTS', DEFAULT_PRIORITY_WEIGHTS)
+    
+    current_hour = hour_of_week(now)
+    next_hour = hour_of_week(now + timedelta(hours=1))
+    # Share of the coming 60 minutes that falls into the next hour bin
+    next_share = timezone.localtime(now).minute / 60
+    
+    rows = (
+        CallDemandCell.objects.filter(hour_of_week__in={current_hour, next_hour})
+        .annotate(area=Substr('cell', 1, precision))
+        .values('area', 'hour_of_week', 'priority')
+        .annotate(total=Sum('count'))
+        .order_by()
+    )
+    
+    shares = {current_hour: 1 - next_share}
+    shares[next_hour] = shares.get(next_hour, 0) + next_share
+    
+    weights = {}
+    for row in rows:
+        weight = row['total'] * priority_weights.get(row['priority'], 1) * shares[row['hour_of_week']]
+        weights[row['area']] = weights.get(row['area'], 0) + weight
+    
+    cells = [cell for cell, weight in weights.items() if weight > 0]
+    centers = np.array([geohash_center(cell) for cell in cells], dtype=np.float64).reshape(-1, 2)
+    return cells, centers[:, 0], centers[:, 1], np.array([weights[cell] for cell in cells], dtype=np.float64)
+
+def greedy_max_coverage(coverage, weights, site_count):
+    """
+    Pick `site_count` columns of the boolean (cells x sites) coverage matrix
+    that together cover the most demand weight. Gains are kept up to date
+    incrementally: once a site is chosen, only the cells it newly covers are
+    subtracted. Once everything is covered, a fresh coverage layer starts so
+    spare vehicles add backup coverage where demand is highest.
+    """
+    coverage_weights = coverage.astype(np.float32)
+    weights = weights.astype(np.float32)
+    uncovered = np.ones(coverage.shape[0], dtype=bool)
+    gains = weights @ coverage_weights
+    available = np.ones(coverage.shape[1], dtype=bool)
+    chosen = []
+    
+    for _ in range(min(site_count, coverage.shape[1])):
+        if not (gains[available] > 0).any():
+            # Every cell is covered: start a second layer of coverage
+            uncovered[:] = True
+            gains = weights @ coverage_weights
+        best = int(np.argmax(np.where(available, gains, -1)))
+        chosen.append(best)
+        available[best] = False
+        
+        newly_covered = coverage[:, best] & uncovered
+        if newly_covered.any():
+            gains -= weights[newly_covered] @ coverage_weights[newly_covered]
+            uncovered &= ~newly_covered
+    
+    covered_weight = float(weights[coverage[:, chosen].any(axis=1)].sum()) if chosen else 0.0
+    return chosen, covered_weight
+
+def match_to_sites(distances):
+    """Greedily pair ambulances (rows) with sites (columns), shortest remaining distance first"""
+    distances = np.array(distances, dtype=np.float64)
+    assignments = {}
+    for _ in range(min(distances.shape)):
+        ambulance, site = divmod(int(np.argmin(distances)), distances.shape[1])
+        assignments[ambulance] = site
+        distances[ambulance, :] = np.inf
+        distances[:, site] = np.inf
+    return assignments
+
+def compute_plan(now=None):
+    """Build a repositioning plan for every available ambulance with a known location"""
+    now = now or timezone.now()
+    ambulances = list(
+        Ambulance.objects.filter(status='available', latitude__isnull=False, longitude__isnull=False)
+        .values('id', 'vehicle_number', 'latitude', 'longitude')
+    )
+    cells, cell_latitudes, cell_longitudes, weights = expected_demand(now)
+    plan = {
+        'generated_at': now.isoformat(),
+        'hour_of_week': hour_of_week(now),
+        'expected_calls_weight': float(weights.sum()),
+        'covered_weight': 0.0,
+        'coverage': 0.0,
+        'recommendations': [],
+    }
+    if not ambulances or not cells:
+        return plan
+    
+    # Candidate waiting points are the centres of the busiest cells
+    max_sites = _setting('REPOSITIONING_MAX_SITES', 1000)
+    site_index = np.argsort(weights)[::-1][:max_sites]
+    
+    speed = _setting('ETA_FALLBACK_SPEED_KPH', 40) / 3.6
+    detour = _setting('ETA_DETOUR_FACTOR', 1.3)
+    radius = _setting('REPOSITIONING_COVERAGE_MINUTES', 8) * 60 * speed / detour
+    
+    x, y = project_m(cell_latitudes, cell_longitudes, float(cell_latitudes.mean()))
+    x, y = x.astype(np.float32), y.astype(np.float32)
+    coverage = (
+        (x[:, None] - x[site_index][None, :]) ** 2 + (y[:, None] - y[site_index][None, :]) ** 2
+    ) <= np.float32(radius ** 2)
+    chosen, covered_weight = greedy_max_coverage(coverage, weights, len(ambulances))
+    sites = site_index[chosen]
+    
+    ambulance_latitudes = np.array([float(ambulance['latitude']) for ambulance in ambulances])
+    ambulance_longitudes = np.array([float(ambulance['longitude']) for ambulance in ambulances])
+    distances = haversine_m_array(
+        ambulance_latitudes[:, None], ambulance_longitudes[:, None],
+        cell_latitudes[sites][None, :], cell_longitudes[sites][None, :]
+    )
+    assignments = match_to_sites(distances)
+    
+    recommendations = []
+    for index, ambulance in enumerate(ambulances):
+        site = assignments.get(index)
+        recommendation = {
+            'ambulance_id': ambulance['id'],
+            'vehicle_number': ambulance['vehicle_number'],
+            'current': {'latitude': float(ambulance_latitudes[index]), 'longitude': float(ambulance_longitudes[index])},
+            'target': None,
+        }
+        if site is not None:
+            cell = sites[site]
+            recommendation['target'] = {
+                'cell': cells[cell],
+                'latitude': round(float(cell_latitudes[cell]), 6),
+                'longitude': round(float(cell_longitudes[cell]), 6),
+                'distance_km': round(float(distances[index, site]) / 1000, 2),
+                'demand_weight': round(float(weights[cell]), 3),
+            }
+        recommendations.append(recommendation)
+    
+    plan.update({
+        'covered_weight': covered_weight,
+        'coverage': covered_weight / plan['expected_calls_weight'] if plan['expected_calls_weight'] else 0.0,
+        'recommendations': recommendations,
+    })
+    return plan
+
+def latest_plan():
+    """
+    The most recent stored plan, or None. Reads never compute: plans come from
+    the plan_repositioning command or the ambulances.plan_repositioning job.
+    """
+    return RepositioningPlan.objects.first()
+
+def prune_plans(keep=None):
+    """Delete all but the `keep` (default REPOSITIONING_PLANS_KEPT) most recent stored plans"""
+    keep = getattr(settings, 'REPOSITIONING_PLANS_KEPT', 100) if keep is None else keep
+    stale = RepositioningPlan.objects.values_list('id', flat=True)[keep:]
+    RepositioningPlan.objects.filter(id__in=list(stale)).delete()
+
+def is_stale(stored, now=None):
+    """Whether `stored` is older than REPOSITIONING_PLAN_MAX_AGE"""
+    max_age = _setting('REPOSITIONING_PLAN_MAX_AGE', 15 * 60)
+    return stored.created_at < (now or timezone.now()) - timedelta(seconds=max_age)
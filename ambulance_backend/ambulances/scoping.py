@@ -0,0 +1,115 @@
+"""
+Role-aware queryset scoping.
+
+Admins and dispatchers see the whole fleet. Drivers and paramedics only see
+rows that belong to the ambulances they are assigned to, resolved once per
+request from Ambulance.assigned_driver / assigned_paramedic and cached per
+user between requests. ambulances.signals evicts entries when a crew
+changes in this process; changes saved by other processes bump the
+CrewAssignmentVersion row instead, and a cached entry is only reused while
+that version (a primary key lookup) still matches the one it was built at.
+"""
+from django.conf import settings
+from django.db.models import F, Q
+from ambulance_management.lru import ExpiringLRUCache
+from .models import Ambulance, CrewAssignmentVersion
+
+CREW_ROLES = ('driver', 'paramedic')
+
+# user id -> (crew assignment version, frozenset of ambulance ids)
+ambulance_scope_cache = ExpiringLRUCache(
+    getattr(settings, 'AMBULANCE_SCOPE_CACHE_SIZE', 4096),
+    getattr(settings, 'AMBULANCE_SCOPE_CACHE_TTL', 60)
+)
+
+_UNRESOLVED = object()
+
+def crew_assignment_version():
+    return CrewAssignmentVersion.objects.filter(pk=1).values_list('version', flat=True).first()
+
+def bump_crew_assignment_version():
+    if not CrewAssignmentVersion.objects.filter(pk=1).update(version=F('version') + 1):
+        CrewAssignmentVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+
+def visible_ambulance_ids(request):
+    """Return the ids of the ambulances the user may see, or None when unrestricted"""
+    ids = getattr(request, '_visible_ambulance_ids', _UNRESOLVED)
+    if ids is not _UNRESOLVED:
+        return ids
+    
+    user = request.user
+    if getattr(user, 'role', None) not in CREW_ROLES:
+        ids = None
+    else:
+        version = crew_assignment_version()
+        cached = ambulance_scope_cache.get(user.pk)
+        if cached is not None and cached[0] == version:
+            ids = cached[1]
+        else:
+            ids = frozenset(
+                Ambulance.objects.filter(
+                    Q(assigned_driver=user) | Q(assigned_paramedic=user)
+                ).values_list('id', flat=True)
+            )
+            ambulance_scope_cache.set(user.pk, (version, ids))
+    
+    request._visible_ambulance_ids = ids
+    return ids
+
+def crew_scope_errors(request, data, owner_field=None):
+    """
+    Field errors for validated `data` a crew member may not write: an
+    ambulance they are not assigned to, or a record filed under another
+    person's `owner_field`. None when the write is allowed.
+    """
+    ids = visible_ambulance_ids(request)
+    if ids is None:
+        return None
+    errors = {}
+    ambulance = data.get('ambulance')
+    if ambulance is not None and ambulance.pk not in ids:
+        errors['ambulance'] = ['You are not assigned to this ambulance.']
+    if owner_field and owner_field in data and data[owner_field] != request.user:
+        errors[owner_field] = ['You may only file records under your own account.']
+    return errors or None
+
+def scope_queryset(queryset, request, ambulance_fields=('ambulance',), owner_field=None, owner_role=None):
+    """
+    Filter `queryset` down to rows whose `ambulance_fields` point at a visible
+    ambulance. `owner_field` additionally keeps rows the user owns (e.g. their
+    own shifts on an ambulance they are no longer assigned to). Crew members
+    in `owner_role` see only the rows they own, whatever the ambulance, so a
+    driver never sees another driver's inspections.
+    """
+    ids = visible_ambulance_ids(request)
+    if ids is None:
+        return queryset
+    if owner_field and owner_role is not None and request.user.role == owner_role:
+        return queryset.filter(**{owner_field: request.user})
+    
+    condition = Q()
+    for field in ambulance_fields:
+        condition |= Q(**{f'{field}__in': ids})
+    if owner_field:
+        condition |= Q(**{owner_field: request.user})
+    
+    queryset = queryset.filter(condition)
+    # Filters that follow a reverse relation can repeat rows
+    if any('__' in field for field in ambulance_fields):
+        queryset = queryset.distinct()
+    return queryset
+
+class AmbulanceScopedMixin:
+    """
+    Apply scope_queryset() to a generic view. Hooked into filter_queryset()
+    so it covers list responses and detail lookups alike.
+    """
+    ambulance_scope_fields = ('ambulance',)
+    crew_owner_field = None
+    crew_owner_role = None
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return scope_queryset(
+            queryset, self.request, self.ambulance_scope_fields, self.crew_owner_field, self.crew_owner_role
+        )
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Ambulance
+from django.utils import timezone
+from .models import Ambulance, AmbulanceLocation
 
 class AmbulanceSerializer(serializers.ModelSerializer):
     assigned_driver_name = serializers.CharField(source='assigned_driver.get_full_name', read_only=True)
@@ -19,3 +20,16 @@ class AmbulanceLocationUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ambulance
         fields = ['latitude', 'longitude']
+    
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        
+        # Append the fix to the ambulance's track; offline replays pass the device's own timestamp
+        if instance.latitude is not None and instance.longitude is not None:
+            AmbulanceLocation.objects.create(
+                ambulance=instance,
+                latitude=float(instance.latitude),
+                longitude=float(instance.longitude),
+                recorded_at=self.context.get('recorded_at') or timezone.now()
+            )
+        return instance
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Ambulance
+from .scoping import ambulance_scope_cache, bump_crew_assignment_version
+
+def _forget_crew_scopes(ambulance):
+    crew = {ambulance.assigned_driver_id, ambulance.assigned_paramedic_id}
+    bump_crew_assignment_version()
+    ambulance_scope_cache.evict(lambda user_id, entry: user_id in crew or ambulance.pk in entry[1])
+
+@receiver(post_save, sender=Ambulance)
+def refresh_crew_scopes(sender, instance, created, **kwargs):
+    # Location and status updates save the ambulance constantly; only crew changes matter here
+    if created or instance.crew_changed():
+        _forget_crew_scopes(instance)
+    instance.remember_crew()
+
+@receiver(post_delete, sender=Ambulance)
+def drop_crew_scopes(sender, instance, **kwargs):
+    _forget_crew_scopes(instance)
@@ -1,9 +1,11 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('ambulances/', views.AmbulanceListCreateView.as_view(), name='ambulance-list-create'),
     path('ambulances/<int:pk>/', views.AmbulanceDetailView.as_view(), name='ambulance-detail'),
     path('ambulances/<int:pk>/location/', views.update_ambulance_location, name='ambulance-location-update'),
     path('ambulances/available/', views.available_ambulances, name='available-ambulances'),
+    path('ambulances/repositioning/', views.repositioning, name='ambulance-repositioning'),
+    path('async/ambulances/available/', async_views.available_ambulances, name='async-available-ambulances'),
 ]
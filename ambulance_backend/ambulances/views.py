@@ -1,21 +1,31 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from ambulance_management.compiled_serializers import CompiledListMixin, serialize_list
+from ambulance_management.wire import compact_wire
+from jobs.views import enqueue_for_request
 from .models import Ambulance
+from .repositioning import is_stale, latest_plan
+from .scoping import AmbulanceScopedMixin, scope_queryset, visible_ambulance_ids
 from .serializers import AmbulanceSerializer, AmbulanceLocationUpdateSerializer
 
-class AmbulanceListCreateView(generics.ListCreateAPIView):
+@compact_wire
+class AmbulanceListCreateView(CompiledListMixin, AmbulanceScopedMixin, generics.ListCreateAPIView):
     queryset = Ambulance.objects.all()
     serializer_class = AmbulanceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ambulance_scope_fields = ('id',)
 
-class AmbulanceDetailView(generics.RetrieveUpdateDestroyAPIView):
+@compact_wire
+class AmbulanceDetailView(AmbulanceScopedMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Ambulance.objects.all()
     serializer_class = AmbulanceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ambulance_scope_fields = ('id',)
 
 @api_view(['PATCH'])
 @permission_classes([permissions.IsAuthenticated])
+@compact_wire
 def update_ambulance_location(request, pk):
     """Update ambulance location"""
     try:
@@ -31,8 +41,32 @@ def update_ambulance_location(request, pk):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@compact_wire
 def available_ambulances(request):
     """Get list of available ambulances"""
-    ambulances = Ambulance.objects.filter(status='available')
-    serializer = AmbulanceSerializer(ambulances, many=True)
-    return Response(serializer.data)
+    ambulances = scope_queryset(Ambulance.objects.filter(status='available'), request, ('id',))
+    return Response(serialize_list(AmbulanceSerializer, ambulances))
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@compact_wire
+def repositioning(request):
+    """Recommended waiting points for available ambulances over the next hour (?refresh=1 queues a new plan)"""
+    if request.query_params.get('refresh', '').lower() in ('1', 'true', 'yes'):
+        # Recomputed in the background; the job is limited to admins and dispatchers
+        return enqueue_for_request(request, 'ambulances.plan_repositioning')
+    
+    stored = latest_plan()
+    if stored is None:
+        return Response({'error': 'No repositioning plan has been computed yet'}, status=status.HTTP_404_NOT_FOUND)
+    plan = dict(stored.plan)
+    
+    visible = visible_ambulance_ids(request)
+    if visible is not None:
+        plan['recommendations'] = [
+            recommendation for recommendation in plan.get('recommendations', [])
+            if recommendation['ambulance_id'] in visible
+        ]
+    plan['plan_id'] = stored.id
+    plan['stale'] = is_stale(stored)
+    return Response(plan)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import EmergencyCall, Trip
+from .models import ArchivedEmergencyCall, ArchivedTrip, CallDemandCell, EmergencyCall, Trip
 
 @admin.register(EmergencyCall)
 class EmergencyCallAdmin(admin.ModelAdmin):
@@ -51,3 +51,35 @@ class TripAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(CallDemandCell)
+class CallDemandCellAdmin(admin.ModelAdmin):
+    list_display = ('cell', 'hour_of_week', 'priority', 'count')
+    list_filter = ('priority',)
+    search_fields = ('cell',)
+
+
+@admin.register(ArchivedEmergencyCall)
+class ArchivedEmergencyCallAdmin(admin.ModelAdmin):
+    list_display = ('id', 'caller_name', 'priority', 'status', 'assigned_ambulance_id', 'created_at', 'archived_at')
+    list_filter = ('priority', 'status', 'created_at')
+    search_fields = ('caller_name', 'caller_phone', 'address')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedTrip)
+class ArchivedTripAdmin(admin.ModelAdmin):
+    list_display = ('id', 'call_id', 'ambulance_id', 'start_time', 'end_time', 'distance', 'cost', 'archived_at')
+    list_filter = ('start_time',)
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,133 @@
+"""
+Archival of closed calls and trips.
+
+Calls that are completed or cancelled, and whose trip (if any) is
+completed, move to ArchivedEmergencyCall / ArchivedTrip once they have not
+changed for DISPATCH_ARCHIVE_AFTER_DAYS. Each batch is copied and deleted
+in its own transaction. A crash therefore leaves every call either fully
+hot or fully archived, and re-running simply carries on with whatever is
+still hot. That keeps the hot tables, and every pending/active query on
+them, sized by recent work instead of history.
+
+The read side (call_history, trip_history) returns one queryset of dicts.
+It adds the archive tables with UNION ALL only when the requested range
+reaches back before the newest archived row.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, Max, Q, Value
+from django.utils import timezone
+from .models import ArchivedEmergencyCall, ArchivedTrip, EmergencyCall, Trip
+
+CLOSED_CALL_STATUSES = ('completed', 'cancelled')
+
+CALL_FIELDS = (
+    'id', 'caller_name', 'caller_phone', 'latitude', 'longitude', 'address',
+    'priority', 'status', 'description', 'assigned_ambulance_id', 'dispatcher_id',
+    'patient_id', 'request_source', 'requester_type', 'requester_details',
+    'created_at', 'updated_at', 'response_time',
+)
+
+TRIP_FIELDS = (
+    'id', 'call_id', 'ambulance_id', 'patient_id', 'start_time', 'end_time',
+    'distance', 'cost', 'status', 'created_at', 'updated_at',
+)
+
+def archive_cutoff(older_than_days=None):
+    days = older_than_days if older_than_days is not None else getattr(settings, 'DISPATCH_ARCHIVE_AFTER_DAYS', 180)
+    return timezone.now() - timedelta(days=days)
+
+def archivable_calls(cutoff):
+    return EmergencyCall.objects.filter(
+        Q(trip__isnull=True) | Q(trip__status='completed'),
+        status__in=CLOSED_CALL_STATUSES,
+        updated_at__lt=cutoff,
+    )
+
+def archive_batch(call_ids):
+    """Move the given calls and their trips to the archive; returns (calls, trips) moved"""
+    with transaction.atomic():
+        # Lock and re-check, in case a call was reopened since it was selected
+        calls = list(
+            EmergencyCall.objects.select_for_update()
+            .filter(id__in=call_ids, status__in=CLOSED_CALL_STATUSES)
+            .values(*CALL_FIELDS)
+        )
+        open_trips = set(
+            Trip.objects.filter(call_id__in=[call['id'] for call in calls])
+            .exclude(status='completed')
+            .values_list('call_id', flat=True)
+        )
+        calls = [call for call in calls if call['id'] not in open_trips]
+        ids = [call['id'] for call in calls]
+        trips = list(Trip.objects.filter(call_id__in=ids).values(*TRIP_FIELDS))
+        
+        # ignore_conflicts keeps a re-run harmless if rows were copied by an earlier, interrupted run
+        ArchivedEmergencyCall.objects.bulk_create(
+            [ArchivedEmergencyCall(**call) for call in calls], ignore_conflicts=True
+        )
+        ArchivedTrip.objects.bulk_create([ArchivedTrip(**trip) for trip in trips], ignore_conflicts=True)
+        Trip.objects.filter(call_id__in=ids).delete()
+        EmergencyCall.objects.filter(id__in=ids).delete()
+    return len(ids), len(trips)
+
+def archive_closed_calls(older_than_days=None, batch_size=None, max_batches=None, progress=None):
+    """
+    Archive every eligible call in id order, `batch_size` calls per
+    transaction. Returns (calls, trips) moved. `progress`, if given, is called
+    with the running totals after each batch.
+    """
+    batch_size = batch_size or getattr(settings, 'DISPATCH_ARCHIVE_BATCH_SIZE', 500)
+    eligible = archivable_calls(archive_cutoff(older_than_days))
+    moved_calls = moved_trips = batches = 0
+    last_id = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(eligible.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        last_id = ids[-1]
+        calls, trips = archive_batch(ids)
+        moved_calls += calls
+        moved_trips += trips
+        batches += 1
+        if progress:
+            progress(moved_calls, moved_trips)
+    return moved_calls, moved_trips
+
+def _archive_reaches(model, field, start):
+    """Whether the archive may hold rows at or after `start` (always when the range is open-ended)"""
+    if start is None:
+        return model.objects.exists()
+    newest = model.objects.aggregate(newest=Max(field))['newest']
+    return newest is not None and newest >= start
+
+def _history(hot, archive, fields, date_field, start, end, filters):
+    hot = hot.filter(**filters)
+    archive = archive.filter(**filters)
+    if start is not None:
+        hot = hot.filter(**{f'{date_field}__gte': start})
+        archive = archive.filter(**{f'{date_field}__gte': start})
+    if end is not None:
+        hot = hot.filter(**{f'{date_field}__lt': end})
+        archive = archive.filter(**{f'{date_field}__lt': end})
+    
+    hot = hot.order_by().values(*fields).annotate(archived=Value(False, output_field=BooleanField()))
+    if not _archive_reaches(archive.model, date_field, start):
+        return hot.order_by(f'-{date_field}', '-id')
+    archive = archive.order_by().values(*fields).annotate(archived=Value(True, output_field=BooleanField()))
+    return hot.union(archive, all=True).order_by(f'-{date_field}', '-id')
+
+def call_history(start=None, end=None, **filters):
+    """Calls created in [start, end) from the hot and, when needed, archive tables, newest first"""
+    return _history(
+        EmergencyCall.objects.all(), ArchivedEmergencyCall.objects.all(),
+        CALL_FIELDS, 'created_at', start, end, filters
+    )
+
+def trip_history(start=None, end=None, **filters):
+    """Trips started in [start, end) from the hot and, when needed, archive tables, newest first"""
+    return _history(
+        Trip.objects.all(), ArchivedTrip.objects.all(),
+        TRIP_FIELDS, 'start_time', start, end, filters
+    )
@@ -0,0 +1,35 @@
+from asgiref.sync import sync_to_async
+from django.views.decorators.http import require_GET
+from ambulance_management.async_api import async_login_required, stream_json_list
+from ambulances.async_views import AMBULANCE_RELATED
+from ambulances.scoping import scope_queryset, visible_ambulance_ids
+from .models import EmergencyCall, Trip
+from .queue import pending_calls_by_urgency
+from .serializers import EmergencyCallSerializer, TripSerializer
+
+# Everything the serializers read beyond the call or trip row
+CALL_RELATED = (
+    'dispatcher', 'patient', 'assigned_ambulance',
+    *[f'assigned_ambulance__{field}' for field in AMBULANCE_RELATED],
+)
+TRIP_RELATED = (
+    'call', 'ambulance', 'patient',
+    *[f'call__{field}' for field in CALL_RELATED],
+    *[f'ambulance__{field}' for field in AMBULANCE_RELATED],
+)
+
+@require_GET
+@async_login_required
+async def active_trips(request):
+    """Get all active trips (async, streamed)"""
+    # Resolve the crew scope off the event loop; scope_queryset() then reuses it without querying
+    await sync_to_async(visible_ambulance_ids)(request)
+    trips = scope_queryset(Trip.objects.filter(status='active'), request)
+    return stream_json_list(trips.select_related(*TRIP_RELATED), TripSerializer)
+
+@require_GET
+@async_login_required
+async def pending_calls(request):
+    """Get all pending emergency calls, most urgent first (async, streamed)"""
+    calls = pending_calls_by_urgency(EmergencyCall.objects.select_related(*CALL_RELATED))
+    return stream_json_list(calls, EmergencyCallSerializer)
@@ -0,0 +1,135 @@
+"""
+Trip distance and pricing.
+
+Distances come from the ambulance's GPS track (AmbulanceLocation) between
+the trip's start and end time, summed with a vectorized haversine over the
+whole point array. Prices come from settings.TRIP_TARIFFS, a table of
+base fare and per-km rate keyed by call priority.
+
+Batch recomputation uses track_distances_km(). It fetches the tracks of a
+whole chunk of trips in one ordered query and splits them into trips with
+NumPy.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, ROUND_HALF_UP
+from functools import reduce
+from operator import or_
+import numpy as np
+from django.conf import settings
+from django.db.models import Q
+from ambulances.models import AmbulanceLocation
+from routing.geo import haversine_m_array
+
+CENTS = Decimal('0.01')
+
+# Track windows ORed into one query; SQLite rejects expression trees deeper than 1000
+TRACK_WINDOWS_PER_QUERY = 500
+
+DEFAULT_TARIFFS = {
+    'default': {'base_fare': '50.00', 'per_km': '2.50'},
+}
+
+def track_distance_km(points):
+    """Length in km of a track given as an (n, 2) array of latitude/longitude rows"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 2:
+        return None
+    segments = haversine_m_array(points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1])
+    return float(segments.sum()) / 1000
+
+def trip_track(ambulance_id, start_time, end_time):
+    return AmbulanceLocation.objects.filter(
+        ambulance_id=ambulance_id,
+        recorded_at__gte=start_time,
+        recorded_at__lte=end_time
+    ).order_by('recorded_at').values_list('latitude', 'longitude')
+
+def _microseconds(moments):
+    """Integer microseconds since the epoch; exact, so equal datetimes compare equal"""
+    epoch = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+    return np.array([(moment - epoch) // timedelta(microseconds=1) for moment in moments], dtype=np.int64)
+
+def _track_windows(trips):
+    """(ambulance_id, start, end) time windows covering the trips, with overlapping trips merged"""
+    windows = []
+    for trip in sorted(trips, key=lambda trip: (trip.ambulance_id, trip.start_time)):
+        if windows and windows[-1][0] == trip.ambulance_id and trip.start_time <= windows[-1][2]:
+            windows[-1][2] = max(windows[-1][2], trip.end_time)
+        else:
+            windows.append([trip.ambulance_id, trip.start_time, trip.end_time])
+    return windows
+
+def track_distances_km(trips):
+    """
+    track_distance_km() of each trip's track, fetched with one query for up
+    to TRACK_WINDOWS_PER_QUERY trips. None for trips with fewer than two points.
+    """
+    trips = list(trips)
+    distances = [None] * len(trips)
+    if not trips:
+        return distances
+    starts = _microseconds(trip.start_time for trip in trips)
+    ends = _microseconds(trip.end_time for trip in trips)
+    trip_ambulances = np.array([trip.ambulance_id for trip in trips], dtype=np.int64)
+    
+    rows = []
+    windows = _track_windows(trips)
+    for offset in range(0, len(windows), TRACK_WINDOWS_PER_QUERY):
+        query = reduce(or_, (
+            Q(ambulance_id=ambulance_id, recorded_at__gte=window_start, recorded_at__lte=window_end)
+            for ambulance_id, window_start, window_end in windows[offset:offset + TRACK_WINDOWS_PER_QUERY]
+        ))
+        # Windows are disjoint and sorted by ambulance and time, so the batches concatenate in order
+        rows.extend(AmbulanceLocation.objects.filter(query).order_by('ambulance_id', 'recorded_at').values_list(
+            'ambulance_id', 'recorded_at', 'latitude', 'longitude'
+        ))
+    if not rows:
+        return distances
+    ambulance_ids, moments, latitudes, longitudes = zip(*rows)
+    ambulance_ids = np.array(ambulance_ids, dtype=np.int64)
+    latitudes = np.array(latitudes, dtype=np.float64)
+    longitudes = np.array(longitudes, dtype=np.float64)
+    
+    # Distance travelled up to each point, with no segment joining two ambulances
+    segments = haversine_m_array(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:])
+    segments[ambulance_ids[1:] != ambulance_ids[:-1]] = 0
+    travelled = np.concatenate(([0.0], np.cumsum(segments)))
+    
+    # One key that sorts like (ambulance, time) finds every trip's first and last point in two searchsorted calls
+    fleet = np.unique(ambulance_ids)
+    base = int(starts.min())
+    span = int(ends.max()) - base + 1
+    keys = np.searchsorted(fleet, ambulance_ids) * span + (_microseconds(moments) - base)
+    blocks = np.searchsorted(fleet, trip_ambulances)
+    tracked = fleet[np.minimum(blocks, len(fleet) - 1)] == trip_ambulances
+    first = np.searchsorted(keys, blocks * span + (starts - base), side='left')
+    last = np.searchsorted(keys, blocks * span + (ends - base), side='right') - 1
+    
+    for index in np.flatnonzero(tracked & (last > first)).tolist():
+        distances[index] = float(travelled[last[index]] - travelled[first[index]]) / 1000
+    return distances
+
+def tariff_for(priority):
+    tariffs = getattr(settings, 'TRIP_TARIFFS', DEFAULT_TARIFFS)
+    return tariffs.get(priority) or tariffs['default']
+
+def price_trip(distance_km, priority=None):
+    tariff = tariff_for(priority)
+    cost = Decimal(tariff['base_fare']) + Decimal(tariff['per_km']) * Decimal(distance_km)
+    return cost.quantize(CENTS, rounding=ROUND_HALF_UP)
+
+def as_distance(distance_km):
+    return Decimal(distance_km).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+def compute_trip_totals(trip, priority=None):
+    """
+    Return (distance, cost) for a finished trip. The distance falls back to
+    the trip's current value when the track has fewer than two points.
+    """
+    distance_km = track_distance_km(list(trip_track(trip.ambulance_id, trip.start_time, trip.end_time)))
+    return totals_for_distance(trip, distance_km, priority)
+
+def totals_for_distance(trip, distance_km, priority=None):
+    """compute_trip_totals() for a track length that is already known"""
+    distance = as_distance(distance_km) if distance_km is not None else trip.distance
+    return distance, price_trip(distance, priority)
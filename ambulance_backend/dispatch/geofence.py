@@ -0,0 +1,123 @@
+"""
+Geofences for automatic arrival detection.
+
+An ambulance working a call has at most one active fence:
+
+* while the call is ``assigned`` or ``en_route``, a fence around the scene
+  moves the call to ``at_scene``;
+* while it is ``transporting``, a fence around the patient's destination
+  moves it to ``at_hospital``.
+
+Fences are indexed by ambulance id, so checking a location ping is one dict
+lookup plus one distance, whatever the number of active calls. The index
+is filled lazily, one query per ambulance. dispatch.signals drops entries
+whenever a call or patient changes in this process.
+
+Changes made by other processes are caught in two ways. Each entry
+records the ambulance status it was looked up under. Assigning,
+progressing or closing a call moves the ambulance's status along, and the
+ping path already holds the fresh ambulance row, so a different status
+forces a new lookup. On top of that, "no active call" is only trusted for
+GEOFENCE_NO_FENCE_TTL seconds.
+"""
+from collections import namedtuple
+from django.conf import settings
+from django.db import transaction
+from ambulance_management.lru import ExpiringLRUCache
+from routing.geo import haversine_m
+from .models import EmergencyCall
+
+Fence = namedtuple('Fence', ['call_id', 'patient_id', 'latitude', 'longitude', 'radius', 'from_statuses', 'to_status', 'since'])
+
+SCENE_STATUSES = ('assigned', 'en_route')
+HOSPITAL_STATUSES = ('transporting',)
+
+# Cached for ambulances with no active call, so their pings skip the database too
+NO_FENCE = ()
+
+# ambulance id -> (ambulance status at lookup, Fence or NO_FENCE)
+fence_index = ExpiringLRUCache(
+    getattr(settings, 'GEOFENCE_INDEX_SIZE', 4096),
+    getattr(settings, 'GEOFENCE_INDEX_TTL', 300)
+)
+
+def _destination(call):
+    patient = call.patient
+    if patient is None:
+        trip = getattr(call, 'trip', None)
+        patient = trip.patient if trip else None
+    if patient is None or patient.destination_latitude is None or patient.destination_longitude is None:
+        return None, None
+    return patient, (float(patient.destination_latitude), float(patient.destination_longitude))
+
+def fence_for_call(call):
+    """The fence a call currently needs, or None"""
+    if call.status in SCENE_STATUSES:
+        return Fence(
+            call.id, call.patient_id, float(call.latitude), float(call.longitude),
+            getattr(settings, 'GEOFENCE_SCENE_RADIUS_M', 100), SCENE_STATUSES, 'at_scene', call.updated_at
+        )
+    if call.status in HOSPITAL_STATUSES:
+        patient, point = _destination(call)
+        if point:
+            return Fence(
+                call.id, patient.id, point[0], point[1],
+                getattr(settings, 'GEOFENCE_HOSPITAL_RADIUS_M', 200), HOSPITAL_STATUSES, 'at_hospital', call.updated_at
+            )
+    return None
+
+def active_fence(ambulance_id, ambulance_status=None):
+    entry = fence_index.get(ambulance_id)
+    if entry is not None and (ambulance_status is None or entry[0] == ambulance_status):
+        fence = entry[1]
+    else:
+        call = (
+            EmergencyCall.objects.filter(
+                assigned_ambulance_id=ambulance_id,
+                status__in=SCENE_STATUSES + HOSPITAL_STATUSES
+            )
+            .select_related('patient', 'trip__patient')
+            .order_by('-created_at')
+            .first()
+        )
+        fence = (fence_for_call(call) if call else None) or NO_FENCE
+        ttl = None if fence else getattr(settings, 'GEOFENCE_NO_FENCE_TTL', 5)
+        fence_index.set(ambulance_id, (ambulance_status, fence), ttl=ttl)
+    return fence or None
+
+def check_ping(ambulance_id, latitude, longitude, recorded_at=None, ambulance_status=None):
+    """
+    Fire the fence transition if this ping is inside the ambulance's active
+    fence; returns the updated call. Pass the ambulance's current status
+    so a fence cached before another process changed it is looked up again.
+    """
+    fence = active_fence(ambulance_id, ambulance_status)
+    if fence is None:
+        return None
+    # Offline replays can deliver pings recorded before the call reached its current status
+    if recorded_at is not None and fence.since is not None and recorded_at < fence.since:
+        return None
+    if haversine_m(latitude, longitude, fence.latitude, fence.longitude) > fence.radius:
+        return None
+    
+    with transaction.atomic():
+        call = (
+            EmergencyCall.objects.select_for_update()
+            .filter(pk=fence.call_id, assigned_ambulance_id=ambulance_id, status__in=fence.from_statuses)
+            .first()
+        )
+        if call is None:
+            # Someone already moved the call on; the saved call evicted the fence
+            fence_index.pop(ambulance_id)
+            return None
+        call.update_status(fence.to_status)
+    return call
+
+def forget_call(call_id, ambulance_id=None):
+    """Drop fences that belong to a call or to the ambulance now assigned to it"""
+    if ambulance_id is not None:
+        fence_index.pop(ambulance_id)
+    fence_index.evict(lambda key, entry: entry[1] and entry[1].call_id == call_id)
+
+def forget_patient(patient_id):
+    fence_index.evict(lambda key, entry: entry[1] and entry[1].patient_id == patient_id)
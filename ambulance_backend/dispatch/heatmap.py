@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from routing.geo import geohash_encode
+from .models import CallDemandCell
+
+def heatmap_precision():
+    return getattr(settings, 'CALL_HEATMAP_PRECISION', 7)
+
+def hour_of_week(moment):
+    local = timezone.localtime(moment)
+    return local.weekday() * 24 + local.hour
+
+def demand_key(call):
+    """(cell, hour_of_week, priority) bin of a call"""
+    cell = geohash_encode(float(call.latitude), float(call.longitude), heatmap_precision())
+    return cell, hour_of_week(call.created_at), call.priority
+
+def record_call(call):
+    """Add one call to its heatmap bin"""
+    cell, hour, priority = demand_key(call)
+    bin_filter = CallDemandCell.objects.filter(cell=cell, hour_of_week=hour, priority=priority)
+    if bin_filter.update(count=F('count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            CallDemandCell.objects.create(cell=cell, hour_of_week=hour, priority=priority, count=1)
+    except IntegrityError:
+        # Another request created the bin first
+        bin_filter.update(count=F('count') + 1)
@@ -0,0 +1,9 @@
+from jobs.queue import register_job
+from .archive import archive_closed_calls
+
+# Registered without roles: only schedules and commands can queue it, and it
+# always uses the configured DISPATCH_ARCHIVE_AFTER_DAYS
+@register_job('dispatch.archive_closed_calls', max_attempts=1)
+def archive_closed_calls_job():
+    calls, trips = archive_closed_calls()
+    return {'calls': calls, 'trips': trips}
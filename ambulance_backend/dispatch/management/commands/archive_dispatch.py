@@ -0,0 +1,30 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from dispatch.archive import archive_closed_calls, archivable_calls, archive_cutoff
+
+class Command(BaseCommand):
+    help = 'Move closed emergency calls and their trips older than N days to the archive tables (safe to interrupt and re-run)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=None,
+                            help=f"Default: DISPATCH_ARCHIVE_AFTER_DAYS ({getattr(settings, 'DISPATCH_ARCHIVE_AFTER_DAYS', 180)})")
+        parser.add_argument('--batch-size', type=int, default=None, help='Calls moved per transaction')
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches')
+        parser.add_argument('--dry-run', action='store_true', help='Count eligible calls without moving them')
+    
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            eligible = archivable_calls(archive_cutoff(options['older_than_days'])).count()
+            self.stdout.write(self.style.SUCCESS(f'{eligible} calls would be archived'))
+            return
+        
+        started = time.perf_counter()
+        calls, trips = archive_closed_calls(
+            older_than_days=options['older_than_days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            progress=lambda calls, trips: self.stdout.write(f'Archived {calls} calls, {trips} trips'),
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Done: {calls} calls and {trips} trips archived ({elapsed:.2f}s)'))
@@ -0,0 +1,154 @@
+import asyncio
+import io
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+from accounts.models import User
+
+ENDPOINTS = {
+    'available-ambulances': ('/api/ambulances/available/', '/api/async/ambulances/available/'),
+    'pending-calls': ('/api/emergency-calls/pending/', '/api/async/emergency-calls/pending/'),
+    'active-trips': ('/api/trips/active/', '/api/async/trips/active/'),
+    'profile': ('/api/profile/', '/api/async/profile/'),
+}
+
+class Command(BaseCommand):
+    help = (
+        'Load-test a hot read endpoint in process: the sync view behind WSGI with --workers threads '
+        'against its async version on a single ASGI event loop, with slow clients holding each response'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='active-trips')
+        parser.add_argument('--workers', type=int, default=4, help='WSGI worker threads')
+        parser.add_argument('--clients', type=int, default=64, help='Concurrent clients')
+        parser.add_argument('--requests', type=int, default=512, help='Requests per server')
+        parser.add_argument('--client-delay', type=float, default=100,
+                            help='Milliseconds a slow client takes to drain each response')
+        parser.add_argument('--username', help='User to authenticate as (default: the first active admin or dispatcher)')
+        parser.add_argument('--host', default='localhost', help='Host header; must be in ALLOWED_HOSTS')
+    
+    def handle(self, *args, **options):
+        if min(options['workers'], options['clients'], options['requests']) < 1:
+            raise CommandError('--workers, --clients and --requests must be positive')
+        
+        users = User.objects.filter(is_active=True)
+        if options['username']:
+            user = users.filter(username=options['username']).first()
+        else:
+            user = users.filter(role__in=('admin', 'dispatcher')).order_by('id').first()
+        if user is None:
+            raise CommandError('No such active user; pass --username')
+        token, _ = Token.objects.get_or_create(user=user)
+        
+        sync_path, async_path = ENDPOINTS[options['endpoint']]
+        self.headers = [(b'authorization', f'Token {token.key}'.encode()), (b'host', options['host'].encode())]
+        self.delay = options['client_delay'] / 1000
+        
+        wsgi = asyncio.run(self.load(self.wsgi_client(sync_path, options['workers']), options))
+        asgi = asyncio.run(self.load(self.asgi_client(async_path), options))
+        if wsgi['body'] != asgi['body']:
+            self.stdout.write(self.style.WARNING('Sync and async responses differ'))
+        
+        self.stdout.write(f"{options['clients']} clients, {options['requests']} requests, "
+                          f"{options['client_delay']:.0f} ms per response on the client side")
+        self.report(f"WSGI {options['workers']} threads", sync_path, wsgi)
+        self.report('ASGI 1 event loop', async_path, asgi)
+    
+    def report(self, label, path, result):
+        latencies = result['latencies']
+        self.stdout.write(self.style.SUCCESS(
+            f"{label:>18}  {path:<36} {len(latencies) / result['elapsed']:7.0f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:6.0f} ms  "
+            f"p95 {statistics.quantiles(latencies, n=20)[-1] * 1000:6.0f} ms  "
+            f"peak in flight {result['peak']}  errors {result['errors']}"
+        ))
+    
+    async def load(self, client, options):
+        """Run `--clients` concurrent clients until `--requests` requests have completed"""
+        state = {'latencies': [], 'errors': 0, 'in_flight': 0, 'peak': 0, 'body': None}
+        remaining = iter(range(options['requests']))
+        
+        async def user_loop():
+            for _ in remaining:
+                began = time.perf_counter()
+                state['in_flight'] += 1
+                state['peak'] = max(state['peak'], state['in_flight'])
+                status, body = await client()
+                state['in_flight'] -= 1
+                if status != 200:
+                    state['errors'] += 1
+                    continue
+                state['latencies'].append(time.perf_counter() - began)
+                state['body'] = body
+        
+        started = time.perf_counter()
+        await asyncio.gather(*[user_loop() for _ in range(options['clients'])])
+        state['elapsed'] = time.perf_counter() - started
+        return state
+    
+    def wsgi_client(self, path, workers):
+        handler = WSGIHandler()
+        pool = ThreadPoolExecutor(max_workers=workers)
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'wsgi.url_scheme': 'http', 'wsgi.errors': sys.stderr, 'wsgi.multithread': True,
+            'wsgi.multiprocess': False, 'wsgi.run_once': False,
+        }
+        environ.update({f"HTTP_{name.decode().upper()}": value.decode() for name, value in self.headers})
+        
+        def serve():
+            # The worker is held until the slow client has read the whole response
+            statuses = []
+            response = handler(
+                dict(environ, **{'wsgi.input': io.BytesIO()}),
+                lambda status, headers, exc_info=None: statuses.append(status)
+            )
+            try:
+                body = b''.join(response)
+                time.sleep(self.delay)
+            finally:
+                response.close()
+            return int(statuses[0].split()[0]), body
+        
+        async def client():
+            return await asyncio.get_running_loop().run_in_executor(pool, serve)
+        return client
+    
+    def asgi_client(self, path):
+        handler = ASGIHandler()
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+            'root_path': '', 'headers': self.headers,
+            'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+        }
+        
+        async def client():
+            received = asyncio.Event()
+            response = {'status': None, 'body': []}
+            
+            async def receive():
+                if not received.is_set():
+                    received.set()
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # The client stays connected; Django cancels this wait once the response is sent
+                await asyncio.Future()
+            
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    response['status'] = message['status']
+                elif message['type'] == 'http.response.body':
+                    response['body'].append(message.get('body', b''))
+                    if not message.get('more_body'):
+                        await asyncio.sleep(self.delay)
+            
+            await handler(dict(scope), receive, send)
+            return response['status'], b''.join(response['body'])
+        return client
@@ -0,0 +1,135 @@
+import gzip
+import io
+import json
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from accounts.models import User
+from ambulance_management.wire import MessagePackParser, MessagePackRenderer
+from ambulances.models import Ambulance
+from dispatch.models import EmergencyCall, Trip
+from dispatch.serializers import TripSerializer
+from dispatch.async_views import TRIP_RELATED
+from patients.models import Patient
+
+class Command(BaseCommand):
+    help = 'Compare JSON and MessagePack payload size and encode/decode time for pages of TripSerializer output'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=20)
+        parser.add_argument('--page-size', type=int, default=settings.REST_FRAMEWORK.get('PAGE_SIZE', 20))
+        parser.add_argument('--repeat', type=int, default=20, help='Timing rounds per page')
+        parser.add_argument('--synthetic', action='store_true',
+                            help='Use generated trips even when the database has enough real ones')
+    
+    def handle(self, *args, **options):
+        if min(options['pages'], options['page_size'], options['repeat']) < 1:
+            raise CommandError('--pages, --page-size and --repeat must be positive')
+        
+        count = options['pages'] * options['page_size']
+        trips = [] if options['synthetic'] else list(Trip.objects.select_related(*TRIP_RELATED)[:count])
+        source = 'database'
+        if len(trips) < options['page_size']:
+            trips, source = synthetic_trips(count), 'synthetic'
+        pages = [
+            {'count': len(trips), 'next': None, 'previous': None,
+             'results': TripSerializer(trips[start:start + options['page_size']], many=True).data}
+            for start in range(0, len(trips), options['page_size'])
+        ]
+        
+        formats = {
+            'json': (JSONRenderer(), json.loads),
+            'msgpack': (MessagePackRenderer(), lambda payload: MessagePackParser().parse(io.BytesIO(payload))),
+        }
+        results = {}
+        for name, (renderer, decode) in formats.items():
+            payloads = [renderer.render(page) for page in pages]
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                for page in pages:
+                    renderer.render(page)
+            encode = (time.perf_counter() - started) / (options['repeat'] * len(pages))
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                for payload in payloads:
+                    decode(payload)
+            decode_time = (time.perf_counter() - started) / (options['repeat'] * len(pages))
+            results[name] = {
+                'bytes': sum(map(len, payloads)) / len(payloads),
+                'gzip': sum(len(gzip.compress(payload)) for payload in payloads) / len(payloads),
+                'encode': encode,
+                'decode': decode_time,
+            }
+        
+        self.stdout.write(f'{len(pages)} pages of {options["page_size"]} {source} trips, per page:')
+        baseline = results['json']
+        for name, result in results.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{name:>8}: {result['bytes']:8.0f} B ({result['bytes'] / baseline['bytes']:4.0%})  "
+                f"gzip {result['gzip']:7.0f} B ({result['gzip'] / baseline['gzip']:4.0%})  "
+                f"encode {result['encode'] * 1e3:6.2f} ms  decode {result['decode'] * 1e3:6.2f} ms"
+            ))
+
+def synthetic_trips(count):
+    """Unsaved trips with every related object TripSerializer renders, so nothing touches the database"""
+    rng = random.Random(42)
+    today = date.today()
+    now = timezone.now()
+    
+    def coordinate(center):
+        return Decimal(center + rng.uniform(-0.2, 0.2)).quantize(Decimal('0.000001'))
+    
+    def user(number, role):
+        return User(id=number, username=f'{role}{number}', first_name=role.title(), last_name=f'No{number}', role=role)
+    
+    def patient(number):
+        return Patient(
+            id=number, name=f'Patient {number}', age=rng.randint(1, 90), gender=rng.choice(['male', 'female']),
+            phone='+255700000000', medical_condition='Chest pain, shortness of breath',
+            allergies=['Penicillin'], medications=['Aspirin'],
+            emergency_contact_name='Next of kin', emergency_contact_phone='+255711111111',
+            emergency_contact_relation='Spouse', pickup_latitude=coordinate(-6.8), pickup_longitude=coordinate(39.28),
+            pickup_address='Kariakoo, Dar es Salaam', destination_latitude=coordinate(-6.8),
+            destination_longitude=coordinate(39.28), destination_address='Upanga, Dar es Salaam',
+            hospital_name='Muhimbili National Hospital', created_at=now, updated_at=now,
+        )
+    
+    fleet = [
+        Ambulance(
+            id=number, vehicle_number=f'T {100 + number} ABC', license_number=f'LIC-{number}', model='Toyota Land Cruiser',
+            year=2021, status='en_route', latitude=coordinate(-6.8), longitude=coordinate(39.28),
+            assigned_driver=user(1000 + number, 'driver'), assigned_paramedic=user(2000 + number, 'paramedic'),
+            last_maintenance=today - timedelta(days=30), next_maintenance=today + timedelta(days=60),
+            insurance_expiry=today + timedelta(days=300), equipment=['Defibrillator', 'Oxygen Tank', 'Stretcher'],
+            created_at=now, updated_at=now,
+        )
+        for number in range(1, 21)
+    ]
+    dispatcher = user(1, 'dispatcher')
+    
+    trips = []
+    for number in range(1, count + 1):
+        ambulance = rng.choice(fleet)
+        trip_patient = patient(number)
+        call = EmergencyCall(
+            id=number, caller_name='Caller Name', caller_phone='+255722222222',
+            latitude=trip_patient.pickup_latitude, longitude=trip_patient.pickup_longitude,
+            address=trip_patient.pickup_address, priority=rng.choice(['low', 'medium', 'high', 'critical']),
+            status='transporting', description='Adult collapsed at home, conscious, breathing',
+            assigned_ambulance=ambulance, dispatcher=dispatcher, patient=trip_patient,
+            request_source='dispatcher', requester_type='individual', requester_details={},
+            created_at=now, response_time=rng.randint(300, 1800),
+        )
+        trips.append(Trip(
+            id=number, call=call, ambulance=ambulance, patient=trip_patient,
+            start_time=now - timedelta(minutes=rng.randint(5, 90)), end_time=None,
+            distance=Decimal(rng.uniform(1, 40)).quantize(Decimal('0.01')),
+            cost=Decimal(rng.uniform(20000, 200000)).quantize(Decimal('0.01')),
+            status='active', created_at=now, updated_at=now,
+        ))
+    return trips
@@ -0,0 +1,35 @@
+from collections import Counter
+from itertools import chain
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from dispatch.heatmap import demand_key
+from dispatch.models import ArchivedEmergencyCall, CallDemandCell, EmergencyCall
+
+class Command(BaseCommand):
+    help = 'Rebuild the call demand heatmap counts from the full emergency call history, archived calls included'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+    
+    def handle(self, *args, **options):
+        counts = Counter()
+        calls = chain.from_iterable(
+            model.objects.only('latitude', 'longitude', 'created_at', 'priority').iterator(chunk_size=options['chunk_size'])
+            for model in (ArchivedEmergencyCall, EmergencyCall)
+        )
+        for call in calls:
+            counts[demand_key(call)] += 1
+        
+        with transaction.atomic():
+            CallDemandCell.objects.all().delete()
+            CallDemandCell.objects.bulk_create(
+                [
+                    CallDemandCell(cell=cell, hour_of_week=hour, priority=priority, count=count)
+                    for (cell, hour, priority), count in counts.items()
+                ],
+                batch_size=options['chunk_size']
+            )
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {len(counts)} heatmap cells from {sum(counts.values())} calls'
+        ))
@@ -0,0 +1,64 @@
+from datetime import datetime, time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from dispatch.billing import totals_for_distance, track_distances_km
+from dispatch.models import Trip
+
+class Command(BaseCommand):
+    help = 'Recompute distance and cost of completed trips from GPS tracks and the tariff table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only trips that started on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--until', help='Only trips that started before this date (YYYY-MM-DD)')
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Report changes without saving them')
+    
+    def _parse_date(self, value, option):
+        if not value:
+            return None
+        try:
+            day = datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'--{option} must be a date in YYYY-MM-DD format')
+        return timezone.make_aware(datetime.combine(day, time.min))
+    
+    def handle(self, *args, **options):
+        trips = Trip.objects.filter(status='completed', end_time__isnull=False)
+        since = self._parse_date(options['since'], 'since')
+        until = self._parse_date(options['until'], 'until')
+        if since:
+            trips = trips.filter(start_time__gte=since)
+        if until:
+            trips = trips.filter(start_time__lt=until)
+        
+        chunk_size = options['chunk_size']
+        processed = changed = 0
+        last_id = 0
+        
+        # Keyset pagination on id keeps each chunk an indexed range scan with bounded memory
+        while True:
+            chunk = list(
+                trips.filter(id__gt=last_id).select_related('call').order_by('id')[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            
+            updated = []
+            for trip, distance_km in zip(chunk, track_distances_km(chunk)):
+                distance, cost = totals_for_distance(trip, distance_km, trip.call.priority)
+                if (distance, cost) != (trip.distance, trip.cost):
+                    trip.distance, trip.cost = distance, cost
+                    updated.append(trip)
+            
+            if updated and not options['dry_run']:
+                with transaction.atomic():
+                    Trip.objects.bulk_update(updated, ['distance', 'cost'])
+            
+            processed += len(chunk)
+            changed += len(updated)
+            self.stdout.write(f'Processed {processed} trips, {changed} changed')
+        
+        verb = 'would change' if options['dry_run'] else 'changed'
+        self.stdout.write(self.style.SUCCESS(f'Done: {processed} trips processed, {changed} {verb}'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dispatch', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emergencycall',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dispatch', '0002_emergencycall_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CallDemandCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell', models.CharField(help_text='Geohash at CALL_HEATMAP_PRECISION', max_length=12)),
+                ('hour_of_week', models.PositiveSmallIntegerField(help_text='0 = Monday 00:00-01:00 local time')),
+                ('priority', models.CharField(choices=[('critical', 'Critical'), ('high', 'High'), ('medium', 'Medium'), ('low', 'Low')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['cell', 'hour_of_week', 'priority'],
+                'unique_together': {('cell', 'hour_of_week', 'priority')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dispatch', '0003_calldemandcell'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emergencycall',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('assigned', 'Assigned'), ('en_route', 'En Route'), ('at_scene', 'At Scene'), ('transporting', 'Transporting'), ('at_hospital', 'At Hospital'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dispatch', '0004_emergencycall_at_hospital'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEmergencyCall',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('caller_name', models.CharField(max_length=200)),
+                ('caller_phone', models.CharField(max_length=20)),
+                ('latitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('longitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('address', models.TextField()),
+                ('priority', models.CharField(choices=[('critical', 'Critical'), ('high', 'High'), ('medium', 'Medium'), ('low', 'Low')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('assigned', 'Assigned'), ('en_route', 'En Route'), ('at_scene', 'At Scene'), ('transporting', 'Transporting'), ('at_hospital', 'At Hospital'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('description', models.TextField()),
+                ('assigned_ambulance_id', models.BigIntegerField(blank=True, db_index=True, null=True)),
+                ('dispatcher_id', models.BigIntegerField(blank=True, null=True)),
+                ('patient_id', models.BigIntegerField(blank=True, null=True)),
+                ('request_source', models.CharField(choices=[('phone_call', 'Phone Call'), ('system', 'System'), ('mobile_app', 'Mobile App'), ('web_portal', 'Web Portal')], max_length=20)),
+                ('requester_type', models.CharField(choices=[('individual', 'Individual'), ('hospital', 'Hospital'), ('clinic', 'Clinic'), ('nursing_home', 'Nursing Home'), ('emergency_services', 'Emergency Services')], max_length=20)),
+                ('requester_details', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('updated_at', models.DateTimeField()),
+                ('response_time', models.IntegerField(blank=True, help_text='Response time in minutes', null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTrip',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('call_id', models.BigIntegerField(unique=True)),
+                ('ambulance_id', models.BigIntegerField(db_index=True)),
+                ('patient_id', models.BigIntegerField()),
+                ('start_time', models.DateTimeField(db_index=True)),
+                ('end_time', models.DateTimeField(blank=True, null=True)),
+                ('distance', models.DecimalField(decimal_places=2, help_text='Distance in kilometers', max_digits=8)),
+                ('cost', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('completed', 'Completed')], max_length=20)),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -19,6 +19,7 @@ class EmergencyCall(models.Model):
         ('en_route', 'En Route'),
         ('at_scene', 'At Scene'),
         ('transporting', 'Transporting'),
+        ('at_hospital', 'At Hospital'),
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
     ]
@@ -38,6 +39,15 @@ class EmergencyCall(models.Model):
         ('emergency_services', 'Emergency Services'),
     ]
     
+    # Ambulance status that follows each call status transition
+    AMBULANCE_STATUS_FOR_CALL_STATUS = {
+        'completed': 'available',
+        'en_route': 'en_route',
+        'at_scene': 'at_scene',
+        'transporting': 'transporting',
+        'at_hospital': 'at_hospital',
+    }
+    
     # Caller information
     caller_name = models.CharField(max_length=200)
     caller_phone = models.CharField(max_length=20)
@@ -85,11 +95,23 @@ class EmergencyCall(models.Model):
     
     # Timing
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     response_time = models.IntegerField(null=True, blank=True, help_text="Response time in minutes")
     
     def __str__(self):
         return f"Call {self.id} - {self.priority} - {self.status}"
     
+    def update_status(self, new_status):
+        """Set the call status and move the assigned ambulance along with it"""
+        self.status = new_status
+        self.save()
+        
+        if self.assigned_ambulance:
+            ambulance_status = self.AMBULANCE_STATUS_FOR_CALL_STATUS.get(new_status)
+            if ambulance_status:
+                self.assigned_ambulance.status = ambulance_status
+            self.assigned_ambulance.save()
+    
     class Meta:
         ordering = ['-created_at']
 
@@ -118,3 +140,77 @@ class Trip(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+
+
+class CallDemandCell(models.Model):
+    """
+    Running count of emergency calls per geohash cell, hour of the week and
+    priority. Incremented as calls are created (see dispatch.signals), so the
+    heatmap never has to scan call history.
+    """
+    cell = models.CharField(max_length=12, help_text="Geohash at CALL_HEATMAP_PRECISION")
+    hour_of_week = models.PositiveSmallIntegerField(help_text="0 = Monday 00:00-01:00 local time")
+    priority = models.CharField(max_length=20, choices=EmergencyCall.PRIORITY_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.cell} - hour {self.hour_of_week} - {self.priority}: {self.count}"
+    
+    class Meta:
+        ordering = ['cell', 'hour_of_week', 'priority']
+        unique_together = ['cell', 'hour_of_week', 'priority']
+
+
+class ArchivedEmergencyCall(models.Model):
+    """
+    A closed emergency call moved out of the hot table by dispatch.archive.
+    Ids are kept, and relations are stored as plain ids so archived rows
+    outlive the ambulances, users and patients they mention.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    caller_name = models.CharField(max_length=200)
+    caller_phone = models.CharField(max_length=20)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    address = models.TextField()
+    priority = models.CharField(max_length=20, choices=EmergencyCall.PRIORITY_CHOICES)
+    status = models.CharField(max_length=20, choices=EmergencyCall.STATUS_CHOICES)
+    description = models.TextField()
+    assigned_ambulance_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    dispatcher_id = models.BigIntegerField(null=True, blank=True)
+    patient_id = models.BigIntegerField(null=True, blank=True)
+    request_source = models.CharField(max_length=20, choices=EmergencyCall.REQUEST_SOURCE_CHOICES)
+    requester_type = models.CharField(max_length=20, choices=EmergencyCall.REQUESTER_TYPE_CHOICES)
+    requester_details = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(db_index=True)
+    updated_at = models.DateTimeField()
+    response_time = models.IntegerField(null=True, blank=True, help_text="Response time in minutes")
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Archived call {self.id} - {self.priority} - {self.status}"
+    
+    class Meta:
+        ordering = ['-created_at']
+
+
+class ArchivedTrip(models.Model):
+    """A completed trip moved out of the hot table together with its call"""
+    id = models.BigIntegerField(primary_key=True)
+    call_id = models.BigIntegerField(unique=True)
+    ambulance_id = models.BigIntegerField(db_index=True)
+    patient_id = models.BigIntegerField()
+    start_time = models.DateTimeField(db_index=True)
+    end_time = models.DateTimeField(null=True, blank=True)
+    distance = models.DecimalField(max_digits=8, decimal_places=2, help_text="Distance in kilometers")
+    cost = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=20, choices=Trip.STATUS_CHOICES)
+    created_at = models.DateTimeField(db_index=True)
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Archived trip {self.id} - ambulance {self.ambulance_id}"
+    
+    class Meta:
+        ordering = ['-created_at']
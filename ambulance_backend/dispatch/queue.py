@@ -0,0 +1,172 @@
+"""
+Scheduling order for pending emergency calls.
+
+A call's urgency grows with its wait time, and its priority adds a head
+start measured in seconds of waiting:
+
+    urgency(now) = (now - created_at) + PENDING_CALL_PRIORITY_HEADSTART[priority]
+
+Every call ages at the same rate, so the relative order never changes.
+Each call can therefore be keyed once by its effective arrival time,
+``created_at - headstart``; the earliest key is the most urgent call.
+
+The full pending list is ordered by that key in SQL
+(pending_calls_by_urgency), so it always reflects the database.
+
+For next/top, the keys also live in a binary heap cached in process.
+dispatch.signals updates it when this process creates, assigns, cancels
+or deletes calls. Removals are lazy: an id leaves ``_keys`` immediately,
+and its heap entry is skipped when it surfaces. Other processes' writes
+never reach that heap. So before each read the queue compares a cheap
+marker of the pending calls (count, newest id, latest update) with the
+marker it was loaded at, and reloads when they differ.
+PENDING_CALL_QUEUE_TTL forces a reload regardless. Callers re-check the
+calls they get against the database.
+"""
+import heapq
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Case, Count, DateTimeField, DurationField, ExpressionWrapper, F, Max, Value, When
+from .models import EmergencyCall
+
+DEFAULT_PRIORITY_HEADSTART = {'critical': 1200, 'high': 600, 'medium': 300, 'low': 0}
+
+def priority_headstart(priority):
+    return getattr(settings, 'PENDING_CALL_PRIORITY_HEADSTART', DEFAULT_PRIORITY_HEADSTART).get(priority, 0)
+
+def queue_key(priority, created_at):
+    return created_at.timestamp() - priority_headstart(priority)
+
+def effective_arrival():
+    """queue_key() as a database expression: created_at minus the priority head start"""
+    headstarts = getattr(settings, 'PENDING_CALL_PRIORITY_HEADSTART', DEFAULT_PRIORITY_HEADSTART)
+    headstart = Case(
+        *[When(priority=priority, then=Value(timedelta(seconds=seconds))) for priority, seconds in headstarts.items()],
+        default=Value(timedelta(0)),
+        output_field=DurationField(),
+    )
+    return ExpressionWrapper(F('created_at') - headstart, output_field=DateTimeField())
+
+def pending_calls_by_urgency(queryset=None):
+    """Pending calls, most urgent first, in the order the queue would give them"""
+    queryset = EmergencyCall.objects.all() if queryset is None else queryset
+    return queryset.filter(status='pending').alias(effective_arrival=effective_arrival()).order_by('effective_arrival', 'id')
+
+def pending_marker():
+    """Changes whenever a call enters or leaves the pending set or a pending call is edited"""
+    marker = EmergencyCall.objects.filter(status='pending').aggregate(
+        count=Count('id'), last_id=Max('id'), last_update=Max('updated_at')
+    )
+    return marker['count'], marker['last_id'], marker['last_update']
+
+class PendingCallQueue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._heap = []
+        self._keys = {}
+        self._loaded_at = None
+        self._marker = None
+    
+    def _load(self, marker):
+        calls = EmergencyCall.objects.filter(status='pending').values_list('id', 'priority', 'created_at')
+        self._keys = {call_id: queue_key(priority, created_at) for call_id, priority, created_at in calls}
+        self._heap = [(key, call_id) for call_id, key in self._keys.items()]
+        heapq.heapify(self._heap)
+        self._loaded_at = time.monotonic()
+        self._marker = marker
+    
+    def _ensure_loaded(self):
+        # Taken before loading, so a change that lands mid-load triggers another reload
+        marker = pending_marker()
+        ttl = getattr(settings, 'PENDING_CALL_QUEUE_TTL', 30)
+        if self._loaded_at is None or marker != self._marker or time.monotonic() - self._loaded_at > ttl:
+            self._load(marker)
+    
+    def _compact(self):
+        # Rebuild once dead entries outnumber live ones, so the heap stays O(live calls)
+        if len(self._heap) > 2 * len(self._keys) + 64:
+            self._heap = [(key, call_id) for call_id, key in self._keys.items()]
+            heapq.heapify(self._heap)
+    
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+    
+    def push(self, call):
+        """Add or re-key a pending call, O(log n)"""
+        key = queue_key(call.priority, call.created_at)
+        with self._lock:
+            if self._loaded_at is None or self._keys.get(call.id) == key:
+                return
+            self._keys[call.id] = key
+            heapq.heappush(self._heap, (key, call.id))
+            self._compact()
+    
+    def discard(self, call_id):
+        """Remove a call, O(1); its heap entry is skipped when it surfaces"""
+        with self._lock:
+            if self._keys.pop(call_id, None) is not None:
+                self._compact()
+    
+    def _live(self, entry):
+        key, call_id = entry
+        return self._keys.get(call_id) == key
+    
+    def top(self, k):
+        """
+        The `k` most urgent call ids in order, O(k log k) on a clean heap.
+        The heap array is walked best-first from the root without popping,
+        so the queue itself is left untouched.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            # Drop dead entries sitting on top so that next() stays O(log n)
+            while self._heap and not self._live(self._heap[0]):
+                heapq.heappop(self._heap)
+            
+            result = []
+            frontier = [(self._heap[0], 0)] if self._heap else []
+            while frontier and len(result) < k:
+                entry, index = heapq.heappop(frontier)
+                if self._live(entry):
+                    result.append(entry[1])
+                for child in (2 * index + 1, 2 * index + 2):
+                    if child < len(self._heap):
+                        heapq.heappush(frontier, (self._heap[child], child))
+            return result
+    
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._keys)
+
+pending_call_queue = PendingCallQueue()
+
+def next_pending_calls(k=1):
+    """
+    The `k` most urgent pending calls, in order. Each call is confirmed
+    against the database; calls another process has already taken are
+    dropped from the queue and replaced.
+    """
+    calls = []
+    confirmed = set()
+    while len(calls) < k:
+        ids = [call_id for call_id in pending_call_queue.top(k) if call_id not in confirmed]
+        if not ids:
+            break
+        found = EmergencyCall.objects.filter(status='pending').in_bulk(ids)
+        for call_id in ids:
+            if call_id in found:
+                calls.append(found[call_id])
+                confirmed.add(call_id)
+            else:
+                pending_call_queue.discard(call_id)
+        if len(found) == len(ids):
+            break
+    return calls[:k]
+
+def urgency_seconds(call, now):
+    """How long the call has effectively waited, including its priority head start"""
+    return round((now - call.created_at).total_seconds() + priority_headstart(call.priority))
@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from .billing import as_distance, price_trip
 from .models import EmergencyCall, Trip
 from ambulances.serializers import AmbulanceSerializer
 from patients.serializers import PatientSerializer
 from accounts.serializers import UserSerializer
+from routing.eta import get_engine
 
 class EmergencyCallSerializer(serializers.ModelSerializer):
     assigned_ambulance_details = AmbulanceSerializer(source='assigned_ambulance', read_only=True)
@@ -49,3 +51,25 @@ class TripCreateSerializer(serializers.ModelSerializer):
         fields = [
             'call', 'ambulance', 'patient', 'start_time', 'distance', 'cost'
         ]
+        extra_kwargs = {
+            'distance': {'required': False},
+            'cost': {'required': False}
+        }
+    
+    def validate(self, attrs):
+        # Estimate the road distance from the scene to the patient's destination when not given
+        if attrs.get('distance') is None:
+            call = attrs['call']
+            patient = attrs['patient']
+            route = get_engine().route(
+                (float(call.latitude), float(call.longitude)),
+                (float(patient.destination_latitude), float(patient.destination_longitude))
+            )
+            if route is None:
+                raise serializers.ValidationError({'distance': ['No road route to the destination; please provide the distance']})
+            attrs['distance'] = as_distance(route.meters / 1000)
+        
+        # Provisional price from the estimate; complete_trip reprices from the GPS track
+        if attrs.get('cost') is None:
+            attrs['cost'] = price_trip(attrs['distance'], attrs['call'].priority)
+        return attrs
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from ambulances.models import AmbulanceLocation
+from patients.models import Patient
+from .geofence import check_ping, forget_call, forget_patient
+from .heatmap import record_call
+from .queue import pending_call_queue
+from .models import EmergencyCall, Trip
+
+@receiver(post_save, sender=EmergencyCall)
+def count_new_call(sender, instance, created, **kwargs):
+    if created:
+        record_call(instance)
+
+@receiver(post_save, sender=EmergencyCall)
+@receiver(post_delete, sender=EmergencyCall)
+def refresh_call_fences(sender, instance, **kwargs):
+    forget_call(instance.pk, instance.assigned_ambulance_id)
+
+@receiver(post_save, sender=EmergencyCall)
+def update_pending_queue(sender, instance, **kwargs):
+    if instance.status == 'pending':
+        pending_call_queue.push(instance)
+    else:
+        pending_call_queue.discard(instance.pk)
+
+@receiver(post_delete, sender=EmergencyCall)
+def drop_from_pending_queue(sender, instance, **kwargs):
+    pending_call_queue.discard(instance.pk)
+
+@receiver(post_save, sender=Trip)
+@receiver(post_delete, sender=Trip)
+def refresh_trip_fences(sender, instance, **kwargs):
+    # The trip's patient is the fallback hospital destination
+    forget_call(instance.call_id, instance.ambulance_id)
+
+@receiver(post_save, sender=Patient)
+@receiver(post_delete, sender=Patient)
+def refresh_patient_fences(sender, instance, **kwargs):
+    forget_patient(instance.pk)
+
+@receiver(post_save, sender=AmbulanceLocation)
+def check_geofences(sender, instance, created, **kwargs):
+    if created:
+        # The location update holds the freshly loaded ambulance, so its status costs no query
+        check_ping(
+            instance.ambulance_id, instance.latitude, instance.longitude, instance.recorded_at,
+            ambulance_status=instance.ambulance.status
+        )
@@ -1,3 +1,253 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+import hashlib
+from unittest import mock
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from accounts.models import User
+from ambulance_management import compiled_serializers
+from ambulance_management.compiled_serializers import compiled_serializer, serialize_list
+from ambulance_management.idempotency import IdempotencyStore, _store_key, idempotent
+from ambulances.models import Ambulance
+from ambulances.serializers import AmbulanceSerializer
+from hospitals.models import Hospital
+from patients.models import Patient
+from patients.serializers import PatientSerializer
+from sync.models import IdempotencyRecord
+from .archive import archive_closed_calls, call_history, trip_history
+from .models import ArchivedEmergencyCall, EmergencyCall, Trip
+from .serializers import EmergencyCallSerializer, TripSerializer
 
-# Create your tests here.
+class CompiledSerializerParityTests(TestCase):
+    """Compiled list serialization must render byte for byte what DRF renders"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.dispatcher = User.objects.create_user(
+            username='dispatcher', password='x', role='dispatcher', first_name='Asha', last_name='Mushi'
+        )
+        driver = User.objects.create_user(username='driver', password='x', role='driver', first_name='Juma')
+        paramedic = User.objects.create_user(username='paramedic', password='x', role='paramedic')
+        crewed = Ambulance.objects.create(
+            vehicle_number='T 101 AAA', license_number='L1', model='Land Cruiser', year=2021,
+            status='en_route', latitude=Decimal('-6.812345'), longitude=Decimal('39.280001'),
+            assigned_driver=driver, assigned_paramedic=paramedic,
+            last_maintenance=date(2026, 1, 1), next_maintenance=date(2026, 7, 1), insurance_expiry=date(2027, 1, 1),
+            equipment=['Defibrillator', 'Oxygen Tank'],
+        )
+        Ambulance.objects.create(
+            vehicle_number='T 102 AAA', license_number='L2', model='Hiace', year=2019,
+            last_maintenance=date(2026, 1, 1), next_maintenance=date(2026, 7, 1), insurance_expiry=date(2027, 1, 1),
+        )
+        hospital = Hospital.objects.create(name='Muhimbili', latitude=Decimal('-6.801'), longitude=Decimal('39.272'))
+        patient = Patient.objects.create(
+            name='Neema', age=34, gender='female', medical_condition='Fracture', allergies=['Penicillin'],
+            emergency_contact_name='Baraka', emergency_contact_phone='+255711000000', emergency_contact_relation='Brother',
+            pickup_latitude=Decimal('-6.82'), pickup_longitude=Decimal('39.29'), pickup_address='Kariakoo',
+            hospital=hospital, destination_latitude=Decimal('-6.801'), destination_longitude=Decimal('39.272'),
+            destination_address='Upanga', hospital_name='Muhimbili',
+        )
+        call = EmergencyCall.objects.create(
+            caller_name='Caller', caller_phone='+255722000000', latitude=Decimal('-6.82'), longitude=Decimal('39.29'),
+            address='Kariakoo', priority='high', status='transporting', description='Fall from height',
+            assigned_ambulance=crewed, dispatcher=cls.dispatcher, patient=patient,
+            request_source='phone_call', requester_type='individual', requester_details={'note': 'gate 3'},
+            response_time=12,
+        )
+        EmergencyCall.objects.create(
+            caller_name='Walk-in', caller_phone='+255733000000', latitude=Decimal('-6.7'), longitude=Decimal('39.2'),
+            address='Mwenge', priority='low', description='Minor cut', request_source='mobile_app', requester_type='individual',
+        )
+        Trip.objects.create(
+            call=call, ambulance=crewed, patient=patient, start_time=timezone.now() - timedelta(minutes=20),
+            distance=Decimal('7.25'), cost=Decimal('45000.00'),
+        )
+    
+    def test_compiled_rows_render_like_drf(self):
+        renderer = JSONRenderer()
+        for serializer_class, queryset in [
+            (AmbulanceSerializer, Ambulance.objects.order_by('id')),
+            (PatientSerializer, Patient.objects.order_by('id')),
+            (EmergencyCallSerializer, EmergencyCall.objects.order_by('id')),
+            (TripSerializer, Trip.objects.order_by('id')),
+        ]:
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertIsNotNone(compiled_serializer(serializer_class))
+                self.assertEqual(
+                    renderer.render(serialize_list(serializer_class, queryset)),
+                    renderer.render(serializer_class(queryset, many=True).data),
+                )
+    
+    def test_list_endpoints_match_drf(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.dispatcher).key}')
+        for path in [
+            '/api/ambulances/', '/api/ambulances/available/', '/api/patients/',
+            '/api/emergency-calls/', '/api/trips/', '/api/trips/active/',
+        ]:
+            with self.subTest(path=path):
+                compiled = client.get(path)
+                with mock.patch.object(compiled_serializers, 'compiled_serializer', return_value=None):
+                    drf = client.get(path)
+                self.assertEqual(compiled.status_code, 200)
+                self.assertEqual(compiled.content, drf.content)
+
+class IdempotencyKeyTests(TestCase):
+    """Retries with the same Idempotency-Key are answered from the stored response"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        dispatcher = User.objects.create_user(username='dispatcher', password='x', role='dispatcher')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=dispatcher).key}')
+        self.call = {
+            'caller_name': 'Caller', 'caller_phone': '+255722000000', 'latitude': '-6.82', 'longitude': '39.29',
+            'address': 'Kariakoo', 'priority': 'high', 'description': 'Fall', 'request_source': 'phone_call',
+            'requester_type': 'individual',
+        }
+    
+    def post(self, data, key='retry-1'):
+        return self.client.post('/api/emergency-calls/', data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+    
+    def test_retry_replays_the_first_response(self):
+        first = self.post(self.call)
+        retry = self.post(self.call)
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(EmergencyCall.objects.count(), 1)
+    
+    def test_retry_on_another_worker_replays(self):
+        self.post(self.call)
+        # A fresh store holds no process state, as in a second worker
+        with mock.patch('ambulance_management.idempotency._store', IdempotencyStore(3600, 1, 300)):
+            retry = self.post(self.call)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(EmergencyCall.objects.count(), 1)
+    
+    def test_reused_key_with_another_body_is_rejected(self):
+        self.post(self.call)
+        response = self.post(dict(self.call, caller_name='Someone else'))
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(EmergencyCall.objects.count(), 1)
+    
+    def test_headers_are_replayed(self):
+        @idempotent
+        def view(request):
+            response = HttpResponse(b'created', status=201)
+            response['Location'] = '/api/emergency-calls/7/'
+            return response
+        
+        factory = RequestFactory()
+        view(factory.post('/created', data=b'{}', content_type='application/json', HTTP_IDEMPOTENCY_KEY='k'))
+        retry = view(factory.post('/created', data=b'{}', content_type='application/json', HTTP_IDEMPOTENCY_KEY='k'))
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Location'], '/api/emergency-calls/7/')
+        self.assertEqual(retry['Content-Type'], 'text/html; charset=utf-8')
+    
+    def test_duplicate_waits_for_the_request_in_flight(self):
+        @idempotent
+        def view(request):
+            self.fail('the duplicate must not run the view')
+        
+        request = RequestFactory().post('/slow', data=b'{}', content_type='application/json', HTTP_IDEMPOTENCY_KEY='k')
+        IdempotencyRecord.objects.create(key=_store_key(request, 'k'), fingerprint=hashlib.sha256(b'{}').hexdigest())
+        
+        def first_request_finishes(seconds):
+            IdempotencyRecord.objects.update(status=201, headers=[('Content-Type', 'text/plain')], content=b'done')
+        
+        with mock.patch('ambulance_management.idempotency.time.sleep', side_effect=first_request_finishes):
+            response = view(request)
+        self.assertEqual((response.status_code, response.content), (201, b'done'))
+        
+        with mock.patch('ambulance_management.idempotency._store', IdempotencyStore(3600, 0, 300)):
+            IdempotencyRecord.objects.update(status=None)
+            self.assertEqual(view(request).status_code, 409)
+    
+    def test_server_errors_release_the_key(self):
+        @idempotent
+        def view(request):
+            return HttpResponse(status=503)
+        
+        factory = RequestFactory()
+        view(factory.post('/flaky', data=b'{}', content_type='application/json', HTTP_IDEMPOTENCY_KEY='k'))
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+class ArchiveRoundTripTests(TestCase):
+    """Archived calls must come back from call_history / trip_history exactly as they were"""
+    
+    def setUp(self):
+        self.ambulance = Ambulance.objects.create(
+            vehicle_number='T 101 AAA', license_number='L1', model='Land Cruiser', year=2021,
+            last_maintenance=date(2026, 1, 1), next_maintenance=date(2026, 7, 1), insurance_expiry=date(2027, 1, 1),
+        )
+        hospital = Hospital.objects.create(name='Muhimbili', latitude=Decimal('-6.801'), longitude=Decimal('39.272'))
+        self.patient = Patient.objects.create(
+            name='Neema', age=34, gender='female', medical_condition='Fracture',
+            emergency_contact_name='Baraka', emergency_contact_phone='+255711000000', emergency_contact_relation='Brother',
+            pickup_latitude=Decimal('-6.82'), pickup_longitude=Decimal('39.29'), pickup_address='Kariakoo',
+            hospital=hospital, destination_latitude=Decimal('-6.801'), destination_longitude=Decimal('39.272'),
+            destination_address='Upanga', hospital_name='Muhimbili',
+        )
+        self.closed = []
+        for index in range(5):
+            call = self.make_call(index, 'completed' if index % 2 else 'cancelled')
+            if index % 2:
+                Trip.objects.create(
+                    call=call, ambulance=self.ambulance, patient=self.patient, status='completed', start_time=call.created_at,
+                    end_time=call.created_at + timedelta(minutes=30), distance=Decimal('4.50'), cost=Decimal('30000.00'),
+                )
+            self.closed.append(call.id)
+        self.open_trip_call = self.make_call(5, 'completed')
+        Trip.objects.create(
+            call=self.open_trip_call, ambulance=self.ambulance, patient=self.patient, status='active', start_time=timezone.now(),
+            distance=Decimal('1.00'), cost=Decimal('0.00'),
+        )
+        self.pending = self.make_call(6, 'pending')
+        EmergencyCall.objects.update(updated_at=timezone.now() - timedelta(days=400))
+        self.recent = self.make_call(7, 'completed')
+    
+    def make_call(self, index, call_status):
+        return EmergencyCall.objects.create(
+            caller_name=f'Caller {index}', caller_phone='+255722000000', latitude=Decimal('-6.82'),
+            longitude=Decimal('39.29'), address='Kariakoo', priority='high', status=call_status,
+            description='Fall', assigned_ambulance=self.ambulance, request_source='phone_call',
+            requester_type='individual', requester_details={'index': index},
+        )
+    
+    def test_archived_calls_round_trip(self):
+        before_calls = {row['id']: row for row in call_history()}
+        before_trips = {row['id']: row for row in trip_history()}
+        
+        self.assertEqual(archive_closed_calls(older_than_days=30, batch_size=2), (5, 2))
+        self.assertEqual(
+            set(EmergencyCall.objects.values_list('id', flat=True)),
+            {self.open_trip_call.id, self.pending.id, self.recent.id}
+        )
+        self.assertEqual(set(ArchivedEmergencyCall.objects.values_list('id', flat=True)), set(self.closed))
+        
+        after_calls = list(call_history())
+        self.assertEqual([row['id'] for row in after_calls], sorted(before_calls, reverse=True))
+        for row in after_calls:
+            with self.subTest(call=row['id']):
+                self.assertEqual(row.pop('archived'), row['id'] in self.closed)
+                before_calls[row['id']].pop('archived')
+                self.assertEqual(row, before_calls[row['id']])
+        after_trips = list(trip_history())
+        self.assertEqual(len(after_trips), len(before_trips))
+        for row in after_trips:
+            with self.subTest(trip=row['id']):
+                self.assertEqual(row.pop('archived'), row['call_id'] in self.closed)
+                before_trips[row['id']].pop('archived')
+                self.assertEqual(row, before_trips[row['id']])
+        
+        # Nothing is left to move, and filters apply to both tables
+        self.assertEqual(archive_closed_calls(older_than_days=30), (0, 0))
+        self.assertEqual(
+            [row['id'] for row in call_history(start=timezone.now() - timedelta(days=1), status='cancelled')],
+            [self.closed[4], self.closed[2], self.closed[0]]
+        )
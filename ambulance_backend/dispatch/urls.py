@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     # Emergency Calls
@@ -7,11 +7,19 @@ urlpatterns = [
     path('emergency-calls/<int:pk>/', views.EmergencyCallDetailView.as_view(), name='emergency-call-detail'),
     path('emergency-calls/<int:call_id>/assign/', views.assign_ambulance_to_call, name='assign-ambulance'),
     path('emergency-calls/<int:call_id>/status/', views.update_call_status, name='update-call-status'),
+    path('emergency-calls/<int:call_id>/candidates/', views.call_candidates, name='call-candidates'),
     path('emergency-calls/pending/', views.pending_calls, name='pending-calls'),
+    path('async/emergency-calls/pending/', async_views.pending_calls, name='async-pending-calls'),
+    path('emergency-calls/pending/next/', views.next_pending_call, name='pending-calls-next'),
+    path('emergency-calls/pending/top/', views.top_pending_calls, name='pending-calls-top'),
+    path('emergency-calls/heatmap/', views.call_heatmap, name='call-heatmap'),
+    path('emergency-calls/history/', views.CallHistoryView.as_view(), name='call-history'),
     
     # Trips
     path('trips/', views.TripListCreateView.as_view(), name='trip-list-create'),
     path('trips/<int:pk>/', views.TripDetailView.as_view(), name='trip-detail'),
     path('trips/<int:trip_id>/complete/', views.complete_trip, name='complete-trip'),
     path('trips/active/', views.active_trips, name='active-trips'),
+    path('async/trips/active/', async_views.active_trips, name='async-active-trips'),
+    path('trips/history/', views.TripHistoryView.as_view(), name='trip-history'),
 ]
@@ -1,8 +1,18 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from datetime import datetime, time
+from decimal import Decimal
+from django.db.models import Sum
+from django.db.models.functions import Substr
 from django.utils import timezone
-from .models import EmergencyCall, Trip
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.decorators import method_decorator
+from .archive import call_history, trip_history
+from .billing import compute_trip_totals
+from .heatmap import heatmap_precision
+from .models import CallDemandCell, EmergencyCall, Trip
+from .queue import next_pending_calls, pending_calls_by_urgency, urgency_seconds
 from .serializers import (
     EmergencyCallSerializer, 
     EmergencyCallCreateSerializer,
@@ -10,10 +20,21 @@ from .serializers import (
     TripCreateSerializer
 )
 from ambulances.models import Ambulance
+from ambulances.scoping import AmbulanceScopedMixin, scope_queryset, visible_ambulance_ids
+from ambulance_management.compiled_serializers import CompiledListMixin, serialize_list
+from ambulance_management.db_routers import use_replica
+from ambulance_management.idempotency import idempotent
+from ambulance_management.wire import compact_wire
+from roster.index import roster_index
+from routing.eta import get_engine
+from routing.geo import geohash_center
 
-class EmergencyCallListCreateView(generics.ListCreateAPIView):
+@compact_wire
+@method_decorator(idempotent, name='dispatch')
+class EmergencyCallListCreateView(CompiledListMixin, AmbulanceScopedMixin, generics.ListCreateAPIView):
     queryset = EmergencyCall.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    ambulance_scope_fields = ('assigned_ambulance',)
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -27,13 +48,17 @@ class EmergencyCallListCreateView(generics.ListCreateAPIView):
         else:
             serializer.save()
 
-class EmergencyCallDetailView(generics.RetrieveUpdateDestroyAPIView):
+@compact_wire
+class EmergencyCallDetailView(AmbulanceScopedMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = EmergencyCall.objects.all()
     serializer_class = EmergencyCallSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ambulance_scope_fields = ('assigned_ambulance',)
 
+@idempotent
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@compact_wire
 def assign_ambulance_to_call(request, call_id):
     """Assign an ambulance to an emergency call"""
     try:
@@ -63,12 +88,60 @@ def assign_ambulance_to_call(request, call_id):
         
         serializer = EmergencyCallSerializer(call)
         return Response(serializer.data)
-        
+    
+    except EmergencyCall.DoesNotExist:
+        return Response({'error': 'Emergency call not found'}, status=status.HTTP_404_NOT_FOUND)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@compact_wire
+def call_candidates(request, call_id):
+    """Rank available ambulances for an emergency call by travel time to the scene"""
+    try:
+        call = EmergencyCall.objects.get(pk=call_id)
     except EmergencyCall.DoesNotExist:
         return Response({'error': 'Emergency call not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 5)), 50))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    ambulances = list(scope_queryset(
+        Ambulance.objects.filter(status='available', latitude__isnull=False, longitude__isnull=False),
+        request, ('id',)
+    ))
+    # Vehicles without a crew on shift cannot respond; the roster is answered from memory after a one-row version check
+    crewed = roster_index.crewed_ambulance_ids()
+    if crewed is not None:
+        ambulances = [ambulance for ambulance in ambulances if ambulance.id in crewed]
+    routes = get_engine().routes_to(
+        [(float(ambulance.latitude), float(ambulance.longitude)) for ambulance in ambulances],
+        (float(call.latitude), float(call.longitude))
+    )
+    
+    candidates = sorted(
+        (
+            (route, ambulance) for route, ambulance in zip(routes, ambulances)
+            if route is not None
+        ),
+        key=lambda candidate: candidate[0].seconds
+    )[:limit]
+    
+    return Response([
+        {
+            'ambulance_id': ambulance.id,
+            'vehicle_number': ambulance.vehicle_number,
+            'eta_seconds': round(route.seconds),
+            'distance_km': round(route.meters / 1000, 2)
+        }
+        for route, ambulance in candidates
+    ])
 
+@idempotent
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@compact_wire
 def update_call_status(request, call_id):
     """Update emergency call status"""
     try:
@@ -78,30 +151,17 @@ def update_call_status(request, call_id):
         if not new_status:
             return Response({'error': 'status is required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Update call status
-        call.status = new_status
-        call.save()
-        
-        # Update ambulance status if needed
-        if call.assigned_ambulance:
-            if new_status == 'completed':
-                call.assigned_ambulance.status = 'available'
-            elif new_status == 'en_route':
-                call.assigned_ambulance.status = 'en_route'
-            elif new_status == 'at_scene':
-                call.assigned_ambulance.status = 'at_scene'
-            elif new_status == 'transporting':
-                call.assigned_ambulance.status = 'transporting'
-            
-            call.assigned_ambulance.save()
+        # Update call status, and the ambulance status if needed
+        call.update_status(new_status)
         
         serializer = EmergencyCallSerializer(call)
         return Response(serializer.data)
-        
+    
     except EmergencyCall.DoesNotExist:
         return Response({'error': 'Emergency call not found'}, status=status.HTTP_404_NOT_FOUND)
 
-class TripListCreateView(generics.ListCreateAPIView):
+@compact_wire
+class TripListCreateView(CompiledListMixin, AmbulanceScopedMixin, generics.ListCreateAPIView):
     queryset = Trip.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     
@@ -110,21 +170,27 @@ class TripListCreateView(generics.ListCreateAPIView):
             return TripCreateSerializer
         return TripSerializer
 
-class TripDetailView(generics.RetrieveUpdateDestroyAPIView):
+@compact_wire
+class TripDetailView(AmbulanceScopedMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Trip.objects.all()
     serializer_class = TripSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+@idempotent
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@compact_wire
 def complete_trip(request, trip_id):
     """Complete a trip and update status"""
     try:
-        trip = Trip.objects.get(pk=trip_id)
+        trip = Trip.objects.select_related('call', 'ambulance').get(pk=trip_id)
         
         # Set end time and complete status
         trip.end_time = timezone.now()
         trip.status = 'completed'
+        
+        # Distance from the GPS track and cost from the tariff table
+        trip.distance, trip.cost = compute_trip_totals(trip, trip.call.priority if trip.call else None)
         trip.save()
         
         # Update ambulance status to available
@@ -139,22 +205,184 @@ def complete_trip(request, trip_id):
         
         serializer = TripSerializer(trip)
         return Response(serializer.data)
-        
+    
     except Trip.DoesNotExist:
         return Response({'error': 'Trip not found'}, status=status.HTTP_404_NOT_FOUND)
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@compact_wire
 def active_trips(request):
     """Get all active trips"""
-    trips = Trip.objects.filter(status='active')
-    serializer = TripSerializer(trips, many=True)
-    return Response(serializer.data)
+    trips = scope_queryset(Trip.objects.filter(status='active'), request)
+    return Response(serialize_list(TripSerializer, trips))
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@compact_wire
 def pending_calls(request):
-    """Get all pending emergency calls"""
-    calls = EmergencyCall.objects.filter(status='pending')
-    serializer = EmergencyCallSerializer(calls, many=True)
-    return Response(serializer.data)
+    """Get all pending emergency calls, most urgent first"""
+    return Response(serialize_list(EmergencyCallSerializer, pending_calls_by_urgency()))
+
+def _queued_calls_response(calls):
+    now = timezone.now()
+    data = EmergencyCallSerializer(calls, many=True).data
+    for rank, (call, item) in enumerate(zip(calls, data), start=1):
+        item['queue_rank'] = rank
+        item['wait_seconds'] = round((now - call.created_at).total_seconds())
+        item['urgency_seconds'] = urgency_seconds(call, now)
+    return data
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@compact_wire
+def next_pending_call(request):
+    """Get the most urgent pending call"""
+    calls = next_pending_calls(1)
+    if not calls:
+        return Response({'error': 'No pending calls'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(_queued_calls_response(calls)[0])
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@compact_wire
+def top_pending_calls(request):
+    """Get the k most urgent pending calls (query param k, default 10)"""
+    try:
+        k = min(max(int(request.query_params.get('k', 10)), 1), 100)
+    except ValueError:
+        return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(_queued_calls_response(next_pending_calls(k)))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@compact_wire
+def call_heatmap(request):
+    """
+    Sparse call counts per geohash cell, ready for map rendering.
+    Query params: precision (coarser cells are summed from the stored ones),
+    priority, hour_of_week (0-167), and group_by, a comma-separated subset of
+    hour_of_week,priority to keep as separate dimensions (default: both).
+    """
+    stored_precision = heatmap_precision()
+    try:
+        precision = int(request.query_params.get('precision', stored_precision))
+    except ValueError:
+        return Response({'error': 'precision must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= precision <= stored_precision:
+        return Response(
+            {'error': f'precision must be between 1 and {stored_precision}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    group_by = request.query_params.get('group_by', 'hour_of_week,priority')
+    dimensions = [dimension for dimension in group_by.split(',') if dimension]
+    if any(dimension not in ('hour_of_week', 'priority') for dimension in dimensions):
+        return Response({'error': 'group_by accepts hour_of_week and priority'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    hour = request.query_params.get('hour_of_week') or None
+    if hour is not None:
+        try:
+            hour = int(hour)
+        except ValueError:
+            return Response({'error': 'hour_of_week must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= hour <= 167:
+            return Response({'error': 'hour_of_week must be between 0 and 167'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    cells = CallDemandCell.objects.all()
+    priority = request.query_params.get('priority')
+    if priority:
+        cells = cells.filter(priority=priority)
+    if hour is not None:
+        cells = cells.filter(hour_of_week=hour)
+    
+    rows = (
+        cells.annotate(area=Substr('cell', 1, precision))
+        .values('area', *dimensions)
+        .annotate(total=Sum('count'))
+        .order_by('area', *dimensions)
+    )
+    
+    results = []
+    for row in rows:
+        latitude, longitude = geohash_center(row['area'])
+        result = {
+            'cell': row['area'],
+            'latitude': round(latitude, 6),
+            'longitude': round(longitude, 6),
+            'count': row['total']
+        }
+        for dimension in dimensions:
+            result[dimension] = row[dimension]
+        results.append(result)
+    
+    return Response({'precision': precision, 'cells': results})
+
+@compact_wire
+class _HistoryView(generics.GenericAPIView):
+    """Paginated rows from the hot and archive tables; see dispatch.archive"""
+    permission_classes = [permissions.IsAuthenticated]
+    ambulance_field = None
+    
+    def _parse_moment(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(name)
+            moment = datetime.combine(day, time.min)
+        return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+    
+    def get_filters(self):
+        filters = {}
+        visible = visible_ambulance_ids(self.request)
+        if visible is not None:
+            filters[f'{self.ambulance_field}__in'] = visible
+        if self.request.query_params.get('ambulance_id'):
+            filters[self.ambulance_field] = int(self.request.query_params['ambulance_id'])
+        if self.request.query_params.get('status'):
+            filters['status'] = self.request.query_params['status']
+        return filters
+    
+    def get(self, request):
+        try:
+            start, end = self._parse_moment('from'), self._parse_moment('to')
+        except ValueError:
+            return Response({'error': 'from and to must be dates or ISO 8601 datetimes'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            filters = self.get_filters()
+        except ValueError:
+            return Response({'error': 'ambulance_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        with use_replica():
+            page = self.paginate_queryset(self.history(start, end, **filters))
+        # Match the serializers, which render decimals as strings
+        rows = [
+            {key: str(value) if isinstance(value, Decimal) else value for key, value in row.items()}
+            for row in page
+        ]
+        return self.get_paginated_response(rows)
+
+class CallHistoryView(_HistoryView):
+    """Emergency calls created in [from, to), including archived ones when the range needs them"""
+    ambulance_field = 'assigned_ambulance_id'
+    
+    def get_filters(self):
+        filters = super().get_filters()
+        if self.request.query_params.get('priority'):
+            filters['priority'] = self.request.query_params['priority']
+        return filters
+    
+    def history(self, start, end, **filters):
+        return call_history(start, end, **filters)
+
+class TripHistoryView(_HistoryView):
+    """Trips started in [from, to), including archived ones when the range needs them"""
+    ambulance_field = 'ambulance_id'
+    
+    def history(self, start, end, **filters):
+        return trip_history(start, end, **filters)
@@ -0,0 +1,25 @@
+from django.contrib import admin
+from .models import Hospital
+
+@admin.register(Hospital)
+class HospitalAdmin(admin.ModelAdmin):
+    list_display = ('name', 'available_beds', 'total_beds', 'ed_available', 'ed_capacity', 'accepting_patients', 'capacity_updated_at')
+    list_filter = ('accepting_patients', 'is_active')
+    search_fields = ('name', 'address')
+    readonly_fields = ('created_at', 'updated_at')
+    
+    fieldsets = (
+        ('Hospital Information', {
+            'fields': ('name', 'address', 'phone', 'specialties', 'is_active')
+        }),
+        ('Location', {
+            'fields': ('latitude', 'longitude')
+        }),
+        ('Capacity', {
+            'fields': ('total_beds', 'available_beds', 'ed_capacity', 'ed_available', 'accepting_patients', 'capacity_updated_at')
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
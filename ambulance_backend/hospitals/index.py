@@ -0,0 +1,135 @@
+"""
+In-memory index of active hospitals for destination recommendations.
+
+Positions and capacity are held in NumPy arrays, so one vectorized pass
+prefilters candidates by straight-line distance, and only the closest few
+are routed with the ETA engine. Capacity reports update their row in
+place. Adding, moving or deactivating a hospital marks the index for
+rebuild. Every process also rebuilds after HOSPITAL_INDEX_TTL, which picks
+up updates made by other workers.
+"""
+import threading
+import time
+import numpy as np
+from django.conf import settings
+from routing.eta import get_engine
+from routing.geo import haversine_m_array
+from .models import Hospital
+
+INDEX_FIELDS = (
+    'id', 'name', 'latitude', 'longitude', 'specialties',
+    'available_beds', 'ed_capacity', 'ed_available', 'accepting_patients',
+)
+
+class HospitalIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built_at = None
+    
+    def _build(self):
+        rows = list(Hospital.objects.filter(is_active=True).values(*INDEX_FIELDS))
+        self.ids = [row['id'] for row in rows]
+        self.rows = {row['id']: index for index, row in enumerate(rows)}
+        self.names = [row['name'] for row in rows]
+        self.latitudes = np.array([float(row['latitude']) for row in rows], dtype=np.float64)
+        self.longitudes = np.array([float(row['longitude']) for row in rows], dtype=np.float64)
+        self.specialties = [frozenset(specialty.lower() for specialty in row['specialties']) for row in rows]
+        self.available_beds = np.array([row['available_beds'] for row in rows], dtype=np.int64)
+        self.ed_capacity = np.array([row['ed_capacity'] for row in rows], dtype=np.int64)
+        self.ed_available = np.array([row['ed_available'] for row in rows], dtype=np.int64)
+        self.accepting = np.array([row['accepting_patients'] for row in rows], dtype=bool)
+        self._built_at = time.monotonic()
+    
+    def _ensure_built(self):
+        ttl = getattr(settings, 'HOSPITAL_INDEX_TTL', 60)
+        if self._built_at is None or time.monotonic() - self._built_at > ttl:
+            self._build()
+    
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+    
+    def update(self, hospital):
+        """Apply a saved hospital to its row, or schedule a rebuild if it cannot be patched in place"""
+        with self._lock:
+            if self._built_at is None:
+                return
+            row = self.rows.get(hospital.id)
+            if (row is None or not hospital.is_active
+                    or self.latitudes[row] != float(hospital.latitude)
+                    or self.longitudes[row] != float(hospital.longitude)):
+                self._built_at = None
+                return
+            self.names[row] = hospital.name
+            self.specialties[row] = frozenset(specialty.lower() for specialty in hospital.specialties)
+            self.available_beds[row] = hospital.available_beds
+            self.ed_capacity[row] = hospital.ed_capacity
+            self.ed_available[row] = hospital.ed_available
+            self.accepting[row] = hospital.accepting_patients
+    
+    def _ed_load(self, row):
+        if not self.ed_capacity[row]:
+            return 1.0
+        return round(max(0.0, 1 - float(self.ed_available[row]) / float(self.ed_capacity[row])), 3)
+    
+    def nearest(self, latitude, longitude, specialty=None, limit=8):
+        """Up to `limit` hospitals accepting patients, nearest first, preferring those with a free ED space"""
+        with self._lock:
+            self._ensure_built()
+            if not self.ids:
+                return []
+            eligible = self.accepting.copy()
+            if specialty:
+                specialty = specialty.lower()
+                eligible &= np.array([specialty in offered for offered in self.specialties], dtype=bool)
+            with_space = eligible & (self.ed_available > 0)
+            if with_space.any():
+                eligible = with_space
+            
+            candidates = np.flatnonzero(eligible)
+            distances = haversine_m_array(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+            order = np.argsort(distances)[:limit]
+            return [
+                {
+                    'hospital_id': self.ids[row],
+                    'name': self.names[row],
+                    'latitude': float(self.latitudes[row]),
+                    'longitude': float(self.longitudes[row]),
+                    'specialties': sorted(self.specialties[row]),
+                    'available_beds': int(self.available_beds[row]),
+                    'ed_capacity': int(self.ed_capacity[row]),
+                    'ed_available': int(self.ed_available[row]),
+                    'ed_load': self._ed_load(row),
+                    'straight_line_km': round(float(distances[index]) / 1000, 2),
+                }
+                for index, row in ((index, candidates[index]) for index in order)
+            ]
+
+hospital_index = HospitalIndex()
+
+def recommend_hospitals(latitude, longitude, specialty=None, limit=3):
+    """
+    Rank hospitals for a patient at (latitude, longitude). Score is the
+    travel time stretched by ED load: a full ED counts as
+    (1 + HOSPITAL_LOAD_WEIGHT) times the drive.
+    """
+    load_weight = getattr(settings, 'HOSPITAL_LOAD_WEIGHT', 1.0)
+    candidates = hospital_index.nearest(
+        latitude, longitude, specialty,
+        limit=max(limit, getattr(settings, 'HOSPITAL_RECOMMEND_CANDIDATES', 8))
+    )
+    engine = get_engine()
+    ranked = []
+    for candidate in candidates:
+        route = engine.route((latitude, longitude), (candidate['latitude'], candidate['longitude']))
+        if route is None:
+            continue
+        candidate.update({
+            'eta_seconds': round(route.seconds),
+            'eta_minutes': round(route.seconds / 60, 1),
+            'distance_km': round(route.meters / 1000, 2),
+            'score': round(route.seconds * (1 + load_weight * candidate['ed_load']), 1),
+        })
+        ranked.append(candidate)
+    ranked.sort(key=lambda candidate: candidate['score'])
+    return ranked[:limit]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Hospital',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('address', models.TextField(blank=True)),
+                ('phone', models.CharField(blank=True, max_length=20)),
+                ('latitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('longitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('specialties', models.JSONField(blank=True, default=list)),
+                ('total_beds', models.PositiveIntegerField(default=0)),
+                ('available_beds', models.PositiveIntegerField(default=0)),
+                ('ed_capacity', models.PositiveIntegerField(default=0, help_text='Emergency department treatment spaces')),
+                ('ed_available', models.PositiveIntegerField(default=0)),
+                ('accepting_patients', models.BooleanField(default=True, help_text='False while the hospital is on diversion')),
+                ('capacity_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ]
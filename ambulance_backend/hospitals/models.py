@@ -0,0 +1,36 @@
+from django.db import models
+
+class Hospital(models.Model):
+    name = models.CharField(max_length=200, unique=True)
+    address = models.TextField(blank=True)
+    phone = models.CharField(max_length=20, blank=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    
+    # Stored as a JSON array, e.g. ["trauma", "cardiology", "maternity"]
+    specialties = models.JSONField(default=list, blank=True)
+    
+    # Live capacity, reported by the hospital or the dispatch desk
+    total_beds = models.PositiveIntegerField(default=0)
+    available_beds = models.PositiveIntegerField(default=0)
+    ed_capacity = models.PositiveIntegerField(default=0, help_text="Emergency department treatment spaces")
+    ed_available = models.PositiveIntegerField(default=0)
+    accepting_patients = models.BooleanField(default=True, help_text="False while the hospital is on diversion")
+    capacity_updated_at = models.DateTimeField(null=True, blank=True)
+    
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return self.name
+    
+    @property
+    def ed_load(self):
+        """Share of emergency department spaces in use (1.0 when unknown)"""
+        if not self.ed_capacity:
+            return 1.0
+        return max(0.0, 1 - self.ed_available / self.ed_capacity)
+    
+    class Meta:
+        ordering = ['name']
@@ -0,0 +1,33 @@
+from django.utils import timezone
+from rest_framework import serializers
+from .models import Hospital
+
+class HospitalSerializer(serializers.ModelSerializer):
+    ed_load = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = Hospital
+        fields = [
+            'id', 'name', 'address', 'phone', 'latitude', 'longitude', 'specialties',
+            'total_beds', 'available_beds', 'ed_capacity', 'ed_available', 'ed_load',
+            'accepting_patients', 'capacity_updated_at', 'is_active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'capacity_updated_at', 'created_at', 'updated_at']
+
+class HospitalCapacitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Hospital
+        fields = ['total_beds', 'available_beds', 'ed_capacity', 'ed_available', 'accepting_patients']
+    
+    def validate(self, attrs):
+        total_beds = attrs.get('total_beds', self.instance.total_beds)
+        ed_capacity = attrs.get('ed_capacity', self.instance.ed_capacity)
+        if attrs.get('available_beds', self.instance.available_beds) > total_beds:
+            raise serializers.ValidationError({'available_beds': 'Cannot exceed total_beds.'})
+        if attrs.get('ed_available', self.instance.ed_available) > ed_capacity:
+            raise serializers.ValidationError({'ed_available': 'Cannot exceed ed_capacity.'})
+        return attrs
+    
+    def update(self, instance, validated_data):
+        validated_data['capacity_updated_at'] = timezone.now()
+        return super().update(instance, validated_data)
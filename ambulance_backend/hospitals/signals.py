@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .index import hospital_index
+from .models import Hospital
+
+@receiver(post_save, sender=Hospital)
+def refresh_hospital_index(sender, instance, **kwargs):
+    hospital_index.update(instance)
+
+@receiver(post_delete, sender=Hospital)
+def drop_from_hospital_index(sender, instance, **kwargs):
+    hospital_index.invalidate()
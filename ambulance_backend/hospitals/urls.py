@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('hospitals/', views.HospitalListCreateView.as_view(), name='hospital-list-create'),
+    path('hospitals/<int:pk>/', views.HospitalDetailView.as_view(), name='hospital-detail'),
+    path('hospitals/<int:pk>/capacity/', views.update_hospital_capacity, name='hospital-capacity'),
+    path('hospitals/recommend/', views.recommend_destination, name='hospital-recommend'),
+]
@@ -0,0 +1,58 @@
+from rest_framework import generics, permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from dispatch.models import EmergencyCall
+from .index import recommend_hospitals
+from .models import Hospital
+from .serializers import HospitalSerializer, HospitalCapacitySerializer
+
+class HospitalListCreateView(generics.ListCreateAPIView):
+    queryset = Hospital.objects.all()
+    serializer_class = HospitalSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+class HospitalDetailView(generics.RetrieveUpdateDestroyAPIView):
+    queryset = Hospital.objects.all()
+    serializer_class = HospitalSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+@api_view(['PATCH'])
+@permission_classes([permissions.IsAuthenticated])
+def update_hospital_capacity(request, pk):
+    """Report a hospital's current bed and emergency department capacity"""
+    try:
+        hospital = Hospital.objects.get(pk=pk)
+        serializer = HospitalCapacitySerializer(hospital, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(HospitalSerializer(hospital).data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    except Hospital.DoesNotExist:
+        return Response({'error': 'Hospital not found'}, status=status.HTTP_404_NOT_FOUND)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def recommend_destination(request):
+    """Rank hospitals for a patient by travel time and emergency department load"""
+    params = request.query_params
+    call_id = params.get('call_id')
+    try:
+        limit = min(max(int(params.get('limit', 3)), 1), 20)
+        if call_id:
+            call = EmergencyCall.objects.get(pk=call_id)
+            latitude, longitude = float(call.latitude), float(call.longitude)
+        else:
+            latitude, longitude = float(params['latitude']), float(params['longitude'])
+    except EmergencyCall.DoesNotExist:
+        return Response({'error': 'Emergency call not found'}, status=status.HTTP_404_NOT_FOUND)
+    except (KeyError, ValueError):
+        return Response(
+            {'error': 'Provide call_id, or numeric latitude and longitude (and an integer limit)'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    return Response({
+        'origin': {'latitude': latitude, 'longitude': longitude},
+        'specialty': params.get('specialty'),
+        'recommendations': recommend_hospitals(latitude, longitude, params.get('specialty'), limit)
+    })
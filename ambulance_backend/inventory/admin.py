@@ -0,0 +1,23 @@
+from django.contrib import admin
+from .models import AmbulanceStock, Consumable, StockEvent
+
+@admin.register(Consumable)
+class ConsumableAdmin(admin.ModelAdmin):
+    list_display = ('name', 'unit', 'per_trip_usage', 'default_min_level', 'default_par_level', 'is_active')
+    list_filter = ('is_active',)
+    search_fields = ('name',)
+
+@admin.register(AmbulanceStock)
+class AmbulanceStockAdmin(admin.ModelAdmin):
+    list_display = ('ambulance', 'consumable', 'quantity', 'min_level', 'par_level', 'is_low')
+    list_filter = ('is_low', 'consumable')
+    search_fields = ('ambulance__vehicle_number', 'consumable__name')
+    # Quantities move only through stock events
+    readonly_fields = ('quantity', 'is_low', 'updated_at')
+
+@admin.register(StockEvent)
+class StockEventAdmin(admin.ModelAdmin):
+    list_display = ('stock', 'kind', 'quantity_change', 'quantity_after', 'trip', 'recorded_by', 'created_at')
+    list_filter = ('kind', 'created_at')
+    raw_id_fields = ('stock', 'trip', 'recorded_by')
+    readonly_fields = ('created_at',)
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('ambulances', '0003_repositioningplan'),
+        ('dispatch', '0004_emergencycall_at_hospital'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Consumable',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('unit', models.CharField(default='pcs', max_length=20)),
+                ('per_trip_usage', models.PositiveIntegerField(default=0, help_text='Units used by a typical completed trip')),
+                ('default_min_level', models.PositiveIntegerField(default=0, help_text='Low-stock threshold for new stock rows')),
+                ('default_par_level', models.PositiveIntegerField(default=0, help_text='Restock target for new stock rows')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AmbulanceStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField(default=0)),
+                ('min_level', models.PositiveIntegerField(default=0)),
+                ('par_level', models.PositiveIntegerField(default=0)),
+                ('is_low', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('ambulance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock', to='ambulances.ambulance')),
+                ('consumable', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock', to='inventory.consumable')),
+            ],
+            options={
+                'ordering': ['ambulance', 'consumable'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('trip_usage', 'Trip Usage'), ('restock', 'Restock'), ('adjustment', 'Adjustment')], max_length=20)),
+                ('quantity_change', models.IntegerField()),
+                ('quantity_after', models.IntegerField()),
+                ('note', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('recorded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_events', to=settings.AUTH_USER_MODEL)),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='inventory.ambulancestock')),
+                ('trip', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_events', to='dispatch.trip')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ambulancestock',
+            index=models.Index(condition=models.Q(('is_low', True)), fields=['ambulance'], name='stock_low'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='ambulancestock',
+            unique_together={('ambulance', 'consumable')},
+        ),
+        migrations.AddConstraint(
+            model_name='stockevent',
+            constraint=models.UniqueConstraint(condition=models.Q(('kind', 'trip_usage')), fields=('trip', 'stock'), name='stock_event_trip_once'),
+        ),
+    ]
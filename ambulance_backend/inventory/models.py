@@ -0,0 +1,86 @@
+from django.db import models
+from accounts.models import User
+from ambulances.models import Ambulance
+from dispatch.models import Trip
+
+class Consumable(models.Model):
+    """A kind of supply carried on ambulances, e.g. gloves or saline bags"""
+    name = models.CharField(max_length=100, unique=True)
+    unit = models.CharField(max_length=20, default='pcs')
+    per_trip_usage = models.PositiveIntegerField(default=0, help_text="Units used by a typical completed trip")
+    default_min_level = models.PositiveIntegerField(default=0, help_text="Low-stock threshold for new stock rows")
+    default_par_level = models.PositiveIntegerField(default=0, help_text="Restock target for new stock rows")
+    is_active = models.BooleanField(default=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return self.name
+    
+    class Meta:
+        ordering = ['name']
+
+
+class AmbulanceStock(models.Model):
+    """
+    Current quantity of one consumable on one ambulance. The quantity is a
+    running counter moved by StockEvents (see inventory.stock); `is_low` is
+    kept alongside it so low-stock alerts are a single indexed lookup.
+    """
+    ambulance = models.ForeignKey(Ambulance, on_delete=models.CASCADE, related_name='stock')
+    consumable = models.ForeignKey(Consumable, on_delete=models.CASCADE, related_name='stock')
+    quantity = models.IntegerField(default=0)
+    min_level = models.PositiveIntegerField(default=0)
+    par_level = models.PositiveIntegerField(default=0)
+    is_low = models.BooleanField(default=False)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.ambulance.vehicle_number} - {self.consumable.name}: {self.quantity}"
+    
+    def save(self, *args, **kwargs):
+        self.is_low = self.quantity < self.min_level
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'quantity', 'min_level'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'is_low'}
+        super().save(*args, **kwargs)
+    
+    class Meta:
+        ordering = ['ambulance', 'consumable']
+        unique_together = ['ambulance', 'consumable']
+        indexes = [
+            models.Index(fields=['ambulance'], name='stock_low', condition=models.Q(is_low=True)),
+        ]
+
+
+class StockEvent(models.Model):
+    """One change to an ambulance's stock; the history behind the counters"""
+    KIND_CHOICES = [
+        ('trip_usage', 'Trip Usage'),
+        ('restock', 'Restock'),
+        ('adjustment', 'Adjustment'),
+    ]
+    
+    stock = models.ForeignKey(AmbulanceStock, on_delete=models.CASCADE, related_name='events')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    quantity_change = models.IntegerField()
+    quantity_after = models.IntegerField()
+    trip = models.ForeignKey(Trip, on_delete=models.SET_NULL, null=True, blank=True, related_name='stock_events')
+    recorded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='stock_events')
+    note = models.CharField(max_length=200, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.quantity_change:+d} ({self.stock})"
+    
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            # A trip is charged to each stock row at most once
+            models.UniqueConstraint(
+                fields=['trip', 'stock'], condition=models.Q(kind='trip_usage'), name='stock_event_trip_once'
+            ),
+        ]
@@ -0,0 +1,61 @@
+from rest_framework import serializers
+from ambulances.models import Ambulance
+from .models import AmbulanceStock, Consumable, StockEvent
+
+class ConsumableSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Consumable
+        fields = [
+            'id', 'name', 'unit', 'per_trip_usage', 'default_min_level', 'default_par_level',
+            'is_active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+class AmbulanceStockSerializer(serializers.ModelSerializer):
+    vehicle_number = serializers.CharField(source='ambulance.vehicle_number', read_only=True)
+    consumable_name = serializers.CharField(source='consumable.name', read_only=True)
+    unit = serializers.CharField(source='consumable.unit', read_only=True)
+    
+    class Meta:
+        model = AmbulanceStock
+        fields = [
+            'id', 'ambulance', 'vehicle_number', 'consumable', 'consumable_name', 'unit',
+            'quantity', 'min_level', 'par_level', 'is_low', 'updated_at'
+        ]
+        # Quantities only move through restock and trip events
+        read_only_fields = ['id', 'ambulance', 'consumable', 'quantity', 'is_low', 'updated_at']
+
+class StockEventSerializer(serializers.ModelSerializer):
+    ambulance = serializers.IntegerField(source='stock.ambulance_id', read_only=True)
+    consumable = serializers.IntegerField(source='stock.consumable_id', read_only=True)
+    
+    class Meta:
+        model = StockEvent
+        fields = [
+            'id', 'stock', 'ambulance', 'consumable', 'kind', 'quantity_change', 'quantity_after',
+            'trip', 'recorded_by', 'note', 'created_at'
+        ]
+        read_only_fields = fields
+
+class StockItemSerializer(serializers.Serializer):
+    consumable = serializers.PrimaryKeyRelatedField(queryset=Consumable.objects.filter(is_active=True))
+    quantity = serializers.IntegerField()
+
+class RestockSerializer(serializers.Serializer):
+    KIND_CHOICES = [('restock', 'Restock'), ('adjustment', 'Adjustment')]
+    
+    ambulance = serializers.PrimaryKeyRelatedField(queryset=Ambulance.objects.all())
+    kind = serializers.ChoiceField(choices=KIND_CHOICES, default='restock')
+    items = StockItemSerializer(many=True, allow_empty=False)
+    note = serializers.CharField(max_length=200, required=False, allow_blank=True, default='')
+    
+    def validate(self, attrs):
+        consumables = [item['consumable'].pk for item in attrs['items']]
+        if len(consumables) != len(set(consumables)):
+            raise serializers.ValidationError({'items': 'Each consumable may appear only once.'})
+        for item in attrs['items']:
+            if item['quantity'] == 0 or (attrs['kind'] == 'restock' and item['quantity'] < 0):
+                raise serializers.ValidationError(
+                    {'items': 'Restock quantities must be positive; adjustments must be non-zero.'}
+                )
+        return attrs
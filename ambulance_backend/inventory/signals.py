@@ -0,0 +1,9 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from dispatch.models import Trip
+from .stock import record_trip_usage
+
+@receiver(post_save, sender=Trip)
+def use_trip_consumables(sender, instance, **kwargs):
+    if instance.status == 'completed':
+        record_trip_usage(instance)
@@ -0,0 +1,80 @@
+"""
+Stock counters.
+
+AmbulanceStock.quantity is never recomputed from history. Every change is
+one UPDATE that moves the counter and the `is_low` flag together with F()
+expressions, so concurrent trips and restocks cannot lose updates, plus one
+StockEvent row recording what happened. Completed trips use up each
+consumable's `per_trip_usage` once (see inventory.signals).
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, ExpressionWrapper, F, Q
+from .models import AmbulanceStock, StockEvent
+
+def get_stock(ambulance_id, consumable):
+    """The stock row for a consumable on an ambulance, created at the consumable's default levels"""
+    stock, _ = AmbulanceStock.objects.get_or_create(
+        ambulance_id=ambulance_id,
+        consumable=consumable,
+        defaults={
+            'min_level': consumable.default_min_level,
+            'par_level': consumable.default_par_level,
+        }
+    )
+    return stock
+
+def change_stock(stock_id, change, kind, trip=None, user=None, note=''):
+    """Move a stock counter by `change` and record the event; returns the event"""
+    with transaction.atomic():
+        # SET expressions see the row as it was, so the new quantity is below
+        # min_level exactly when the old one is below min_level - change
+        AmbulanceStock.objects.filter(pk=stock_id).update(
+            quantity=F('quantity') + change,
+            is_low=ExpressionWrapper(Q(quantity__lt=F('min_level') - change), output_field=BooleanField()),
+        )
+        quantity = AmbulanceStock.objects.filter(pk=stock_id).values_list('quantity', flat=True).get()
+        return StockEvent.objects.create(
+            stock_id=stock_id,
+            kind=kind,
+            quantity_change=change,
+            quantity_after=quantity,
+            trip=trip,
+            recorded_by=user if user is not None and user.is_authenticated else None,
+            note=note,
+        )
+
+def restock(ambulance_id, items, user=None, note='', kind='restock'):
+    """Apply [(consumable, quantity), ...] to an ambulance; returns the events"""
+    events = []
+    with transaction.atomic():
+        for consumable, quantity in items:
+            stock = get_stock(ambulance_id, consumable)
+            events.append(change_stock(stock.pk, quantity, kind, user=user, note=note))
+    return events
+
+def record_trip_usage(trip):
+    """Take each carried consumable's per-trip usage off the trip's ambulance, once per trip"""
+    if StockEvent.objects.filter(trip=trip, kind='trip_usage').exists():
+        return []
+    stocks = AmbulanceStock.objects.filter(
+        ambulance_id=trip.ambulance_id,
+        consumable__is_active=True,
+        consumable__per_trip_usage__gt=0,
+    ).values_list('id', 'consumable__per_trip_usage')
+    events = []
+    for stock_id, usage in stocks:
+        try:
+            with transaction.atomic():
+                events.append(change_stock(stock_id, -usage, 'trip_usage', trip=trip))
+        except IntegrityError:
+            # Another save of the same trip got there first
+            continue
+    return events
+
+def low_stock():
+    """Stock rows below their minimum level, served by the partial index on is_low"""
+    return (
+        AmbulanceStock.objects.filter(is_low=True)
+        .select_related('ambulance', 'consumable')
+        .order_by('ambulance__vehicle_number', 'consumable__name')
+    )
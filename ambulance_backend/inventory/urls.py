@@ -0,0 +1,12 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('inventory/consumables/', views.ConsumableListCreateView.as_view(), name='consumable-list-create'),
+    path('inventory/consumables/<int:pk>/', views.ConsumableDetailView.as_view(), name='consumable-detail'),
+    path('inventory/stock/', views.AmbulanceStockListView.as_view(), name='ambulance-stock-list'),
+    path('inventory/stock/<int:pk>/', views.AmbulanceStockDetailView.as_view(), name='ambulance-stock-detail'),
+    path('inventory/events/', views.StockEventListView.as_view(), name='stock-event-list'),
+    path('inventory/restock/', views.restock_ambulance, name='inventory-restock'),
+    path('inventory/low-stock/', views.low_stock_alerts, name='low-stock-alerts'),
+]
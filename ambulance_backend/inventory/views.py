@@ -0,0 +1,117 @@
+from rest_framework import generics, permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from ambulances.scoping import AmbulanceScopedMixin, visible_ambulance_ids
+from .models import AmbulanceStock, Consumable, StockEvent
+from .serializers import (
+    AmbulanceStockSerializer,
+    ConsumableSerializer,
+    RestockSerializer,
+    StockEventSerializer,
+)
+from .stock import low_stock, restock
+
+class ConsumableListCreateView(generics.ListCreateAPIView):
+    queryset = Consumable.objects.all()
+    serializer_class = ConsumableSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+class ConsumableDetailView(generics.RetrieveUpdateDestroyAPIView):
+    queryset = Consumable.objects.all()
+    serializer_class = ConsumableSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+class AmbulanceStockListView(AmbulanceScopedMixin, generics.ListAPIView):
+    serializer_class = AmbulanceStockSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        queryset = AmbulanceStock.objects.select_related('ambulance', 'consumable')
+        
+        # Filter by query parameters
+        ambulance_id = self.request.query_params.get('ambulance_id')
+        consumable_id = self.request.query_params.get('consumable_id')
+        low = self.request.query_params.get('low')
+        
+        if ambulance_id:
+            queryset = queryset.filter(ambulance_id=ambulance_id)
+        if consumable_id:
+            queryset = queryset.filter(consumable_id=consumable_id)
+        if low is not None:
+            queryset = queryset.filter(is_low=low.lower() in ('1', 'true', 'yes'))
+        
+        return queryset
+
+class AmbulanceStockDetailView(AmbulanceScopedMixin, generics.RetrieveUpdateAPIView):
+    queryset = AmbulanceStock.objects.select_related('ambulance', 'consumable')
+    serializer_class = AmbulanceStockSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+class StockEventListView(AmbulanceScopedMixin, generics.ListAPIView):
+    serializer_class = StockEventSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    ambulance_scope_fields = ('stock__ambulance',)
+    
+    def get_queryset(self):
+        queryset = StockEvent.objects.select_related('stock')
+        
+        # Filter by query parameters
+        ambulance_id = self.request.query_params.get('ambulance_id')
+        consumable_id = self.request.query_params.get('consumable_id')
+        kind = self.request.query_params.get('kind')
+        trip_id = self.request.query_params.get('trip_id')
+        
+        if ambulance_id:
+            queryset = queryset.filter(stock__ambulance_id=ambulance_id)
+        if consumable_id:
+            queryset = queryset.filter(stock__consumable_id=consumable_id)
+        if kind:
+            queryset = queryset.filter(kind=kind)
+        if trip_id:
+            queryset = queryset.filter(trip_id=trip_id)
+        
+        return queryset
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def restock_ambulance(request):
+    """Add (restock) or correct (adjustment) consumable quantities on an ambulance"""
+    serializer = RestockSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    visible = visible_ambulance_ids(request)
+    if visible is not None and data['ambulance'].pk not in visible:
+        return Response({'error': 'Ambulance not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    events = restock(
+        data['ambulance'].pk,
+        [(item['consumable'], item['quantity']) for item in data['items']],
+        user=request.user, note=data['note'], kind=data['kind']
+    )
+    return Response(StockEventSerializer(events, many=True).data, status=status.HTTP_201_CREATED)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def low_stock_alerts(request):
+    """Get every consumable below its minimum level across the fleet"""
+    stocks = low_stock()
+    visible = visible_ambulance_ids(request)
+    if visible is not None:
+        stocks = stocks.filter(ambulance_id__in=visible)
+    alerts = [
+        {
+            'stock_id': stock.id,
+            'ambulance_id': stock.ambulance_id,
+            'vehicle_number': stock.ambulance.vehicle_number,
+            'consumable_id': stock.consumable_id,
+            'consumable': stock.consumable.name,
+            'unit': stock.consumable.unit,
+            'quantity': stock.quantity,
+            'min_level': stock.min_level,
+            'par_level': stock.par_level,
+            'restock_quantity': max(stock.par_level, stock.min_level) - stock.quantity,
+        }
+        for stock in stocks
+    ]
+    return Response({'count': len(alerts), 'alerts': alerts})
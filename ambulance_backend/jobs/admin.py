@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'requested_by', 'created_at', 'finished_at')
+    list_filter = ('name', 'status', 'created_at')
+    search_fields = ('name', 'params_hash', 'requested_by__username')
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
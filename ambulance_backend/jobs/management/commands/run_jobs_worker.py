@@ -0,0 +1,51 @@
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from jobs.queue import claim_next, requeue_expired, run_job
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs on a thread pool until interrupted'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=getattr(settings, 'JOB_WORKER_THREADS', 4))
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once no runnable jobs are left')
+    
+    def _run(self, job):
+        try:
+            job = run_job(job)
+            self.stdout.write(f'Job {job.id} ({job.name}) {job.status} after {job.attempts} attempt(s)')
+        finally:
+            # Each pool thread holds its own database connection
+            connections.close_all()
+    
+    def handle(self, *args, **options):
+        threads = options['threads']
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout.write(f'Worker {worker} running jobs on {threads} thread(s)')
+        
+        running = set()
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='job') as pool:
+            try:
+                while True:
+                    requeue_expired()
+                    while len(running) < threads:
+                        job = claim_next(worker)
+                        if job is None:
+                            break
+                        running.add(pool.submit(self._run, job))
+                    
+                    if not running:
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+                    _, running = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+            except KeyboardInterrupt:
+                self.stdout.write('Stopping; waiting for running jobs to finish')
+        
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker} stopped'))
@@ -0,0 +1,183 @@
+"""
+Lightweight database-backed job queue.
+
+Apps register job functions with ``@register_job`` in a ``jobs.py``
+module; these are discovered when the jobs app is ready. A job's params
+are passed to its function as keyword arguments, and the return value
+must be JSON-serialisable (dates and decimals are fine).
+
+A job's ``roles`` lists the user roles that may queue it through the API
+(ANY_ROLE for every authenticated user). A job registered without roles
+can only be queued from code, e.g. by a management command or schedule.
+Staff roles can read every job. Everyone else only sees the jobs they
+requested.
+
+``enqueue`` deduplicates: an identical job that is still queued or running
+is reused. So is one that succeeded within the job's ``cache_ttl``, which
+makes the job table double as a result cache. Only jobs the requesting
+user can read are reused, so a crew member never receives someone else's
+job or params. Workers (the run_jobs_worker
+command) claim jobs with a conditional UPDATE, so any number of workers
+can share the table. A failed job is retried with exponential backoff up
+to ``max_attempts``. A job whose worker died is retried once its lease
+expires.
+"""
+import hashlib
+import json
+import logging
+import traceback
+from collections import namedtuple
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JobSpec = namedtuple('JobSpec', ['name', 'function', 'cache_ttl', 'max_attempts', 'roles'])
+
+# Roles that can see every job, whoever requested it
+STAFF_ROLES = ('admin', 'dispatcher')
+ANY_ROLE = '*'
+
+_registry = {}
+
+def register_job(name, cache_ttl=0, max_attempts=None, roles=()):
+    """
+    Register `function` as the job `name`. Successful results are reused for
+    `cache_ttl` seconds. Users whose role is in `roles` may queue it through
+    the API.
+    """
+    def decorator(function):
+        _registry[name] = JobSpec(
+            name, function, cache_ttl,
+            max_attempts or getattr(settings, 'JOB_MAX_ATTEMPTS', 3),
+            tuple(roles),
+        )
+        return function
+    return decorator
+
+def get_job_spec(name):
+    return _registry.get(name)
+
+def registered_job_names():
+    return sorted(_registry)
+
+def can_enqueue(spec, user):
+    """Whether `user` may queue the job `spec` through the API"""
+    if user.is_superuser:
+        return True
+    return ANY_ROLE in spec.roles or getattr(user, 'role', None) in spec.roles
+
+def enqueueable_job_names(user):
+    return sorted(name for name, spec in _registry.items() if can_enqueue(spec, user))
+
+def visible_jobs(user):
+    """Jobs `user` may read: all of them for staff, otherwise only their own"""
+    jobs = Job.objects.all()
+    if user is None or user.is_superuser or getattr(user, 'role', None) in STAFF_ROLES:
+        return jobs
+    return jobs.filter(requested_by=user)
+
+def params_hash(name, params):
+    payload = json.dumps([name, params], sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def enqueue(name, params=None, user=None):
+    """
+    Queue a job, or reuse a pending identical job or a cached result that
+    `user` can read. Returns (job, created).
+    """
+    spec = _registry.get(name)
+    if spec is None:
+        raise KeyError(name)
+    if user is not None and not user.is_authenticated:
+        user = None
+    params = params or {}
+    digest = params_hash(name, params)
+    now = timezone.now()
+    
+    same = visible_jobs(user).filter(name=name, params_hash=digest)
+    pending = same.filter(status__in=('queued', 'running')).order_by('created_at').first()
+    if pending:
+        return pending, False
+    if spec.cache_ttl:
+        cached = (
+            same.filter(status='succeeded', finished_at__gte=now - timedelta(seconds=spec.cache_ttl))
+            .order_by('-finished_at')
+            .first()
+        )
+        if cached:
+            return cached, False
+    
+    job = Job.objects.create(
+        name=name,
+        params=params,
+        params_hash=digest,
+        requested_by=user,
+        max_attempts=spec.max_attempts,
+        run_after=now,
+    )
+    return job, True
+
+def claim_next(worker):
+    """Atomically take the oldest runnable job for `worker`, or return None"""
+    now = timezone.now()
+    lease = now + timedelta(seconds=getattr(settings, 'JOB_LEASE_SECONDS', 600))
+    candidates = list(
+        Job.objects.filter(status='queued', run_after__lte=now)
+        .order_by('run_after', 'id')
+        .values_list('id', flat=True)[:10]
+    )
+    for job_id in candidates:
+        # Another worker may claim the same row first; only one UPDATE can match
+        claimed = Job.objects.filter(id=job_id, status='queued').update(
+            status='running',
+            worker=worker,
+            started_at=now,
+            lease_expires_at=lease,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+def requeue_expired():
+    """Return running jobs whose lease ran out (their worker died) to the queue, or fail them if out of attempts"""
+    now = timezone.now()
+    expired = Job.objects.filter(status='running', lease_expires_at__lt=now)
+    failed = expired.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', error='Worker lost while running the job', finished_at=now
+    )
+    requeued = expired.update(status='queued', run_after=now, worker='')
+    return requeued, failed
+
+def _retry_delay(attempts):
+    return timedelta(seconds=getattr(settings, 'JOB_RETRY_BACKOFF', 30) * 2 ** (attempts - 1))
+
+def run_job(job):
+    """Run a claimed job and record its outcome"""
+    spec = _registry.get(job.name)
+    try:
+        if spec is None:
+            raise LookupError(f'No job is registered as {job.name!r}')
+        result = spec.function(**job.params)
+    except Exception:
+        logger.exception('Job %s (%s) failed on attempt %s', job.id, job.name, job.attempts)
+        job.error = traceback.format_exc()
+        if spec is not None and job.attempts < job.max_attempts:
+            job.status = 'queued'
+            job.run_after = timezone.now() + _retry_delay(job.attempts)
+        else:
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+    else:
+        job.status = 'succeeded'
+        job.result = result
+        job.error = ''
+        job.finished_at = timezone.now()
+    job.lease_expires_at = None
+    job.save(update_fields=['status', 'result', 'error', 'run_after', 'finished_at', 'lease_expires_at'])
+    return job
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+from .models import Job
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'name', 'params', 'status', 'result', 'error', 'attempts', 'max_attempts',
+            'run_after', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+class JobCreateSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100)
+    params = serializers.DictField(required=False, default=dict)
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('jobs/', views.JobListCreateView.as_view(), name='job-list-create'),
+    path('jobs/<int:pk>/', views.JobDetailView.as_view(), name='job-detail'),
+]
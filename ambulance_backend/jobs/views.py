@@ -0,0 +1,41 @@
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from .models import Job
+from .queue import can_enqueue, enqueue, enqueueable_job_names, get_job_spec, visible_jobs
+from .serializers import JobSerializer, JobCreateSerializer
+
+def enqueue_for_request(request, name, params=None):
+    """Queue a job and answer 202 with a status URL to poll, or 200 when a cached result was reused"""
+    if not can_enqueue(get_job_spec(name), request.user):
+        return Response({'error': f'You are not allowed to run {name!r}'}, status=status.HTTP_403_FORBIDDEN)
+    job, _ = enqueue(name, params, request.user)
+    data = JobSerializer(job).data
+    data['status_url'] = reverse('job-detail', args=[job.id], request=request)
+    code = status.HTTP_200_OK if job.status == 'succeeded' else status.HTTP_202_ACCEPTED
+    return Response(data, status=code, headers={'Location': data['status_url']})
+
+class JobListCreateView(generics.ListCreateAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return Job.objects.filter(requested_by=self.request.user)
+    
+    def create(self, request, *args, **kwargs):
+        serializer = JobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        name = serializer.validated_data['name']
+        if get_job_spec(name) is None:
+            return Response(
+                {'error': f'Unknown job {name!r}', 'available_jobs': enqueueable_job_names(request.user)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return enqueue_for_request(request, name, serializer.validated_data['params'])
+
+class JobDetailView(generics.RetrieveAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return visible_jobs(self.request.user)
@@ -3,7 +3,7 @@ from .models import Patient
 
 @admin.register(Patient)
 class PatientAdmin(admin.ModelAdmin):
-    list_display = ('name', 'age', 'gender', 'medical_condition', 'phone', 'created_at')
+    list_display = ('name', 'age', 'gender', 'medical_condition', 'phone', 'hospital', 'created_at')
     list_filter = ('gender', 'created_at')
     search_fields = ('name', 'phone', 'medical_condition')
     readonly_fields = ('created_at', 'updated_at')
@@ -22,7 +22,7 @@ class PatientAdmin(admin.ModelAdmin):
             'fields': ('pickup_latitude', 'pickup_longitude', 'pickup_address')
         }),
         ('Destination', {
-            'fields': ('destination_latitude', 'destination_longitude', 'destination_address', 'hospital_name')
+            'fields': ('hospital', 'destination_latitude', 'destination_longitude', 'destination_address', 'hospital_name')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
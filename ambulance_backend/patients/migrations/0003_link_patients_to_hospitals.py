@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+def link_patients_to_hospitals(apps, schema_editor):
+    """Create one Hospital per distinct hospital_name and point its patients at it"""
+    Hospital = apps.get_model('hospitals', 'Hospital')
+    Patient = apps.get_model('patients', 'Patient')
+
+    patients_by_name = {}
+    for patient in Patient.objects.filter(hospital__isnull=True).exclude(hospital_name='').order_by('id').iterator():
+        patients_by_name.setdefault(patient.hospital_name.strip(), []).append(patient)
+
+    for name, patients in patients_by_name.items():
+        if not name:
+            continue
+        # The earliest patient's destination becomes the hospital's location
+        first = patients[0]
+        hospital, _ = Hospital.objects.get_or_create(
+            name=name,
+            defaults={
+                'address': first.destination_address,
+                'latitude': first.destination_latitude,
+                'longitude': first.destination_longitude,
+            }
+        )
+        Patient.objects.filter(id__in=[patient.id for patient in patients]).update(hospital=hospital)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospitals', '0001_initial'),
+        ('patients', '0002_patient_hospital'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_patients_to_hospitals, migrations.RunPython.noop),
+    ]
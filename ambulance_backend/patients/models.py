@@ -1,4 +1,5 @@
 from django.db import models
+from hospitals.models import Hospital
 
 class Patient(models.Model):
     GENDER_CHOICES = [
@@ -27,7 +28,14 @@ class Patient(models.Model):
     pickup_longitude = models.DecimalField(max_digits=9, decimal_places=6)
     pickup_address = models.TextField()
     
-    # Destination
+    # Destination; the coordinates and name are filled from the hospital when one is chosen
+    hospital = models.ForeignKey(
+        Hospital,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='patients'
+    )
     destination_latitude = models.DecimalField(max_digits=9, decimal_places=6)
     destination_longitude = models.DecimalField(max_digits=9, decimal_places=6)
     destination_address = models.TextField()
@@ -1,6 +1,14 @@
 from rest_framework import serializers
 from .models import Patient
 
+# Destination fields that can be taken from the chosen hospital instead of being sent
+HOSPITAL_DESTINATION_FIELDS = {
+    'hospital_name': 'name',
+    'destination_latitude': 'latitude',
+    'destination_longitude': 'longitude',
+    'destination_address': 'address',
+}
+
 class PatientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Patient
@@ -9,7 +17,22 @@ class PatientSerializer(serializers.ModelSerializer):
             'allergies', 'medications', 'emergency_contact_name',
             'emergency_contact_phone', 'emergency_contact_relation',
             'pickup_latitude', 'pickup_longitude', 'pickup_address',
-            'destination_latitude', 'destination_longitude', 
+            'hospital', 'destination_latitude', 'destination_longitude', 
             'destination_address', 'hospital_name', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        extra_kwargs = {field: {'required': False} for field in HOSPITAL_DESTINATION_FIELDS}
+    
+    def validate(self, attrs):
+        hospital = attrs.get('hospital')
+        if hospital:
+            for field, hospital_field in HOSPITAL_DESTINATION_FIELDS.items():
+                attrs.setdefault(field, getattr(hospital, hospital_field))
+        elif self.instance is None:
+            missing = {
+                field: 'This field is required unless a hospital is given.'
+                for field in HOSPITAL_DESTINATION_FIELDS if field not in attrs
+            }
+            if missing:
+                raise serializers.ValidationError(missing)
+        return attrs
@@ -1,13 +1,17 @@
 from rest_framework import generics, permissions
+from ambulance_management.compiled_serializers import CompiledListMixin
+from ambulances.scoping import AmbulanceScopedMixin
 from .models import Patient
 from .serializers import PatientSerializer
 
-class PatientListCreateView(generics.ListCreateAPIView):
+class PatientListCreateView(CompiledListMixin, AmbulanceScopedMixin, generics.ListCreateAPIView):
     queryset = Patient.objects.all()
     serializer_class = PatientSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ambulance_scope_fields = ('emergency_calls__assigned_ambulance', 'trips__ambulance')
 
-class PatientDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PatientDetailView(AmbulanceScopedMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Patient.objects.all()
     serializer_class = PatientSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ambulance_scope_fields = ('emergency_calls__assigned_ambulance', 'trips__ambulance')
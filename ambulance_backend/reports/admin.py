@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import DriverInspection, ParamedicInspection, MaintenanceRecord
+from .models import DriverInspection, ParamedicInspection, MaintenanceRecord, CallForecastFit, InspectionItem
 
 @admin.register(DriverInspection)
 class DriverInspectionAdmin(admin.ModelAdmin):
@@ -67,3 +67,17 @@ class MaintenanceRecordAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(CallForecastFit)
+class CallForecastFitAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'fitted_through', 'calls_processed', 'zone_count', 'full_refit')
+    readonly_fields = ('created_at',)
+
+
+@admin.register(InspectionItem)
+class InspectionItemAdmin(admin.ModelAdmin):
+    list_display = ('ambulance', 'source', 'name', 'date', 'condition', 'needs_attention')
+    list_filter = ('source', 'needs_attention', 'date')
+    search_fields = ('name', 'ambulance__vehicle_number')
+    raw_id_fields = ('ambulance', 'driver_inspection', 'paramedic_inspection')
@@ -0,0 +1,98 @@
+"""
+Normalized checklist items.
+
+Inspection checklists and ambulance equipment are stored as JSON lists on
+their rows. Every list is mirrored into InspectionItem rows, one per entry,
+so questions like "which ambulances failed their defibrillator check this
+week" are answered by indexed SQL instead of by decoding every row.
+
+Entries come from several clients and are read leniently:
+
+* a plain string is an item name;
+* a dict supplies ``name``, ``category``, ``condition`` (or ``status``) and
+  ``notes``. It counts as needing attention when ``needsAttention`` or
+  ``needsReplacement`` is set, when ``isWorking`` is false, or when its
+  condition is one of FAILING_CONDITIONS.
+
+reports.signals keeps the items in sync on save and delete, and the bulk
+inspection endpoints call sync_inspections() because bulk writes send no
+signals.
+"""
+from .models import DriverInspection, InspectionItem, ParamedicInspection
+
+FAILING_CONDITIONS = frozenset({
+    'poor', 'critical', 'fail', 'failed', 'missing', 'expired',
+    'needs_attention', 'needs_maintenance', 'out_of_service',
+})
+
+def normalize_name(name):
+    return ' '.join(str(name).lower().split())[:100]
+
+def _flag(entry, *keys):
+    return any(bool(entry.get(key)) for key in keys)
+
+def parse_entries(entries):
+    """Yield InspectionItem field dicts for the usable entries of a JSON checklist"""
+    if not isinstance(entries, list):
+        return
+    for position, entry in enumerate(entries):
+        if isinstance(entry, dict):
+            name = entry.get('name') or ''
+        else:
+            name, entry = entry, {}
+        name = ' '.join(str(name).split())
+        if not name:
+            continue
+        condition = str(entry.get('condition') or entry.get('status') or '')[:50]
+        is_working = entry.get('isWorking', entry.get('is_working', True))
+        yield {
+            'position': min(position, 32767),
+            'name': name[:100],
+            'name_key': normalize_name(name),
+            'category': str(entry.get('category') or '')[:50],
+            'condition': condition,
+            'needs_attention': (
+                _flag(entry, 'needsAttention', 'needs_attention', 'needsReplacement', 'needs_replacement')
+                or is_working is False
+                or condition.lower() in FAILING_CONDITIONS
+            ),
+            'notes': str(entry.get('notes') or ''),
+        }
+
+def _driver_items(inspection):
+    for fields in parse_entries(inspection.vehicle_inspection):
+        yield InspectionItem(
+            source='vehicle', ambulance_id=inspection.ambulance_id,
+            driver_inspection_id=inspection.pk, date=inspection.date, **fields
+        )
+
+def _paramedic_items(inspection):
+    for fields in parse_entries(inspection.medical_equipment):
+        yield InspectionItem(
+            source='medical', ambulance_id=inspection.ambulance_id,
+            paramedic_inspection_id=inspection.pk, date=inspection.date, **fields
+        )
+
+def sync_inspections(model, inspections):
+    """Replace the items of the given driver or paramedic inspections"""
+    inspections = [inspection for inspection in inspections if inspection.pk is not None]
+    if not inspections:
+        return
+    ids = [inspection.pk for inspection in inspections]
+    if model is DriverInspection:
+        InspectionItem.objects.filter(driver_inspection_id__in=ids).delete()
+        build = _driver_items
+    elif model is ParamedicInspection:
+        InspectionItem.objects.filter(paramedic_inspection_id__in=ids).delete()
+        build = _paramedic_items
+    else:
+        raise ValueError(f'{model.__name__} has no checklist')
+    InspectionItem.objects.bulk_create([item for inspection in inspections for item in build(inspection)])
+
+def sync_equipment(ambulance):
+    """Replace the equipment items of an ambulance"""
+    InspectionItem.objects.filter(ambulance_id=ambulance.pk, source='equipment').delete()
+    InspectionItem.objects.bulk_create([
+        InspectionItem(source='equipment', ambulance_id=ambulance.pk, **fields)
+        for fields in parse_entries(ambulance.equipment)
+    ])
@@ -0,0 +1,160 @@
+"""
+Call volume forecasting per zone and hour.
+
+Calls are binned by zone (a coarse geohash cell) and clock hour. Each zone
+has a level and one seasonal term per hour of the week, and additive
+exponential smoothing updates them for every hour in turn. All zones are
+updated together as NumPy vectors.
+
+The latest CallForecastFit acts as a checkpoint. A refit only reads calls
+created after its ``fitted_through`` hour, continues from the stored zone
+states, and then replaces the stored CallForecast rows for the coming
+horizon. The hour in progress is never included, so partial counts are
+never fitted. Calls moved to the archive tables (dispatch.archive) are
+read too, so a full refit still sees the whole history.
+"""
+from array import array
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+from dispatch.heatmap import hour_of_week
+from dispatch.models import ArchivedEmergencyCall, EmergencyCall
+from routing.geo import geohash_encode
+from .models import CallForecast, CallForecastFit, CallForecastZoneState
+
+HOURS_PER_WEEK = 168
+HOUR = timedelta(hours=1)
+
+# Hours of history turned into a dense (zones x hours) block at a time
+WINDOW_HOURS = 4 * HOURS_PER_WEEK
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+def floor_hour(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+def stream_calls(since, until, chunk_size=5000):
+    """
+    Yield (latitude, longitude, created_at) of calls created in [since, until),
+    hot and archived, read in id-ordered chunks
+    """
+    for model in (ArchivedEmergencyCall, EmergencyCall):
+        queryset = model.objects.filter(created_at__gte=since, created_at__lt=until).order_by('id')
+        last_id = 0
+        while True:
+            rows = list(queryset.filter(id__gt=last_id).values_list('id', 'latitude', 'longitude', 'created_at')[:chunk_size])
+            if not rows:
+                break
+            for _, latitude, longitude, created_at in rows:
+                yield latitude, longitude, created_at
+            last_id = rows[-1][0]
+
+def smooth(level, seasonal, counts, start, alpha, gamma):
+    """
+    Run additive seasonal exponential smoothing over `counts` (zones x hours,
+    the first column being the hour starting at `start`). `level` and
+    `seasonal` are updated in place.
+    """
+    for step in range(counts.shape[1]):
+        slot = hour_of_week(start + step * HOUR)
+        observed = counts[:, step]
+        new_level = alpha * (observed - seasonal[:, slot]) + (1 - alpha) * level
+        seasonal[:, slot] = gamma * (observed - new_level) + (1 - gamma) * seasonal[:, slot]
+        level[:] = new_level
+
+def forecast(level, seasonal, start, hours):
+    """Expected calls per zone for `hours` hours from `start` (zones x hours)"""
+    slots = [hour_of_week(start + step * HOUR) for step in range(hours)]
+    return np.maximum(level[:, None] + seasonal[:, slots], 0.0)
+
+def fit_call_forecast(full=False, chunk_size=5000, now=None):
+    """Update the zone models with calls since the last fit (or all calls with `full`) and store new forecasts"""
+    until = floor_hour(now or timezone.now())
+    precision = _setting('CALL_FORECAST_ZONE_PRECISION', 5)
+    alpha = _setting('CALL_FORECAST_ALPHA', 0.1)
+    gamma = _setting('CALL_FORECAST_GAMMA', 0.3)
+    horizon = _setting('CALL_FORECAST_HORIZON_HOURS', HOURS_PER_WEEK)
+    
+    checkpoint = None if full else CallForecastFit.objects.first()
+    if checkpoint:
+        since = checkpoint.fitted_through
+        states = list(CallForecastZoneState.objects.all())
+    else:
+        firsts = [
+            model.objects.filter(created_at__lt=until).aggregate(first=Min('created_at'))['first']
+            for model in (ArchivedEmergencyCall, EmergencyCall)
+        ]
+        earliest = min((first for first in firsts if first is not None), default=None)
+        since = floor_hour(earliest) if earliest else until
+        states = []
+    since = min(since, until)
+    
+    zone_rows = {state.zone: row for row, state in enumerate(states)}
+    call_zones = array('q')
+    call_hours = array('q')
+    calls_processed = 0
+    for latitude, longitude, created_at in stream_calls(since, until, chunk_size):
+        zone = geohash_encode(float(latitude), float(longitude), precision)
+        call_zones.append(zone_rows.setdefault(zone, len(zone_rows)))
+        call_hours.append((created_at - since) // HOUR)
+        calls_processed += 1
+    
+    zone_count = len(zone_rows)
+    level = np.zeros(zone_count)
+    seasonal = np.zeros((zone_count, HOURS_PER_WEEK))
+    for row, state in enumerate(states):
+        level[row] = state.level
+        seasonal[row] = np.frombuffer(bytes(state.seasonal), dtype=np.float64)
+    
+    call_zones = np.frombuffer(call_zones, dtype=np.int64)
+    call_hours = np.frombuffer(call_hours, dtype=np.int64)
+    order = np.argsort(call_hours, kind='stable')
+    call_zones, call_hours = call_zones[order], call_hours[order]
+    
+    total_hours = int((until - since) // HOUR)
+    for window_start in range(0, total_hours, WINDOW_HOURS):
+        width = min(WINDOW_HOURS, total_hours - window_start)
+        lo, hi = np.searchsorted(call_hours, [window_start, window_start + width])
+        counts = np.zeros((zone_count, width))
+        np.add.at(counts, (call_zones[lo:hi], call_hours[lo:hi] - window_start), 1)
+        smooth(level, seasonal, counts, since + window_start * HOUR, alpha, gamma)
+    
+    zones = sorted(zone_rows, key=zone_rows.get)
+    expected = forecast(level, seasonal, until, horizon)
+    
+    with transaction.atomic():
+        if full:
+            CallForecastZoneState.objects.all().delete()
+            states = []
+        existing = {state.zone: state for state in states}
+        fitted_at = timezone.now()
+        updated, created = [], []
+        for row, zone in enumerate(zones):
+            state = existing.get(zone) or CallForecastZoneState(zone=zone)
+            state.level = float(level[row])
+            state.seasonal = seasonal[row].tobytes()
+            state.updated_at = fitted_at
+            (updated if state.pk else created).append(state)
+        CallForecastZoneState.objects.bulk_update(updated, ['level', 'seasonal', 'updated_at'], batch_size=500)
+        CallForecastZoneState.objects.bulk_create(created, batch_size=500)
+        
+        CallForecast.objects.all().delete()
+        CallForecast.objects.bulk_create(
+            [
+                CallForecast(zone=zone, period_start=until + step * HOUR, expected_calls=float(expected[row, step]))
+                for row, zone in enumerate(zones)
+                for step in range(horizon)
+            ],
+            batch_size=2000
+        )
+        
+        return CallForecastFit.objects.create(
+            fitted_through=until,
+            calls_processed=calls_processed,
+            zone_count=zone_count,
+            full_refit=checkpoint is None,
+        )
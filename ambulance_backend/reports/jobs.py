@@ -0,0 +1,109 @@
+from datetime import timedelta
+from django.db.models import Sum
+from django.utils import timezone
+from ambulance_management.db_routers import use_replica
+from ambulances.models import Ambulance
+from dispatch.models import Trip
+from jobs.queue import ANY_ROLE, register_job
+from .forecasting import fit_call_forecast
+from .maintenance_planning import plan_maintenance
+from .models import MaintenanceRecord
+
+@register_job('reports.ambulance_utilization', cache_ttl=300, roles=[ANY_ROLE])
+@use_replica()
+def ambulance_utilization():
+    """Trips, distance and revenue per ambulance over the last 30 days"""
+    today = timezone.now().date()
+    month_ago = today - timedelta(days=30)
+    
+    ambulances = Ambulance.objects.all()
+    utilization_data = []
+    
+    for ambulance in ambulances:
+        # Calculate trips in the last month
+        trips_count = Trip.objects.filter(
+            ambulance=ambulance,
+            start_time__date__gte=month_ago
+        ).count()
+        
+        # Calculate total distance
+        total_distance = Trip.objects.filter(
+            ambulance=ambulance,
+            start_time__date__gte=month_ago
+        ).aggregate(total=Sum('distance'))['total'] or 0
+        
+        # Calculate revenue
+        total_revenue = Trip.objects.filter(
+            ambulance=ambulance,
+            start_time__date__gte=month_ago
+        ).aggregate(total=Sum('cost'))['total'] or 0
+        
+        utilization_data.append({
+            'ambulance_id': ambulance.id,
+            'vehicle_number': ambulance.vehicle_number,
+            'model': ambulance.model,
+            'status': ambulance.status,
+            'trips_count': trips_count,
+            'total_distance': float(total_distance),
+            'total_revenue': float(total_revenue)
+        })
+    
+    return utilization_data
+
+@register_job('reports.overdue_maintenance', cache_ttl=300, roles=[ANY_ROLE])
+@use_replica()
+def overdue_maintenance():
+    """Overdue scheduled maintenance and ambulances past their next maintenance date"""
+    today = timezone.now().date()
+    
+    # Overdue scheduled maintenance
+    overdue_records = MaintenanceRecord.objects.filter(
+        status='scheduled',
+        scheduled_date__lt=today
+    ).select_related('ambulance')
+    
+    # Ambulances due for maintenance based on next_maintenance date
+    ambulances_due = [
+        {
+            'ambulance_id': ambulance_id,
+            'vehicle_number': vehicle_number,
+            'next_maintenance': next_maintenance,
+            'days_overdue': (today - next_maintenance).days
+        }
+        for ambulance_id, vehicle_number, next_maintenance in Ambulance.objects.filter(
+            next_maintenance__lte=today
+        ).values_list('id', 'vehicle_number', 'next_maintenance')
+    ]
+    
+    overdue_data = []
+    for record in overdue_records:
+        overdue_data.append({
+            'maintenance_id': record.id,
+            'ambulance_id': record.ambulance.id,
+            'vehicle_number': record.ambulance.vehicle_number,
+            'maintenance_type': record.maintenance_type,
+            'scheduled_date': record.scheduled_date,
+            'days_overdue': (today - record.scheduled_date).days,
+            'description': record.description
+        })
+    
+    return {
+        'overdue_maintenance_records': overdue_data,
+        'ambulances_due_for_maintenance': ambulances_due
+    }
+
+@register_job('reports.maintenance_plan', cache_ttl=300, roles=[ANY_ROLE])
+@use_replica()
+def maintenance_plan(horizon_days=None, max_offline=None):
+    """Capacity-aware maintenance calendar for the whole fleet"""
+    return plan_maintenance(horizon_days=horizon_days, max_offline=max_offline)
+
+@register_job('reports.fit_call_forecast', max_attempts=1, roles=['admin'])
+def fit_call_forecast_job(full=False):
+    fit = fit_call_forecast(full=full)
+    return {
+        'fit_id': fit.id,
+        'fitted_through': fit.fitted_through,
+        'calls_processed': fit.calls_processed,
+        'zone_count': fit.zone_count,
+    }
@@ -0,0 +1,233 @@
+"""
+Fleet maintenance planning.
+
+The fleet is scanned in one query for ambulance dates and one for recent
+odometer readings, then evaluated as NumPy arrays over day ordinals:
+
+* calendar due date: ``Ambulance.next_maintenance``;
+* mileage due date: a per-vehicle least-squares km/day trend from
+  ``DriverInspection.mileage``, projected forward to the next service
+  interval after the mileage seen since the last maintenance;
+* insurance: days left until ``insurance_expiry``.
+
+The effective due date is the earlier of the calendar and mileage dates.
+The calendar places every vehicle under a per-day cap on vehicles off the
+road. Overdue vehicles go first, from today. The rest are placed backwards
+from their due date (latest free day first), which keeps servicing as late
+as allowed without ever exceeding the cap. Vehicles already in maintenance
+or with an open MaintenanceRecord hold their slots: records dated before
+today are placed today, and records past the horizon keep their date.
+"""
+from datetime import date, timedelta
+import math
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from ambulances.models import Ambulance
+from .models import DriverInspection, MaintenanceRecord
+
+# Longest calendar a request may ask for; the load array grows with the horizon
+MAX_HORIZON_DAYS = 365
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+def mileage_trends(ambulance_ids, last_maintenance, today):
+    """
+    Per-ambulance arrays (aligned with `ambulance_ids`) of the latest odometer
+    reading, km/day trend, and mileage at the first reading since the last
+    maintenance. Missing values are NaN.
+    """
+    window_start = today - timedelta(days=_setting('MAINTENANCE_MILEAGE_WINDOW_DAYS', 90))
+    readings = np.array(
+        list(
+            DriverInspection.objects.filter(ambulance_id__in=ambulance_ids, date__gte=window_start)
+            .values_list('ambulance_id', 'date', 'mileage')
+        ),
+        dtype=object
+    ).reshape(-1, 3)
+    
+    count = len(ambulance_ids)
+    latest = np.full(count, np.nan)
+    slope = np.full(count, np.nan)
+    since_service = np.full(count, np.nan)
+    if not len(readings):
+        return latest, slope, since_service
+    
+    position = {ambulance_id: index for index, ambulance_id in enumerate(ambulance_ids)}
+    rows = np.array([position[ambulance_id] for ambulance_id in readings[:, 0]], dtype=np.int64)
+    days = np.array([reading.toordinal() for reading in readings[:, 1]], dtype=np.float64)
+    km = readings[:, 2].astype(np.float64)
+    
+    np.fmax.at(latest, rows, km)
+    
+    # Least-squares slope per vehicle from grouped sums; days are centred on today for precision
+    t = days - today.toordinal()
+    n = np.bincount(rows, minlength=count).astype(np.float64)
+    sum_t = np.bincount(rows, t, minlength=count)
+    sum_km = np.bincount(rows, km, minlength=count)
+    sum_tt = np.bincount(rows, t * t, minlength=count)
+    sum_tkm = np.bincount(rows, t * km, minlength=count)
+    denominator = n * sum_tt - sum_t ** 2
+    fitted = (n >= 2) & (denominator > 0)
+    slope[fitted] = (n * sum_tkm - sum_t * sum_km)[fitted] / denominator[fitted]
+    
+    after_service = days >= last_maintenance[rows]
+    np.fmin.at(since_service, rows[after_service], km[after_service])
+    
+    # Serviced before the window: extrapolate the trend back to the service date instead
+    serviced_earlier = fitted & (last_maintenance < window_start.toordinal())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_t, mean_km = sum_t / n, sum_km / n
+    service_t = last_maintenance - today.toordinal()
+    since_service[serviced_earlier] = np.maximum(
+        mean_km + slope * (service_t - mean_t), 0
+    )[serviced_earlier]
+    return latest, slope, since_service
+
+def fleet_due_dates(today=None):
+    """Scan the fleet and return a dict of aligned NumPy arrays describing each vehicle's due dates"""
+    today = today or timezone.localdate()
+    fleet = list(
+        Ambulance.objects.order_by('id').values_list(
+            'id', 'vehicle_number', 'status', 'last_maintenance', 'next_maintenance', 'insurance_expiry'
+        )
+    )
+    ids = [row[0] for row in fleet]
+    last_maintenance = np.array([row[3].toordinal() for row in fleet], dtype=np.int64)
+    next_maintenance = np.array([row[4].toordinal() for row in fleet], dtype=np.int64)
+    insurance_expiry = np.array([row[5].toordinal() for row in fleet], dtype=np.int64)
+    
+    latest, slope, since_service = mileage_trends(ids, last_maintenance, today)
+    interval = _setting('MAINTENANCE_SERVICE_INTERVAL_KM', 10000)
+    remaining_km = since_service + interval - latest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_to_mileage_due = np.where(slope > 0, remaining_km / slope, np.nan)
+    mileage_due = np.where(
+        np.isfinite(days_to_mileage_due),
+        today.toordinal() + np.floor(np.maximum(days_to_mileage_due, -36500)),
+        np.nan
+    )
+    
+    due = np.where(np.isfinite(mileage_due), np.fmin(mileage_due, next_maintenance), next_maintenance).astype(np.int64)
+    return {
+        'ids': ids,
+        'vehicle_numbers': [row[1] for row in fleet],
+        'statuses': [row[2] for row in fleet],
+        'next_maintenance': next_maintenance,
+        'insurance_expiry': insurance_expiry,
+        'latest_mileage': latest,
+        'km_per_day': slope,
+        'mileage_due': mileage_due,
+        'due': due,
+        'mileage_driven': np.isfinite(mileage_due) & (mileage_due < next_maintenance),
+    }
+
+def max_offline_per_day(fleet_size):
+    limit = _setting('MAINTENANCE_MAX_OFFLINE', None)
+    if limit is None:
+        limit = math.floor(fleet_size * _setting('MAINTENANCE_MAX_OFFLINE_FRACTION', 0.15))
+    return max(1, int(limit))
+
+def _first_free(load, days, capacity, duration):
+    """Index of the first day in `days` where a `duration`-day block fits under `capacity`"""
+    for start in days:
+        if start + duration <= len(load) and load[start:start + duration].max() < capacity:
+            return start
+    return None
+
+def plan_maintenance(horizon_days=None, max_offline=None, today=None):
+    """Build the capacity-aware maintenance calendar for the whole fleet"""
+    today = today or timezone.localdate()
+    horizon_days = min(horizon_days or _setting('MAINTENANCE_PLAN_HORIZON_DAYS', 60), MAX_HORIZON_DAYS)
+    duration = _setting('MAINTENANCE_DURATION_DAYS', 1)
+    fleet = fleet_due_dates(today)
+    count = len(fleet['ids'])
+    capacity = max_offline or max_offline_per_day(count)
+    origin = today.toordinal()
+    
+    # Extra room past the horizon so late vehicles still get a slot
+    load = np.zeros(horizon_days + count * duration + duration, dtype=np.int64)
+    planned = np.full(count, -1, dtype=np.int64)
+    booked = np.zeros(count, dtype=bool)
+    position = {ambulance_id: index for index, ambulance_id in enumerate(fleet['ids'])}
+    
+    for index, status in enumerate(fleet['statuses']):
+        if status == 'maintenance':
+            load[:duration] += 1
+            planned[index] = 0
+            booked[index] = True
+    # Every open record books its vehicle, the earliest first; overdue ones are due today
+    scheduled = MaintenanceRecord.objects.filter(
+        status__in=('scheduled', 'in_progress')
+    ).order_by('scheduled_date').values_list('ambulance_id', 'scheduled_date')
+    for ambulance_id, scheduled_date in scheduled:
+        index = position.get(ambulance_id)
+        if index is None or booked[index]:
+            continue
+        start = max(scheduled_date.toordinal() - origin, 0)
+        # Slots past the end of the load array lie outside the horizon and cannot crowd anyone out
+        load[start:start + duration] += 1
+        planned[index] = start
+        booked[index] = True
+    
+    due_offset = fleet['due'] - origin
+    open_vehicles = np.flatnonzero(~booked)
+    overdue = open_vehicles[due_offset[open_vehicles] <= 0]
+    upcoming = open_vehicles[(due_offset[open_vehicles] > 0) & (due_offset[open_vehicles] < horizon_days)]
+    
+    late = []
+    # Overdue vehicles first, most overdue first, from today onwards
+    for index in overdue[np.argsort(due_offset[overdue], kind='stable')]:
+        late.append(index)
+    # Then backwards from each due date, latest due first
+    for index in upcoming[np.argsort(-due_offset[upcoming], kind='stable')]:
+        start = _first_free(load, range(due_offset[index], -1, -1), capacity, duration)
+        if start is None:
+            late.append(index)
+            continue
+        load[start:start + duration] += 1
+        planned[index] = start
+    for index in late:
+        start = _first_free(load, range(len(load)), capacity, duration)
+        load[start:start + duration] += 1
+        planned[index] = start
+    
+    vehicles = []
+    for index in np.argsort(np.where(planned >= 0, planned, np.iinfo(np.int64).max), kind='stable'):
+        mileage_due = fleet['mileage_due'][index]
+        planned_date = date.fromordinal(origin + int(planned[index])) if planned[index] >= 0 else None
+        due_date = date.fromordinal(int(fleet['due'][index]))
+        vehicles.append({
+            'ambulance_id': fleet['ids'][index],
+            'vehicle_number': fleet['vehicle_numbers'][index],
+            'status': fleet['statuses'][index],
+            'next_maintenance': date.fromordinal(int(fleet['next_maintenance'][index])),
+            'latest_mileage': None if np.isnan(fleet['latest_mileage'][index]) else int(fleet['latest_mileage'][index]),
+            'km_per_day': None if np.isnan(fleet['km_per_day'][index]) else round(float(fleet['km_per_day'][index]), 1),
+            'mileage_due_date': None if np.isnan(mileage_due) else date.fromordinal(int(mileage_due)),
+            'due_date': due_date,
+            'due_reason': 'mileage' if fleet['mileage_driven'][index] else 'calendar',
+            'days_until_due': int(fleet['due'][index]) - origin,
+            'insurance_expiry': date.fromordinal(int(fleet['insurance_expiry'][index])),
+            'insurance_days_left': int(fleet['insurance_expiry'][index]) - origin,
+            'planned_date': planned_date,
+            'late': planned_date is not None and planned_date > due_date,
+        })
+    
+    offline = {}
+    for index in np.flatnonzero((planned >= 0) & (planned < horizon_days)):
+        for day in range(planned[index], min(planned[index] + duration, horizon_days)):
+            offline.setdefault(int(day), []).append(fleet['vehicle_numbers'][index])
+    calendar = [
+        {'date': date.fromordinal(origin + day), 'vehicles_offline': int(load[day]), 'vehicles': offline.get(int(day), [])}
+        for day in np.flatnonzero(load[:horizon_days])
+    ]
+    return {
+        'generated_on': today,
+        'horizon_days': horizon_days,
+        'max_offline_per_day': capacity,
+        'fleet_size': count,
+        'vehicles': vehicles,
+        'calendar': calendar,
+    }
@@ -0,0 +1,19 @@
+import time
+from django.core.management.base import BaseCommand
+from reports.forecasting import fit_call_forecast
+
+class Command(BaseCommand):
+    help = 'Update the per-zone call volume models with new calls and store fresh forecasts (run hourly)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Discard the stored models and refit from the full call history')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        fit = fit_call_forecast(full=options['full'], chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Fitted {fit.zone_count} zones through {fit.fitted_through} '
+            f'from {fit.calls_processed} new calls ({elapsed:.2f}s)'
+        ))
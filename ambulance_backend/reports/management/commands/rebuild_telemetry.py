@@ -0,0 +1,13 @@
+import time
+from django.core.management.base import BaseCommand
+from ambulances.models import Ambulance
+from reports.telemetry import rebuild_series
+
+class Command(BaseCommand):
+    help = 'Rebuild the mileage and fuel telemetry series of every ambulance from its driver inspections'
+    
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        built = rebuild_series(Ambulance.objects.values_list('id', flat=True))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt telemetry for {built} ambulances ({elapsed:.2f}s)'))
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CallForecastFit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fitted_through', models.DateTimeField(help_text='Calls created before this hour boundary have been processed')),
+                ('calls_processed', models.PositiveIntegerField(default=0)),
+                ('zone_count', models.PositiveIntegerField(default=0)),
+                ('full_refit', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CallForecastZoneState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zone', models.CharField(max_length=12, unique=True)),
+                ('level', models.FloatField(default=0)),
+                ('seasonal', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CallForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zone', models.CharField(max_length=12)),
+                ('period_start', models.DateTimeField()),
+                ('expected_calls', models.FloatField()),
+                ('generated_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['period_start', 'zone'],
+                'unique_together': {('zone', 'period_start')},
+            },
+        ),
+    ]
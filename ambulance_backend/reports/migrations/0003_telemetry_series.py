@@ -0,0 +1,64 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:25
+
+from array import array
+import sys
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SHIFT_RANK = {'morning': 0, 'afternoon': 1, 'night': 2}
+
+
+def _packed(typecode, values):
+    packed = array(typecode, values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def build_telemetry_series(apps, schema_editor):
+    """Pack the mileage and fuel readings of existing driver inspections, one series per ambulance"""
+    DriverInspection = apps.get_model('reports', 'DriverInspection')
+    TelemetrySeries = apps.get_model('reports', 'TelemetrySeries')
+
+    readings_by_ambulance = {}
+    inspections = DriverInspection.objects.values_list('ambulance_id', 'id', 'date', 'shift', 'mileage', 'fuel_level')
+    for ambulance_id, inspection_id, date, shift, mileage, fuel_level in inspections.iterator():
+        slot = date.toordinal() * 3 + SHIFT_RANK.get(shift, 0)
+        readings_by_ambulance.setdefault(ambulance_id, []).append((slot, inspection_id, mileage, fuel_level))
+
+    for ambulance_id, readings in readings_by_ambulance.items():
+        readings.sort()
+        TelemetrySeries.objects.create(
+            ambulance_id=ambulance_id,
+            readings=len(readings),
+            inspection_ids=_packed('q', [reading[1] for reading in readings]),
+            slots=_packed('q', [reading[0] for reading in readings]),
+            mileage=_packed('q', [reading[2] for reading in readings]),
+            fuel_levels=_packed('h', [reading[3] for reading in readings]),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ambulances', '0003_repositioningplan'),
+        ('reports', '0002_call_forecast'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelemetrySeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('readings', models.PositiveIntegerField(default=0)),
+                ('inspection_ids', models.BinaryField(help_text='int64 DriverInspection ids')),
+                ('slots', models.BinaryField(help_text='int64 shift slots: date ordinal * 3 + shift (morning, afternoon, night)')),
+                ('mileage', models.BinaryField(help_text='int64 odometer readings in km')),
+                ('fuel_levels', models.BinaryField(help_text='int16 fuel levels in percent')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('ambulance', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='telemetry_series', to='ambulances.ambulance')),
+            ],
+        ),
+        migrations.RunPython(build_telemetry_series, migrations.RunPython.noop),
+    ]
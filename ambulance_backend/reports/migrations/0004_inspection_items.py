@@ -0,0 +1,102 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+FAILING_CONDITIONS = {
+    'poor', 'critical', 'fail', 'failed', 'missing', 'expired',
+    'needs_attention', 'needs_maintenance', 'out_of_service',
+}
+
+
+def parse_entries(entries):
+    """Frozen copy of reports.checklists.parse_entries"""
+    if not isinstance(entries, list):
+        return
+    for position, entry in enumerate(entries):
+        if isinstance(entry, dict):
+            name = entry.get('name') or ''
+        else:
+            name, entry = entry, {}
+        name = ' '.join(str(name).split())
+        if not name:
+            continue
+        condition = str(entry.get('condition') or entry.get('status') or '')[:50]
+        is_working = entry.get('isWorking', entry.get('is_working', True))
+        yield {
+            'position': min(position, 32767),
+            'name': name[:100],
+            'name_key': name.lower()[:100],
+            'category': str(entry.get('category') or '')[:50],
+            'condition': condition,
+            'needs_attention': (
+                any(bool(entry.get(key)) for key in ('needsAttention', 'needs_attention', 'needsReplacement', 'needs_replacement'))
+                or is_working is False
+                or condition.lower() in FAILING_CONDITIONS
+            ),
+            'notes': str(entry.get('notes') or ''),
+        }
+
+
+def backfill_inspection_items(apps, schema_editor):
+    """Normalize the existing inspection checklists and ambulance equipment lists into InspectionItem rows"""
+    Ambulance = apps.get_model('ambulances', 'Ambulance')
+    DriverInspection = apps.get_model('reports', 'DriverInspection')
+    ParamedicInspection = apps.get_model('reports', 'ParamedicInspection')
+    InspectionItem = apps.get_model('reports', 'InspectionItem')
+
+    batch = []
+
+    def add(**fields):
+        batch.append(InspectionItem(**fields))
+        if len(batch) >= 1000:
+            InspectionItem.objects.bulk_create(batch)
+            batch.clear()
+
+    for inspection in DriverInspection.objects.only('id', 'ambulance_id', 'date', 'vehicle_inspection').iterator():
+        for fields in parse_entries(inspection.vehicle_inspection):
+            add(source='vehicle', ambulance_id=inspection.ambulance_id,
+                driver_inspection_id=inspection.id, date=inspection.date, **fields)
+    for inspection in ParamedicInspection.objects.only('id', 'ambulance_id', 'date', 'medical_equipment').iterator():
+        for fields in parse_entries(inspection.medical_equipment):
+            add(source='medical', ambulance_id=inspection.ambulance_id,
+                paramedic_inspection_id=inspection.id, date=inspection.date, **fields)
+    for ambulance in Ambulance.objects.only('id', 'equipment').iterator():
+        for fields in parse_entries(ambulance.equipment):
+            add(source='equipment', ambulance_id=ambulance.id, **fields)
+    InspectionItem.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ambulances', '0003_repositioningplan'),
+        ('reports', '0003_telemetry_series'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InspectionItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('vehicle', 'Vehicle Inspection'), ('medical', 'Medical Equipment Inspection'), ('equipment', 'Ambulance Equipment')], max_length=20)),
+                ('date', models.DateField(blank=True, null=True)),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('name', models.CharField(max_length=100)),
+                ('name_key', models.CharField(help_text='Lowercased name with collapsed whitespace', max_length=100)),
+                ('category', models.CharField(blank=True, max_length=50)),
+                ('condition', models.CharField(blank=True, help_text='Condition or status as reported', max_length=50)),
+                ('needs_attention', models.BooleanField(default=False)),
+                ('notes', models.TextField(blank=True)),
+                ('ambulance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checklist_items', to='ambulances.ambulance')),
+                ('driver_inspection', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='reports.driverinspection')),
+                ('paramedic_inspection', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='reports.paramedicinspection')),
+            ],
+            options={
+                'ordering': ['ambulance', 'source', '-date', 'position'],
+                'indexes': [models.Index(fields=['name_key', 'date'], name='inspection_item_name_date'), models.Index(fields=['ambulance', 'source', 'name_key'], name='inspection_item_amb_source'), models.Index(condition=models.Q(('needs_attention', True)), fields=['date', 'name_key'], name='inspection_item_failing')],
+            },
+        ),
+        migrations.RunPython(backfill_inspection_items, migrations.RunPython.noop),
+    ]
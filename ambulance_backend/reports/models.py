@@ -118,3 +118,109 @@ class MaintenanceRecord(models.Model):
     
     class Meta:
         ordering = ['-scheduled_date']
+
+
+class CallForecastFit(models.Model):
+    """One run of the call volume forecaster; the latest run is the checkpoint for the next one"""
+    fitted_through = models.DateTimeField(help_text="Calls created before this hour boundary have been processed")
+    calls_processed = models.PositiveIntegerField(default=0)
+    zone_count = models.PositiveIntegerField(default=0)
+    full_refit = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Forecast fit through {self.fitted_through}"
+    
+    class Meta:
+        ordering = ['-created_at']
+
+
+class CallForecastZoneState(models.Model):
+    """Smoothing state of one zone: a level plus one seasonal term per hour of the week"""
+    zone = models.CharField(max_length=12, unique=True)
+    level = models.FloatField(default=0)
+    # 168 float64 seasonal terms, indexed by hour of week (Monday 00:00 = 0)
+    seasonal = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Forecast state {self.zone}"
+
+
+class CallForecast(models.Model):
+    """Expected number of calls in a zone during one future hour"""
+    zone = models.CharField(max_length=12)
+    period_start = models.DateTimeField()
+    expected_calls = models.FloatField()
+    generated_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.zone} {self.period_start}: {self.expected_calls:.2f}"
+    
+    class Meta:
+        ordering = ['period_start', 'zone']
+        unique_together = ['zone', 'period_start']
+
+
+class TelemetrySeries(models.Model):
+    """
+    Mileage and fuel readings of one ambulance, taken from its driver
+    inspections and kept as packed arrays in shift order
+    """
+    ambulance = models.OneToOneField(Ambulance, on_delete=models.CASCADE, related_name='telemetry_series')
+    readings = models.PositiveIntegerField(default=0)
+    # Parallel little-endian arrays, one entry per inspection
+    inspection_ids = models.BinaryField(help_text="int64 DriverInspection ids")
+    slots = models.BinaryField(help_text="int64 shift slots: date ordinal * 3 + shift (morning, afternoon, night)")
+    mileage = models.BinaryField(help_text="int64 odometer readings in km")
+    fuel_levels = models.BinaryField(help_text="int16 fuel levels in percent")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Telemetry {self.ambulance.vehicle_number} ({self.readings} readings)"
+
+
+class InspectionItem(models.Model):
+    """
+    One checklist entry, normalized out of the JSON lists on driver and
+    paramedic inspections and on Ambulance.equipment, so items can be
+    filtered with indexed SQL
+    """
+    SOURCE_CHOICES = [
+        ('vehicle', 'Vehicle Inspection'),
+        ('medical', 'Medical Equipment Inspection'),
+        ('equipment', 'Ambulance Equipment'),
+    ]
+    
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    ambulance = models.ForeignKey(Ambulance, on_delete=models.CASCADE, related_name='checklist_items')
+    driver_inspection = models.ForeignKey(
+        DriverInspection, on_delete=models.CASCADE, null=True, blank=True, related_name='items'
+    )
+    paramedic_inspection = models.ForeignKey(
+        ParamedicInspection, on_delete=models.CASCADE, null=True, blank=True, related_name='items'
+    )
+    # Inspection date; empty for equipment items
+    date = models.DateField(null=True, blank=True)
+    position = models.PositiveSmallIntegerField(default=0)
+    
+    name = models.CharField(max_length=100)
+    name_key = models.CharField(max_length=100, help_text="Lowercased name with collapsed whitespace")
+    category = models.CharField(max_length=50, blank=True)
+    condition = models.CharField(max_length=50, blank=True, help_text="Condition or status as reported")
+    needs_attention = models.BooleanField(default=False)
+    notes = models.TextField(blank=True)
+    
+    def __str__(self):
+        return f"{self.ambulance.vehicle_number} {self.name} ({self.get_source_display()})"
+    
+    class Meta:
+        ordering = ['ambulance', 'source', '-date', 'position']
+        indexes = [
+            models.Index(fields=['name_key', 'date'], name='inspection_item_name_date'),
+            models.Index(fields=['ambulance', 'source', 'name_key'], name='inspection_item_amb_source'),
+            models.Index(
+                fields=['date', 'name_key'], name='inspection_item_failing',
+                condition=models.Q(needs_attention=True)
+            ),
+        ]
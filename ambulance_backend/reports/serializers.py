@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import DriverInspection, ParamedicInspection, MaintenanceRecord
+from .models import DriverInspection, ParamedicInspection, MaintenanceRecord, InspectionItem
 from ambulances.serializers import AmbulanceSerializer
 from accounts.serializers import UserSerializer
 
@@ -24,6 +24,12 @@ class DriverInspectionCreateSerializer(serializers.ModelSerializer):
             'mileage', 'fuel_level', 'overall_status', 'additional_notes'
         ]
 
+class DriverInspectionBulkSerializer(DriverInspectionCreateSerializer):
+    """Create serializer for bulk writes; uniqueness is checked once per batch"""
+    
+    class Meta(DriverInspectionCreateSerializer.Meta):
+        validators = []
+
 class ParamedicInspectionSerializer(serializers.ModelSerializer):
     paramedic_details = UserSerializer(source='paramedic', read_only=True)
     ambulance_details = AmbulanceSerializer(source='ambulance', read_only=True)
@@ -45,6 +51,12 @@ class ParamedicInspectionCreateSerializer(serializers.ModelSerializer):
             'overall_status', 'additional_notes'
         ]
 
+class ParamedicInspectionBulkSerializer(ParamedicInspectionCreateSerializer):
+    """Create serializer for bulk writes; uniqueness is checked once per batch"""
+    
+    class Meta(ParamedicInspectionCreateSerializer.Meta):
+        validators = []
+
 class MaintenanceRecordSerializer(serializers.ModelSerializer):
     ambulance_details = AmbulanceSerializer(source='ambulance', read_only=True)
     
@@ -64,3 +76,15 @@ class MaintenanceRecordCreateSerializer(serializers.ModelSerializer):
             'ambulance', 'maintenance_type', 'status', 'scheduled_date',
             'completed_date', 'description', 'cost', 'vendor'
         ]
+
+class InspectionItemSerializer(serializers.ModelSerializer):
+    vehicle_number = serializers.CharField(source='ambulance.vehicle_number', read_only=True)
+    
+    class Meta:
+        model = InspectionItem
+        fields = [
+            'id', 'source', 'ambulance', 'vehicle_number', 'driver_inspection',
+            'paramedic_inspection', 'date', 'name', 'category', 'condition',
+            'needs_attention', 'notes'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from ambulances.models import Ambulance
+from .checklists import sync_equipment, sync_inspections
+from .models import DriverInspection, ParamedicInspection
+from .telemetry import forget_inspection, rebuild_series, record_inspection
+
+@receiver(pre_save, sender=DriverInspection)
+def remember_inspection_ambulance(sender, instance, **kwargs):
+    # An edit may move the inspection to another ambulance, whose old series then needs rebuilding
+    instance._previous_ambulance_id = (
+        DriverInspection.objects.filter(pk=instance.pk).values_list('ambulance_id', flat=True).first()
+        if instance.pk else None
+    )
+
+@receiver(post_save, sender=DriverInspection)
+def update_telemetry(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_ambulance_id', None)
+    if previous is not None and previous != instance.ambulance_id:
+        rebuild_series([previous, instance.ambulance_id])
+    else:
+        record_inspection(instance)
+
+@receiver(post_delete, sender=DriverInspection)
+def drop_from_telemetry(sender, instance, **kwargs):
+    forget_inspection(instance)
+
+@receiver(post_save, sender=DriverInspection)
+@receiver(post_save, sender=ParamedicInspection)
+def update_checklist_items(sender, instance, **kwargs):
+    sync_inspections(sender, [instance])
+
+@receiver(post_save, sender=Ambulance)
+def update_equipment_items(sender, instance, created, **kwargs):
+    # Location and status updates save the ambulance constantly; only equipment changes matter here
+    if created or instance.equipment_changed():
+        sync_equipment(instance)
+    instance.remember_equipment()
@@ -0,0 +1,276 @@
+"""
+Mileage and fuel telemetry from driver inspections.
+
+Each ambulance has one TelemetrySeries row whose columns are packed NumPy
+arrays, sorted by shift slot. reports.signals keeps it current: a new
+inspection for the latest shift is appended, an edit that keeps its shift
+is patched in place, and anything else rebuilds that ambulance's series
+with one query.
+
+Analysis loads every series in one query and concatenates them into flat
+arrays with a group index, so each metric is computed for the whole fleet
+in one vectorized pass. Rolling windows are differences of a cumulative
+sum, clipped at the start of each vehicle's group:
+
+* km per day: distance over elapsed days in the last `window` intervals;
+* fuel per 100 km: fuel burnt (percent of tank) over distance, counting
+  only intervals without a refuel;
+* anomalies: the odometer going backwards, and fuel drops of at least
+  TELEMETRY_FUEL_DROP_PERCENT that are more than TELEMETRY_FUEL_DROP_FACTOR
+  times what the vehicle's previous consumption explains.
+"""
+from datetime import date
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from .models import DriverInspection, TelemetrySeries
+
+SHIFT_RANK = {shift: rank for rank, (shift, _) in enumerate(DriverInspection.SHIFT_CHOICES)}
+SHIFTS = [shift for shift, _ in DriverInspection.SHIFT_CHOICES]
+
+# Stored little-endian whatever the host
+COLUMNS = (
+    ('inspection_ids', np.dtype('<i8')),
+    ('slots', np.dtype('<i8')),
+    ('mileage', np.dtype('<i8')),
+    ('fuel_levels', np.dtype('<i2')),
+)
+
+def reading_slot(inspection_date, shift):
+    return inspection_date.toordinal() * len(SHIFT_RANK) + SHIFT_RANK.get(shift, 0)
+
+def slot_date(slot):
+    return date.fromordinal(int(slot) // len(SHIFT_RANK))
+
+def unpack(series):
+    return {name: np.frombuffer(bytes(getattr(series, name)), dtype=dtype) for name, dtype in COLUMNS}
+
+def _packed(columns):
+    packed = {name: np.ascontiguousarray(columns[name], dtype=dtype).tobytes() for name, dtype in COLUMNS}
+    packed['readings'] = len(columns['slots'])
+    return packed
+
+def _pack(series, columns):
+    for name, value in _packed(columns).items():
+        setattr(series, name, value)
+
+def rebuild_series(ambulance_ids):
+    """Rebuild the series of the given ambulances from their inspections"""
+    ambulance_ids = set(ambulance_ids)
+    rows = {}
+    inspections = DriverInspection.objects.filter(ambulance_id__in=ambulance_ids).values_list(
+        'ambulance_id', 'id', 'date', 'shift', 'mileage', 'fuel_level'
+    )
+    for ambulance_id, inspection_id, inspection_date, shift, mileage, fuel_level in inspections:
+        rows.setdefault(ambulance_id, []).append(
+            (inspection_id, reading_slot(inspection_date, shift), mileage, fuel_level)
+        )
+    
+    TelemetrySeries.objects.filter(ambulance_id__in=ambulance_ids - set(rows)).delete()
+    for ambulance_id, readings in rows.items():
+        table = np.array(readings, dtype=np.int64)
+        # By slot, then by id for two inspections in the same shift
+        table = table[np.lexsort((table[:, 0], table[:, 1]))]
+        TelemetrySeries.objects.update_or_create(
+            ambulance_id=ambulance_id,
+            defaults=_packed(dict(zip([name for name, _ in COLUMNS], table.T)))
+        )
+    return len(rows)
+
+def record_inspection(inspection):
+    """Apply a saved inspection to its ambulance's series"""
+    with transaction.atomic():
+        series = TelemetrySeries.objects.select_for_update().filter(ambulance_id=inspection.ambulance_id).first()
+        if series is None:
+            rebuild_series([inspection.ambulance_id])
+            return
+        columns = {name: values.copy() for name, values in unpack(series).items()}
+        slot = reading_slot(inspection.date, inspection.shift)
+        position = np.flatnonzero(columns['inspection_ids'] == inspection.id)
+        if position.size:
+            if columns['slots'][position[0]] != slot:
+                rebuild_series([inspection.ambulance_id])
+                return
+            columns['mileage'][position[0]] = inspection.mileage
+            columns['fuel_levels'][position[0]] = inspection.fuel_level
+        elif not len(columns['slots']) or slot >= columns['slots'][-1]:
+            for name, value in (
+                ('inspection_ids', inspection.id), ('slots', slot),
+                ('mileage', inspection.mileage), ('fuel_levels', inspection.fuel_level),
+            ):
+                columns[name] = np.append(columns[name], value)
+        else:
+            rebuild_series([inspection.ambulance_id])
+            return
+        _pack(series, columns)
+        series.save()
+
+def forget_inspection(inspection):
+    """Remove a deleted inspection from its ambulance's series"""
+    with transaction.atomic():
+        series = TelemetrySeries.objects.select_for_update().filter(ambulance_id=inspection.ambulance_id).first()
+        if series is None:
+            return
+        columns = unpack(series)
+        keep = columns['inspection_ids'] != inspection.id
+        if keep.all():
+            return
+        if not keep.any():
+            series.delete()
+            return
+        _pack(series, {name: values[keep] for name, values in columns.items()})
+        series.save()
+
+def load_fleet(ambulance_ids=None, since=None):
+    """
+    Every series (or those of `ambulance_ids`) concatenated into flat arrays,
+    ordered by ambulance and then slot; `group` indexes `ambulance_ids`
+    """
+    queryset = TelemetrySeries.objects.order_by('ambulance_id')
+    if ambulance_ids is not None:
+        queryset = queryset.filter(ambulance_id__in=ambulance_ids)
+    rows = list(queryset.values_list('ambulance_id', 'ambulance__vehicle_number', *[name for name, _ in COLUMNS]))
+    
+    fleet = {
+        'ambulance_ids': [row[0] for row in rows],
+        'vehicle_numbers': [row[1] for row in rows],
+    }
+    for offset, (name, dtype) in enumerate(COLUMNS, start=2):
+        fleet[name] = np.concatenate(
+            [np.frombuffer(bytes(row[offset]), dtype=dtype) for row in rows]
+        ) if rows else np.zeros(0, dtype=dtype)
+    lengths = [len(row[3]) // COLUMNS[1][1].itemsize for row in rows]
+    fleet['group'] = np.repeat(np.arange(len(rows)), lengths)
+    
+    if since is not None:
+        keep = fleet['slots'] >= reading_slot(since, SHIFTS[0])
+        for name in [name for name, _ in COLUMNS] + ['group']:
+            fleet[name] = fleet[name][keep]
+    return fleet
+
+def _rolling_sum(values, starts, window):
+    """Sum of the last `window` values at each position, not crossing back past `starts`"""
+    totals = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    index = np.arange(len(values))
+    return totals[index + 1] - totals[np.maximum(index + 1 - window, starts)]
+
+def _ratio(numerator, denominator, scale=1.0):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, scale * numerator / denominator, np.nan)
+
+def analyze(fleet, window=None):
+    """Per-reading rolling metrics and anomaly flags for a loaded fleet"""
+    window = window or getattr(settings, 'TELEMETRY_WINDOW', 5)
+    group = fleet['group']
+    count = len(group)
+    first = np.ones(count, dtype=bool)
+    first[1:] = group[1:] != group[:-1]
+    index = np.arange(count)
+    starts = np.maximum.accumulate(np.where(first, index, 0))
+    
+    days = fleet['slots'] // len(SHIFT_RANK)
+    mileage = fleet['mileage']
+    fuel = fleet['fuel_levels'].astype(np.int64)
+    # Change since the previous reading of the same vehicle; zero at each vehicle's first reading
+    km_delta = np.where(first, 0, mileage - np.roll(mileage, 1))
+    fuel_delta = np.where(first, 0, fuel - np.roll(fuel, 1))
+    day_delta = np.where(first, 0, days - np.roll(days, 1))
+    
+    driven = np.maximum(km_delta, 0)
+    burning = (km_delta > 0) & (fuel_delta <= 0)
+    km_per_day = _ratio(_rolling_sum(driven, starts, window), _rolling_sum(day_delta, starts, window))
+    fuel_per_100km = _ratio(
+        _rolling_sum(np.where(burning, -fuel_delta, 0), starts, window),
+        _rolling_sum(np.where(burning, km_delta, 0), starts, window),
+        scale=100.0
+    )
+    
+    # Judge each drop against the consumption seen before it
+    previous_rate = np.where(first, np.nan, np.roll(fuel_per_100km, 1))
+    expected_drop = np.nan_to_num(previous_rate * driven / 100.0)
+    drop = -fuel_delta
+    fuel_drop = (
+        ~first
+        & (drop >= getattr(settings, 'TELEMETRY_FUEL_DROP_PERCENT', 25))
+        & (drop > getattr(settings, 'TELEMETRY_FUEL_DROP_FACTOR', 3) * expected_drop)
+    )
+    return {
+        'first': first,
+        'km_delta': km_delta,
+        'fuel_delta': fuel_delta,
+        'km_per_day': km_per_day,
+        'fuel_per_100km': fuel_per_100km,
+        'mileage_backwards': km_delta < 0,
+        'fuel_drop': fuel_drop,
+    }
+
+def _number(value, digits=2):
+    return None if np.isnan(value) else round(float(value), digits)
+
+def _reading(fleet, metrics, row):
+    return {
+        'inspection_id': int(fleet['inspection_ids'][row]),
+        'date': slot_date(fleet['slots'][row]),
+        'shift': SHIFTS[int(fleet['slots'][row]) % len(SHIFT_RANK)],
+        'mileage': int(fleet['mileage'][row]),
+        'fuel_level': int(fleet['fuel_levels'][row]),
+        'km_per_day': _number(metrics['km_per_day'][row], 1),
+        'fuel_per_100km': _number(metrics['fuel_per_100km'][row]),
+    }
+
+def fleet_summary(fleet, metrics):
+    """Latest reading and rolling metrics per ambulance"""
+    groups = len(fleet['ambulance_ids'])
+    if not len(fleet['group']):
+        return []
+    last = np.flatnonzero(np.append(fleet['group'][1:] != fleet['group'][:-1], True))
+    readings = np.bincount(fleet['group'], minlength=groups)
+    anomalies = np.bincount(
+        fleet['group'][metrics['mileage_backwards'] | metrics['fuel_drop']], minlength=groups
+    )
+    summary = []
+    for row in last:
+        group = int(fleet['group'][row])
+        latest = _reading(fleet, metrics, row)
+        summary.append({
+            'ambulance_id': fleet['ambulance_ids'][group],
+            'vehicle_number': fleet['vehicle_numbers'][group],
+            'readings': int(readings[group]),
+            'last_date': latest['date'],
+            'latest_mileage': latest['mileage'],
+            'latest_fuel_level': latest['fuel_level'],
+            'km_per_day': latest['km_per_day'],
+            'fuel_per_100km': latest['fuel_per_100km'],
+            'anomalies': int(anomalies[group]),
+        })
+    return summary
+
+def fleet_anomalies(fleet, metrics):
+    """Every flagged reading, oldest first"""
+    flagged = np.flatnonzero(metrics['mileage_backwards'] | metrics['fuel_drop'])
+    flagged = flagged[np.argsort(fleet['slots'][flagged], kind='stable')]
+    anomalies = []
+    for row in flagged:
+        group = int(fleet['group'][row])
+        anomaly = _reading(fleet, metrics, row)
+        anomaly.update({
+            'ambulance_id': fleet['ambulance_ids'][group],
+            'vehicle_number': fleet['vehicle_numbers'][group],
+            'type': 'mileage_backwards' if metrics['mileage_backwards'][row] else 'fuel_drop',
+            'previous_mileage': anomaly['mileage'] - int(metrics['km_delta'][row]),
+            'previous_fuel_level': anomaly['fuel_level'] - int(metrics['fuel_delta'][row]),
+        })
+        anomalies.append(anomaly)
+    return anomalies
+
+def ambulance_series(fleet, metrics):
+    """All readings with their rolling metrics, for a fleet loaded for one ambulance"""
+    series = []
+    for row in range(len(fleet['group'])):
+        reading = _reading(fleet, metrics, row)
+        reading['anomaly'] = (
+            'mileage_backwards' if metrics['mileage_backwards'][row]
+            else 'fuel_drop' if metrics['fuel_drop'][row] else None
+        )
+        series.append(reading)
+    return series
@@ -1,3 +1,68 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+import numpy as np
 from django.test import TestCase
+from dispatch.archive import archive_closed_calls
+from dispatch.models import EmergencyCall
+from .forecasting import fit_call_forecast
+from .models import CallForecast, CallForecastZoneState
 
-# Create your tests here.
+START = datetime(2026, 9, 7, tzinfo=dt_timezone.utc)
+
+class CallForecastFitTests(TestCase):
+    """Incremental fits must end in the same state as one full refit over the same calls"""
+    
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        zones = ((Decimal('-6.82'), Decimal('39.29')), (Decimal('-6.40'), Decimal('38.90')))
+        # Two zones over three weeks, the first one busier in the evening
+        for hour in range(3 * 168):
+            for zone, (latitude, longitude) in enumerate(zones):
+                rate = (3 if 17 <= hour % 24 <= 21 else 1) if zone == 0 else 0.5
+                for _ in range(rng.poisson(rate)):
+                    call = EmergencyCall.objects.create(
+                        caller_name='Caller', caller_phone='+255722000000', latitude=latitude, longitude=longitude,
+                        address='x', priority='medium', status='completed', description='x',
+                        request_source='phone_call', requester_type='individual',
+                    )
+                    created_at = START + timedelta(hours=hour, minutes=int(rng.integers(60)))
+                    EmergencyCall.objects.filter(pk=call.pk).update(created_at=created_at, updated_at=created_at)
+    
+    def states(self):
+        return {
+            state.zone: (state.level, np.frombuffer(bytes(state.seasonal), dtype=np.float64))
+            for state in CallForecastZoneState.objects.all()
+        }
+    
+    def assertSameStates(self, first, second):
+        self.assertEqual(first.keys(), second.keys())
+        for zone in first:
+            self.assertAlmostEqual(first[zone][0], second[zone][0], places=9)
+            np.testing.assert_allclose(first[zone][1], second[zone][1], atol=1e-9)
+    
+    def test_incremental_fits_match_a_full_refit(self):
+        end = START + timedelta(weeks=3, minutes=30)
+        for days in (4, 9, 15):
+            fit_call_forecast(now=START + timedelta(days=days), chunk_size=50)
+        fit = fit_call_forecast(now=end, chunk_size=50)
+        self.assertFalse(fit.full_refit)
+        incremental = self.states()
+        
+        full = fit_call_forecast(full=True, now=end)
+        self.assertTrue(full.full_refit)
+        self.assertEqual(full.calls_processed, EmergencyCall.objects.count())
+        self.assertEqual(full.zone_count, 2)
+        self.assertSameStates(incremental, self.states())
+        self.assertEqual(CallForecast.objects.count(), 2 * 168)
+        self.assertTrue(all(forecast.expected_calls >= 0 for forecast in CallForecast.objects.all()))
+    
+    def test_archived_calls_are_still_fitted(self):
+        end = START + timedelta(weeks=3)
+        fit_call_forecast(full=True, now=end)
+        before = self.states()
+        calls = EmergencyCall.objects.count()
+        
+        archive_closed_calls(older_than_days=0)
+        self.assertEqual(EmergencyCall.objects.count(), 0)
+        self.assertEqual(fit_call_forecast(full=True, now=end).calls_processed, calls)
+        self.assertSameStates(before, self.states())
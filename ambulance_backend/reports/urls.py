@@ -5,18 +5,31 @@ urlpatterns = [
     # Driver Inspections
     path('driver-inspections/', views.DriverInspectionListCreateView.as_view(), name='driver-inspection-list-create'),
     path('driver-inspections/<int:pk>/', views.DriverInspectionDetailView.as_view(), name='driver-inspection-detail'),
+    path('driver-inspections/bulk/', views.bulk_driver_inspections, name='driver-inspection-bulk'),
     
     # Paramedic Inspections
     path('paramedic-inspections/', views.ParamedicInspectionListCreateView.as_view(), name='paramedic-inspection-list-create'),
     path('paramedic-inspections/<int:pk>/', views.ParamedicInspectionDetailView.as_view(), name='paramedic-inspection-detail'),
+    path('paramedic-inspections/bulk/', views.bulk_paramedic_inspections, name='paramedic-inspection-bulk'),
     
     # Maintenance Records
     path('maintenance-records/', views.MaintenanceRecordListCreateView.as_view(), name='maintenance-record-list-create'),
     path('maintenance-records/<int:pk>/', views.MaintenanceRecordDetailView.as_view(), name='maintenance-record-detail'),
+    path('maintenance-records/bulk/', views.bulk_maintenance_records, name='maintenance-record-bulk'),
+    
+    # Checklist Items
+    path('inspection-items/', views.InspectionItemListView.as_view(), name='inspection-item-list'),
     
     # Report Views
     path('reports/inspection-summary/', views.inspection_summary, name='inspection-summary'),
     path('reports/maintenance-summary/', views.maintenance_summary, name='maintenance-summary'),
     path('reports/ambulance-utilization/', views.ambulance_utilization_report, name='ambulance-utilization'),
     path('reports/overdue-maintenance/', views.overdue_maintenance_alerts, name='overdue-maintenance-alerts'),
+    path('reports/maintenance-plan/', views.maintenance_plan, name='maintenance-plan'),
+    path('reports/call-forecast/', views.call_forecast, name='call-forecast'),
+    path('reports/failing-items/', views.failing_items, name='failing-items'),
+    path('reports/missing-equipment/', views.missing_equipment, name='missing-equipment'),
+    path('reports/telemetry/', views.telemetry_summary, name='telemetry-summary'),
+    path('reports/telemetry/anomalies/', views.telemetry_anomalies, name='telemetry-anomalies'),
+    path('reports/telemetry/<int:ambulance_id>/', views.ambulance_telemetry, name='ambulance-telemetry'),
 ]
@@ -1,23 +1,36 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Q, Count, Avg, Sum
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Count, Avg, Sum, Max
 from django.utils import timezone
 from datetime import datetime, timedelta
-from .models import DriverInspection, ParamedicInspection, MaintenanceRecord
+from ambulance_management.db_routers import use_replica
+from ambulances.models import Ambulance
+from ambulances.scoping import AmbulanceScopedMixin, crew_scope_errors, scope_queryset, visible_ambulance_ids
+from jobs.views import enqueue_for_request
+from . import jobs as report_jobs
+from . import checklists, maintenance_planning, telemetry
+from .models import DriverInspection, ParamedicInspection, MaintenanceRecord, CallForecast, CallForecastFit, InspectionItem
 from .serializers import (
     DriverInspectionSerializer,
     DriverInspectionCreateSerializer,
+    DriverInspectionBulkSerializer,
     ParamedicInspectionSerializer,
     ParamedicInspectionCreateSerializer,
+    ParamedicInspectionBulkSerializer,
     MaintenanceRecordSerializer,
-    MaintenanceRecordCreateSerializer
+    MaintenanceRecordCreateSerializer,
+    InspectionItemSerializer
 )
 
 # Driver Inspections
-class DriverInspectionListCreateView(generics.ListCreateAPIView):
+class DriverInspectionListCreateView(AmbulanceScopedMixin, generics.ListCreateAPIView):
     queryset = DriverInspection.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    crew_owner_field = 'driver'
+    crew_owner_role = 'driver'
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -27,10 +40,6 @@ class DriverInspectionListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         queryset = DriverInspection.objects.all()
         
-        # Filter by driver if user is a driver
-        if self.request.user.role == 'driver':
-            queryset = queryset.filter(driver=self.request.user)
-        
         # Filter by query parameters
         ambulance_id = self.request.query_params.get('ambulance_id')
         date_from = self.request.query_params.get('date_from')
@@ -48,15 +57,19 @@ class DriverInspectionListCreateView(generics.ListCreateAPIView):
         
         return queryset
 
-class DriverInspectionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DriverInspectionDetailView(AmbulanceScopedMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = DriverInspection.objects.all()
     serializer_class = DriverInspectionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    crew_owner_field = 'driver'
+    crew_owner_role = 'driver'
 
 # Paramedic Inspections
-class ParamedicInspectionListCreateView(generics.ListCreateAPIView):
+class ParamedicInspectionListCreateView(AmbulanceScopedMixin, generics.ListCreateAPIView):
     queryset = ParamedicInspection.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    crew_owner_field = 'paramedic'
+    crew_owner_role = 'paramedic'
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -66,10 +79,6 @@ class ParamedicInspectionListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         queryset = ParamedicInspection.objects.all()
         
-        # Filter by paramedic if user is a paramedic
-        if self.request.user.role == 'paramedic':
-            queryset = queryset.filter(paramedic=self.request.user)
-        
         # Filter by query parameters
         ambulance_id = self.request.query_params.get('ambulance_id')
         date_from = self.request.query_params.get('date_from')
@@ -87,13 +96,15 @@ class ParamedicInspectionListCreateView(generics.ListCreateAPIView):
         
         return queryset
 
-class ParamedicInspectionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ParamedicInspectionDetailView(AmbulanceScopedMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = ParamedicInspection.objects.all()
     serializer_class = ParamedicInspectionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    crew_owner_field = 'paramedic'
+    crew_owner_role = 'paramedic'
 
 # Maintenance Records
-class MaintenanceRecordListCreateView(generics.ListCreateAPIView):
+class MaintenanceRecordListCreateView(AmbulanceScopedMixin, generics.ListCreateAPIView):
     queryset = MaintenanceRecord.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     
@@ -125,14 +136,290 @@ class MaintenanceRecordListCreateView(generics.ListCreateAPIView):
         
         return queryset
 
-class MaintenanceRecordDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MaintenanceRecordDetailView(AmbulanceScopedMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = MaintenanceRecord.objects.all()
     serializer_class = MaintenanceRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+# Bulk Operations
+BULK_MAX_ITEMS = 500
+
+def _unique_together_error(unique_fields, within_batch=False):
+    message = 'The fields {} must make a unique set.'.format(', '.join(unique_fields))
+    if within_batch:
+        message = 'The fields {} are repeated within this batch.'.format(', '.join(unique_fields))
+    return {'non_field_errors': [message]}
+
+def _find_unique_conflicts(model, unique_fields, candidates):
+    """
+    Check unique_together for a whole batch with a single query.
+    
+    `candidates` is a list of (index, key, pk) tuples, where `key` holds the
+    attname values of `unique_fields` and `pk` is the row being updated (or
+    None for inserts). Returns {index: errors} for every conflicting item.
+    """
+    if not unique_fields or not candidates:
+        return {}
+    
+    attnames = [model._meta.get_field(field).attname for field in unique_fields]
+    batch_pks = {pk for _, _, pk in candidates if pk is not None}
+    
+    # Narrow the lookup with one __in filter per column, then match exact keys in Python
+    lookup = {
+        f'{attname}__in': {key[position] for _, key, _ in candidates}
+        for position, attname in enumerate(attnames)
+    }
+    existing = set(
+        model.objects.filter(**lookup).exclude(pk__in=batch_pks).values_list(*attnames)
+    )
+    
+    conflicts = {}
+    seen = set()
+    for index, key, _ in candidates:
+        if key in existing:
+            conflicts[index] = _unique_together_error(unique_fields)
+        elif key in seen:
+            conflicts[index] = _unique_together_error(unique_fields, within_batch=True)
+        else:
+            seen.add(key)
+    return conflicts
+
+def _unique_key(model, unique_fields, data, instance=None):
+    key = []
+    for field in unique_fields:
+        if field in data:
+            value = data[field]
+            key.append(getattr(value, 'pk', value))
+        else:
+            key.append(getattr(instance, model._meta.get_field(field).attname))
+    return tuple(key)
+
+def _bulk_response(results):
+    failed = sum(1 for result in results if result['status'] == 'error')
+    succeeded = len(results) - failed
+    if not failed:
+        response_status = status.HTTP_201_CREATED if any(
+            result['status'] == 'created' for result in results
+        ) else status.HTTP_200_OK
+    elif succeeded:
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_400_BAD_REQUEST
+    return Response({
+        'succeeded': succeeded,
+        'failed': failed,
+        'results': results
+    }, status=response_status)
+
+def _save_individually(objects, results, update_fields=None):
+    """Fallback when a concurrent writer made the batch insert/update conflict"""
+    with transaction.atomic():
+        for index, obj in objects:
+            try:
+                with transaction.atomic():
+                    if update_fields is None:
+                        obj.pk = None
+                        obj.save(force_insert=True)
+                    else:
+                        obj.save(update_fields=update_fields)
+            except IntegrityError as exc:
+                results[index] = {'index': index, 'status': 'error', 'errors': {'non_field_errors': [str(exc)]}}
+
+def _after_bulk_write(model, objects, previous_ambulance_ids=()):
+    # bulk_create() and bulk_update() send no signals, so derived data is refreshed here
+    if not objects:
+        return
+    if model in (DriverInspection, ParamedicInspection):
+        checklists.sync_inspections(model, objects)
+    if model is DriverInspection:
+        # An inspection moved to another ambulance leaves the old one's series to rebuild too
+        telemetry.rebuild_series({obj.ambulance_id for obj in objects} | set(previous_ambulance_ids))
+
+def _bulk_create(request, serializer_class, owner_field=None):
+    """Validate a list of items in one pass and insert the valid ones with bulk_create"""
+    model = serializer_class.Meta.model
+    unique_fields = model._meta.unique_together[0] if model._meta.unique_together else ()
+    
+    results = [None] * len(request.data)
+    valid = []
+    for index, item in enumerate(request.data):
+        serializer = serializer_class(data=item)
+        if serializer.is_valid():
+            errors = crew_scope_errors(request, serializer.validated_data, owner_field)
+            if errors:
+                results[index] = {'index': index, 'status': 'error', 'errors': errors}
+            else:
+                valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+    
+    conflicts = _find_unique_conflicts(model, unique_fields, [
+        (index, _unique_key(model, unique_fields, data), None) for index, data in valid
+    ])
+    for index, errors in conflicts.items():
+        results[index] = {'index': index, 'status': 'error', 'errors': errors}
+    
+    objects = [(index, model(**data)) for index, data in valid if index not in conflicts]
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create([obj for _, obj in objects])
+    except IntegrityError:
+        _save_individually(objects, results)
+    
+    for index, obj in objects:
+        if results[index] is None:
+            results[index] = {'index': index, 'status': 'created', 'id': obj.pk}
+    _after_bulk_write(model, [obj for index, obj in objects if results[index]['status'] != 'error'])
+    return _bulk_response(results)
+
+def _bulk_update(request, serializer_class, owner_field=None, owner_role=None):
+    """Apply partial updates to a list of items, each identified by its `id`"""
+    model = serializer_class.Meta.model
+    unique_fields = model._meta.unique_together[0] if model._meta.unique_together else ()
+    
+    # Rows outside the user's scope are reported as not found, as the detail views do
+    ids = [item.get('id') for item in request.data if isinstance(item, dict)]
+    instances = scope_queryset(model.objects.all(), request, owner_field=owner_field, owner_role=owner_role).in_bulk(
+        [pk for pk in ids if isinstance(pk, int)]
+    )
+    
+    results = [None] * len(request.data)
+    valid = []
+    seen_ids = set()
+    for index, item in enumerate(request.data):
+        pk = item.get('id') if isinstance(item, dict) else None
+        instance = instances.get(pk) if isinstance(pk, int) else None
+        if instance is None:
+            results[index] = {'index': index, 'status': 'error', 'errors': {'id': ['Not found.']}}
+            continue
+        if pk in seen_ids:
+            results[index] = {'index': index, 'status': 'error', 'errors': {'id': ['Repeated within this batch.']}}
+            continue
+        seen_ids.add(pk)
+        
+        serializer = serializer_class(instance, data=item, partial=True)
+        if serializer.is_valid():
+            errors = crew_scope_errors(request, serializer.validated_data, owner_field)
+            if errors:
+                results[index] = {'index': index, 'status': 'error', 'errors': errors}
+            else:
+                valid.append((index, instance, serializer.validated_data))
+        else:
+            results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+    
+    conflicts = _find_unique_conflicts(model, unique_fields, [
+        (index, _unique_key(model, unique_fields, data, instance), instance.pk)
+        for index, instance, data in valid
+    ])
+    for index, errors in conflicts.items():
+        results[index] = {'index': index, 'status': 'error', 'errors': errors}
+    
+    objects = []
+    update_fields = set()
+    previous_ambulance_ids = set()
+    for index, instance, data in valid:
+        if index in conflicts:
+            continue
+        if model is DriverInspection:
+            previous_ambulance_ids.add(instance.ambulance_id)
+        for field, value in data.items():
+            setattr(instance, field, value)
+        update_fields.update(data)
+        objects.append((index, instance))
+    
+    # bulk_update() does not run pre_save(), so auto_now fields are set by hand
+    now = timezone.now()
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False):
+            for _, instance in objects:
+                setattr(instance, field.attname, now)
+            update_fields.add(field.name)
+    
+    if objects and update_fields:
+        try:
+            with transaction.atomic():
+                model.objects.bulk_update([obj for _, obj in objects], sorted(update_fields))
+        except IntegrityError:
+            _save_individually(objects, results, update_fields=sorted(update_fields))
+    
+    for index, obj in objects:
+        if results[index] is None:
+            results[index] = {'index': index, 'status': 'updated', 'id': obj.pk}
+    _after_bulk_write(
+        model, [obj for index, obj in objects if results[index]['status'] != 'error'], previous_ambulance_ids
+    )
+    return _bulk_response(results)
+
+def _bulk_write(request, serializer_class, scoped_view=None):
+    if not isinstance(request.data, list):
+        return Response({'error': 'Expected a list of items'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(request.data) > BULK_MAX_ITEMS:
+        return Response(
+            {'error': f'A batch may contain at most {BULK_MAX_ITEMS} items'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    owner_field = getattr(scoped_view, 'crew_owner_field', None)
+    if request.method == 'PATCH':
+        return _bulk_update(request, serializer_class, owner_field, getattr(scoped_view, 'crew_owner_role', None))
+    return _bulk_create(request, serializer_class, owner_field)
+
+@api_view(['POST', 'PATCH'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_driver_inspections(request):
+    """Create (POST) or partially update (PATCH) a list of driver inspections"""
+    return _bulk_write(request, DriverInspectionBulkSerializer, DriverInspectionListCreateView)
+
+@api_view(['POST', 'PATCH'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_paramedic_inspections(request):
+    """Create (POST) or partially update (PATCH) a list of paramedic inspections"""
+    return _bulk_write(request, ParamedicInspectionBulkSerializer, ParamedicInspectionListCreateView)
+
+@api_view(['POST', 'PATCH'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_maintenance_records(request):
+    """Create (POST) or partially update (PATCH) a list of maintenance records"""
+    return _bulk_write(request, MaintenanceRecordCreateSerializer)
+
+# Checklist Items
+class InspectionItemListView(AmbulanceScopedMixin, generics.ListAPIView):
+    serializer_class = InspectionItemSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        queryset = InspectionItem.objects.select_related('ambulance')
+        
+        # Filter by query parameters
+        source = self.request.query_params.get('source')
+        name = self.request.query_params.get('name')
+        category = self.request.query_params.get('category')
+        failing = self.request.query_params.get('failing')
+        ambulance_id = self.request.query_params.get('ambulance_id')
+        date_from = self.request.query_params.get('date_from')
+        date_to = self.request.query_params.get('date_to')
+        
+        if source:
+            queryset = queryset.filter(source=source)
+        if name:
+            queryset = queryset.filter(name_key=checklists.normalize_name(name))
+        if category:
+            queryset = queryset.filter(category=category)
+        if failing is not None:
+            queryset = queryset.filter(needs_attention=failing.lower() in ('1', 'true', 'yes'))
+        if ambulance_id:
+            queryset = queryset.filter(ambulance_id=ambulance_id)
+        if date_from:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(date__lte=date_to)
+        
+        return queryset
+
 # Report Views
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@use_replica()
 def inspection_summary(request):
     """Get inspection summary statistics"""
     today = timezone.now().date()
@@ -170,6 +457,7 @@ def inspection_summary(request):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@use_replica()
 def maintenance_summary(request):
     """Get maintenance summary statistics"""
     today = timezone.now().date()
@@ -207,88 +495,229 @@ def maintenance_summary(request):
         'type_breakdown': list(type_breakdown)
     })
 
+def _wants_async(request):
+    return request.query_params.get('async', '').lower() in ('1', 'true', 'yes')
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@use_replica()
 def ambulance_utilization_report(request):
-    """Get ambulance utilization report"""
-    from dispatch.models import Trip
-    from ambulances.models import Ambulance
+    """Get ambulance utilization report (?async=1 queues it as a background job)"""
+    if _wants_async(request):
+        return enqueue_for_request(request, 'reports.ambulance_utilization')
+    return Response(report_jobs.ambulance_utilization())
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@use_replica()
+def overdue_maintenance_alerts(request):
+    """Get overdue maintenance alerts (?async=1 queues it as a background job)"""
+    if _wants_async(request):
+        return enqueue_for_request(request, 'reports.overdue_maintenance')
+    return Response(report_jobs.overdue_maintenance())
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@use_replica()
+def maintenance_plan(request):
+    """Get the capacity-aware maintenance calendar (query params horizon_days, max_offline; ?async=1 queues it)"""
+    params = {}
+    try:
+        for name in ('horizon_days', 'max_offline'):
+            if request.query_params.get(name):
+                params[name] = int(request.query_params[name])
+                if params[name] < 1:
+                    raise ValueError
+    except ValueError:
+        return Response({'error': 'horizon_days and max_offline must be positive integers'}, status=status.HTTP_400_BAD_REQUEST)
+    if params.get('horizon_days', 1) > maintenance_planning.MAX_HORIZON_DAYS:
+        return Response(
+            {'error': f'horizon_days may be at most {maintenance_planning.MAX_HORIZON_DAYS}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    today = timezone.now().date()
-    month_ago = today - timedelta(days=30)
+    if _wants_async(request):
+        return enqueue_for_request(request, 'reports.maintenance_plan', params)
+    return Response(report_jobs.maintenance_plan(**params))
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@use_replica()
+def failing_items(request):
+    """Get inspection items needing attention, counted per ambulance and item (query params days, name, source)"""
+    try:
+        days = int(request.query_params.get('days', 7))
+    except ValueError:
+        return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    since = timezone.localdate() - timedelta(days=days)
     
-    ambulances = Ambulance.objects.all()
-    utilization_data = []
+    items = InspectionItem.objects.filter(needs_attention=True, date__gte=since)
+    if request.query_params.get('name'):
+        items = items.filter(name_key=checklists.normalize_name(request.query_params['name']))
+    if request.query_params.get('source'):
+        items = items.filter(source=request.query_params['source'])
+    visible = visible_ambulance_ids(request)
+    if visible is not None:
+        items = items.filter(ambulance_id__in=visible)
     
-    for ambulance in ambulances:
-        # Calculate trips in the last month
-        trips_count = Trip.objects.filter(
-            ambulance=ambulance,
-            start_time__date__gte=month_ago
-        ).count()
-        
-        # Calculate total distance
-        total_distance = Trip.objects.filter(
-            ambulance=ambulance,
-            start_time__date__gte=month_ago
-        ).aggregate(total=Sum('distance'))['total'] or 0
-        
-        # Calculate revenue
-        total_revenue = Trip.objects.filter(
-            ambulance=ambulance,
-            start_time__date__gte=month_ago
-        ).aggregate(total=Sum('cost'))['total'] or 0
-        
-        utilization_data.append({
-            'ambulance_id': ambulance.id,
-            'vehicle_number': ambulance.vehicle_number,
-            'model': ambulance.model,
-            'status': ambulance.status,
-            'trips_count': trips_count,
-            'total_distance': float(total_distance),
-            'total_revenue': float(total_revenue)
-        })
-    
-    return Response(utilization_data)
+    failures = (
+        items.values('ambulance_id', 'ambulance__vehicle_number', 'name_key')
+        .annotate(name=Max('name'), failures=Count('id'), last_failed=Max('date'))
+        .order_by('ambulance__vehicle_number', '-failures', 'name_key')
+    )
+    return Response({
+        'since': since,
+        'items': [
+            {
+                'ambulance_id': row['ambulance_id'],
+                'vehicle_number': row['ambulance__vehicle_number'],
+                'name': row['name'],
+                'failures': row['failures'],
+                'last_failed': row['last_failed'],
+            }
+            for row in failures
+        ]
+    })
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
-def overdue_maintenance_alerts(request):
-    """Get overdue maintenance alerts"""
-    today = timezone.now().date()
+@use_replica()
+def missing_equipment(request):
+    """Get ambulances whose equipment list lacks an item (query param item, e.g. ?item=oxygen tank)"""
+    item = checklists.normalize_name(request.query_params.get('item', ''))
+    if not item:
+        return Response({'error': 'item is required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Overdue scheduled maintenance
-    overdue_records = MaintenanceRecord.objects.filter(
-        status='scheduled',
-        scheduled_date__lt=today
-    ).select_related('ambulance')
-    
-    # Ambulances due for maintenance based on next_maintenance date
-    ambulances_due = []
-    from ambulances.models import Ambulance
-    
-    for ambulance in Ambulance.objects.all():
-        if ambulance.next_maintenance <= today:
-            ambulances_due.append({
-                'ambulance_id': ambulance.id,
-                'vehicle_number': ambulance.vehicle_number,
-                'next_maintenance': ambulance.next_maintenance,
-                'days_overdue': (today - ambulance.next_maintenance).days
-            })
+    equipped = InspectionItem.objects.filter(source='equipment', name_key=item).values('ambulance_id')
+    ambulances = Ambulance.objects.exclude(id__in=equipped)
+    visible = visible_ambulance_ids(request)
+    if visible is not None:
+        ambulances = ambulances.filter(id__in=visible)
+    return Response({
+        'item': item,
+        'ambulances': list(ambulances.values('id', 'vehicle_number', 'status'))
+    })
+
+def _telemetry_params(request):
+    """Parse window and days; returns (window, since) or raises ValueError"""
+    window = int(request.query_params.get('window') or getattr(settings, 'TELEMETRY_WINDOW', 5))
+    days = int(request.query_params.get('days') or getattr(settings, 'TELEMETRY_LOOKBACK_DAYS', 90))
+    if window < 1 or days < 1:
+        raise ValueError
+    return window, timezone.localdate() - timedelta(days=days)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@use_replica()
+def telemetry_summary(request):
+    """Get rolling km per day and fuel consumption for every ambulance (query params window, days)"""
+    try:
+        window, since = _telemetry_params(request)
+    except ValueError:
+        return Response({'error': 'window and days must be positive integers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    fleet = telemetry.load_fleet(visible_ambulance_ids(request), since)
+    metrics = telemetry.analyze(fleet, window)
+    return Response({
+        'since': since,
+        'window': window,
+        'ambulances': telemetry.fleet_summary(fleet, metrics)
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@use_replica()
+def telemetry_anomalies(request):
+    """Get inspections where mileage went backwards or fuel dropped suddenly (query params window, days)"""
+    try:
+        window, since = _telemetry_params(request)
+    except ValueError:
+        return Response({'error': 'window and days must be positive integers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    fleet = telemetry.load_fleet(visible_ambulance_ids(request), since)
+    metrics = telemetry.analyze(fleet, window)
+    return Response({
+        'since': since,
+        'window': window,
+        'anomalies': telemetry.fleet_anomalies(fleet, metrics)
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@use_replica()
+def ambulance_telemetry(request, ambulance_id):
+    """Get one ambulance's mileage and fuel readings with rolling metrics (query params window, days)"""
+    try:
+        window, since = _telemetry_params(request)
+    except ValueError:
+        return Response({'error': 'window and days must be positive integers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    visible = visible_ambulance_ids(request)
+    if visible is not None and ambulance_id not in visible:
+        return Response({'error': 'Ambulance not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    overdue_data = []
-    for record in overdue_records:
-        overdue_data.append({
-            'maintenance_id': record.id,
-            'ambulance_id': record.ambulance.id,
-            'vehicle_number': record.ambulance.vehicle_number,
-            'maintenance_type': record.maintenance_type,
-            'scheduled_date': record.scheduled_date,
-            'days_overdue': (today - record.scheduled_date).days,
-            'description': record.description
-        })
+    fleet = telemetry.load_fleet([ambulance_id], since)
+    metrics = telemetry.analyze(fleet, window)
+    return Response({
+        'ambulance_id': ambulance_id,
+        'since': since,
+        'window': window,
+        'readings': telemetry.ambulance_series(fleet, metrics)
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@use_replica()
+def call_forecast(request):
+    """Get expected call volume per zone and hour from the latest forecast fit"""
+    try:
+        hours = int(request.query_params.get('hours', 24))
+    except ValueError:
+        return Response({'error': 'hours must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    group_by = request.query_params.get('group_by', 'zone')
+    if group_by not in ('zone', 'hour'):
+        return Response({'error': 'group_by must be zone or hour'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    fit = CallForecastFit.objects.first()
+    if fit is None:
+        return Response({'error': 'No forecast has been fitted yet'}, status=status.HTTP_404_NOT_FOUND)
+    
+    # Serve from the current hour; if the last fit is too old to cover it, serve what it predicted
+    current_hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+    start = max(fit.fitted_through, current_hour)
+    if not CallForecast.objects.filter(period_start=start).exists():
+        start = fit.fitted_through
+    forecasts = CallForecast.objects.filter(
+        period_start__gte=start,
+        period_start__lt=start + timedelta(hours=max(hours, 1))
+    )
+    zone = request.query_params.get('zone')
+    if zone:
+        forecasts = forecasts.filter(zone__startswith=zone)
+    
+    if group_by == 'hour':
+        rows = forecasts.values('period_start').annotate(expected_calls=Sum('expected_calls')).order_by('period_start')
+        data = [
+            {'period_start': row['period_start'], 'expected_calls': round(row['expected_calls'], 3)}
+            for row in rows
+        ]
+    else:
+        data = {}
+        for row in forecasts.values('zone', 'period_start', 'expected_calls').order_by('zone', 'period_start'):
+            data.setdefault(row['zone'], []).append({
+                'period_start': row['period_start'],
+                'expected_calls': round(row['expected_calls'], 3)
+            })
+        data = [
+            {'zone': zone, 'expected_calls': round(sum(hour['expected_calls'] for hour in hourly), 3), 'hours': hourly}
+            for zone, hourly in data.items()
+        ]
     
     return Response({
-        'overdue_maintenance_records': overdue_data,
-        'ambulances_due_for_maintenance': ambulances_due
+        'fitted_through': fit.fitted_through,
+        'fitted_at': fit.created_at,
+        'stale': fit.fitted_through < current_hour,
+        'start': start,
+        'group_by': group_by,
+        'forecasts': data
     })
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import ShiftAssignment
+
+@admin.register(ShiftAssignment)
+class ShiftAssignmentAdmin(admin.ModelAdmin):
+    list_display = ('user', 'ambulance', 'role', 'starts_at', 'ends_at')
+    list_filter = ('role', 'ambulance')
+    search_fields = ('user__username', 'ambulance__vehicle_number')
+    date_hierarchy = 'starts_at'
+    readonly_fields = ('created_at', 'updated_at')
@@ -0,0 +1,118 @@
+"""
+In-memory roster index.
+
+Shifts overlapping a window around now (ROSTER_INDEX_LOOKBACK_HOURS back,
+ROSTER_INDEX_LOOKAHEAD_HOURS ahead) are loaded once into an IntervalTree,
+so "who is on which ambulance at T" and "which ambulances are crewed at T"
+are answered from memory. roster.signals marks the index for rebuild
+whenever a shift changes in this process. Shifts saved by other processes
+never reach those signals, so the signals also bump the RosterVersion row
+in the same transaction, and each read compares that version (a primary
+key lookup) with the one the index was built at, rebuilding when they
+differ. Every process also rebuilds
+after ROSTER_INDEX_TTL, and once now gets close to the end of the window.
+Moments outside the window are answered from the database instead.
+
+An ambulance is crewed when every role in ROSTER_CREWED_ROLES is on shift.
+If the window holds no shifts at all, the roster is treated as unused, and
+crewed_ambulance_ids() returns None so callers skip crew filtering.
+"""
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from .intervals import IntervalTree
+from .models import RosterVersion, ShiftAssignment
+
+Shift = namedtuple('Shift', [
+    'shift_id', 'user_id', 'name', 'role', 'ambulance_id', 'vehicle_number', 'starts_at', 'ends_at'
+])
+
+SHIFT_FIELDS = (
+    'id', 'user_id', 'user__first_name', 'user__last_name', 'user__username', 'role',
+    'ambulance_id', 'ambulance__vehicle_number', 'starts_at', 'ends_at',
+)
+
+def _shift(row):
+    name = f"{row['user__first_name']} {row['user__last_name']}".strip() or row['user__username']
+    return Shift(
+        row['id'], row['user_id'], name, row['role'], row['ambulance_id'],
+        row['ambulance__vehicle_number'], row['starts_at'], row['ends_at']
+    )
+
+def _shifts_overlapping(start, end):
+    rows = ShiftAssignment.objects.filter(starts_at__lt=end, ends_at__gt=start).values(*SHIFT_FIELDS)
+    return [_shift(row) for row in rows]
+
+def roster_marker():
+    """Changes whenever a shift is added, edited or removed, by any process"""
+    return RosterVersion.objects.filter(pk=1).values_list('version', flat=True).first()
+
+def bump_roster_version():
+    if not RosterVersion.objects.filter(pk=1).update(version=F('version') + 1):
+        RosterVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+
+class RosterIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._marker = None
+    
+    def _build(self, marker):
+        now = timezone.now()
+        self.window_start = now - timedelta(hours=getattr(settings, 'ROSTER_INDEX_LOOKBACK_HOURS', 24))
+        self.window_end = now + timedelta(hours=getattr(settings, 'ROSTER_INDEX_LOOKAHEAD_HOURS', 48))
+        shifts = _shifts_overlapping(self.window_start, self.window_end)
+        self.tree = IntervalTree(
+            (shift.starts_at.timestamp(), shift.ends_at.timestamp(), shift) for shift in shifts
+        )
+        self._built_at = time.monotonic()
+        self._marker = marker
+    
+    def _ensure_built(self):
+        # Taken before building, so a change that lands mid-build triggers another rebuild
+        marker = roster_marker()
+        ttl = getattr(settings, 'ROSTER_INDEX_TTL', 300)
+        stale = self._built_at is None or marker != self._marker or time.monotonic() - self._built_at > ttl
+        # Rebuild before the window runs out, so "now" is always served from memory
+        if stale or timezone.now() + timedelta(seconds=ttl) >= self.window_end:
+            self._build(marker)
+    
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+    
+    def _on_duty(self, at):
+        # Called with the lock held and the index built
+        if self.window_start <= at < self.window_end:
+            return self.tree.stab(at.timestamp())
+        return _shifts_overlapping(at, at + timedelta(microseconds=1))
+    
+    def on_duty(self, at=None):
+        """Shifts in progress at `at` (default now)"""
+        with self._lock:
+            self._ensure_built()
+            return self._on_duty(at or timezone.now())
+    
+    def in_use(self):
+        with self._lock:
+            self._ensure_built()
+            return len(self.tree) > 0
+    
+    def crewed_ambulance_ids(self, at=None):
+        """Ids of ambulances with every required role on shift at `at`, or None when no roster is kept"""
+        with self._lock:
+            self._ensure_built()
+            if not len(self.tree):
+                return None
+            shifts = self._on_duty(at or timezone.now())
+        required = set(getattr(settings, 'ROSTER_CREWED_ROLES', ('driver',)))
+        roles = {}
+        for shift in shifts:
+            roles.setdefault(shift.ambulance_id, set()).add(shift.role)
+        return frozenset(ambulance_id for ambulance_id, present in roles.items() if required <= present)
+
+roster_index = RosterIndex()
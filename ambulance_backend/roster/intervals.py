@@ -0,0 +1,67 @@
+"""
+Static centered interval tree.
+
+Each node holds the intervals that contain its center point, sorted once
+by start and once by end; intervals wholly before or after the center go
+to the left or right subtree. Centers are median starts, so the depth is
+O(log n), and a stabbing query ("which intervals contain t") visits one
+node per level and bisects its sorted lists: O(log n + k) for k matches.
+Intervals are half-open, [start, end).
+"""
+from bisect import bisect_right
+
+class _Node:
+    __slots__ = ('center', 'starts', 'by_start', 'ends', 'by_end', 'left', 'right')
+
+class IntervalTree:
+    def __init__(self, intervals):
+        """`intervals` is an iterable of (start, end, item) with start < end"""
+        intervals = sorted(
+            (interval for interval in intervals if interval[0] < interval[1]),
+            key=lambda interval: interval[0]
+        )
+        self._size = len(intervals)
+        self._root = self._build(intervals)
+    
+    def _build(self, intervals):
+        if not intervals:
+            return None
+        node = _Node()
+        # Intervals arrive sorted by start, so the median start is in the middle
+        node.center = intervals[len(intervals) // 2][0]
+        left, here, right = [], [], []
+        for interval in intervals:
+            if interval[1] <= node.center:
+                left.append(interval)
+            elif interval[0] > node.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        node.by_start = here
+        node.starts = [interval[0] for interval in here]
+        node.by_end = sorted(here, key=lambda interval: interval[1])
+        node.ends = [interval[1] for interval in node.by_end]
+        node.left = self._build(left)
+        node.right = self._build(right)
+        return node
+    
+    def __len__(self):
+        return self._size
+    
+    def stab(self, point):
+        """Items of every interval containing `point`"""
+        found = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                # All of this node's intervals end after the center; keep those already started
+                found.extend(interval[2] for interval in node.by_start[:bisect_right(node.starts, point)])
+                node = node.left
+            elif point > node.center:
+                # All of them started by the center; keep those not yet ended
+                found.extend(interval[2] for interval in node.by_end[bisect_right(node.ends, point):])
+                node = node.right
+            else:
+                found.extend(interval[2] for interval in node.by_start)
+                break
+        return found
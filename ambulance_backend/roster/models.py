@@ -0,0 +1,40 @@
+from django.db import models
+from accounts.models import User
+from ambulances.models import Ambulance
+
+class ShiftAssignment(models.Model):
+    """A crew member rostered onto an ambulance for the half-open window [starts_at, ends_at)"""
+    ROLE_CHOICES = [
+        ('driver', 'Driver'),
+        ('paramedic', 'Paramedic'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='shift_assignments')
+    ambulance = models.ForeignKey(Ambulance, on_delete=models.CASCADE, related_name='shift_assignments')
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    notes = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.user.username} on {self.ambulance.vehicle_number} ({self.starts_at} - {self.ends_at})"
+    
+    class Meta:
+        ordering = ['starts_at', 'ambulance']
+        indexes = [
+            models.Index(fields=['ends_at', 'starts_at'], name='shift_window'),
+            models.Index(fields=['user', 'starts_at'], name='shift_user_start'),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(ends_at__gt=models.F('starts_at')), name='shift_ends_after_start'),
+        ]
+
+class RosterVersion(models.Model):
+    """A single row whose version is bumped in the same transaction as every shift change"""
+    version = models.PositiveBigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"Roster version {self.version}"
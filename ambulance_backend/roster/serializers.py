@@ -0,0 +1,35 @@
+from rest_framework import serializers
+from .models import ShiftAssignment
+
+class ShiftAssignmentSerializer(serializers.ModelSerializer):
+    vehicle_number = serializers.CharField(source='ambulance.vehicle_number', read_only=True)
+    username = serializers.CharField(source='user.username', read_only=True)
+    role = serializers.ChoiceField(choices=ShiftAssignment.ROLE_CHOICES, required=False)
+    
+    class Meta:
+        model = ShiftAssignment
+        fields = [
+            'id', 'user', 'username', 'ambulance', 'vehicle_number', 'role',
+            'starts_at', 'ends_at', 'notes', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate(self, attrs):
+        instance = self.instance
+        user = attrs.get('user', instance.user if instance else None)
+        starts_at = attrs.get('starts_at', instance.starts_at if instance else None)
+        ends_at = attrs.get('ends_at', instance.ends_at if instance else None)
+        
+        if 'role' not in attrs and instance is None:
+            attrs['role'] = user.role
+        if attrs.get('role', instance.role if instance else None) not in dict(ShiftAssignment.ROLE_CHOICES):
+            raise serializers.ValidationError({'role': 'Only drivers and paramedics can be rostered.'})
+        if ends_at <= starts_at:
+            raise serializers.ValidationError({'ends_at': 'Must be after starts_at.'})
+        
+        overlapping = ShiftAssignment.objects.filter(user=user, starts_at__lt=ends_at, ends_at__gt=starts_at)
+        if instance is not None:
+            overlapping = overlapping.exclude(pk=instance.pk)
+        if overlapping.exists():
+            raise serializers.ValidationError({'starts_at': 'This crew member already has a shift in this window.'})
+        return attrs
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .index import bump_roster_version, roster_index
+from .models import ShiftAssignment
+
+@receiver(post_save, sender=ShiftAssignment)
+@receiver(post_delete, sender=ShiftAssignment)
+def refresh_roster_index(sender, instance, **kwargs):
+    bump_roster_version()
+    roster_index.invalidate()
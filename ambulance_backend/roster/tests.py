@@ -0,0 +1,56 @@
+from datetime import timedelta
+import random
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from accounts.models import User
+from ambulances.models import Ambulance
+from .index import roster_index, roster_marker
+from .intervals import IntervalTree
+from .models import ShiftAssignment
+
+class IntervalTreeTests(SimpleTestCase):
+    """stab() must return exactly the half-open intervals containing the point"""
+    
+    def test_stab_matches_brute_force(self):
+        rng = random.Random(3)
+        intervals = []
+        for item in range(400):
+            start = rng.randint(0, 1000)
+            intervals.append((start, start + rng.choice((0, 1, 5, 40, 300)), item))
+        tree = IntervalTree(intervals)
+        self.assertEqual(len(tree), sum(1 for start, end, _ in intervals if start < end))
+        for point in list(range(-2, 1400)) + [rng.uniform(0, 1300) for _ in range(200)]:
+            with self.subTest(point=point):
+                self.assertEqual(
+                    sorted(tree.stab(point)),
+                    sorted(item for start, end, item in intervals if start <= point < end)
+                )
+    
+    def test_empty_tree(self):
+        tree = IntervalTree([])
+        self.assertEqual(len(tree), 0)
+        self.assertEqual(tree.stab(0), [])
+
+class RosterIndexTests(TestCase):
+    def setUp(self):
+        self.driver = User.objects.create_user(username='driver', password='x', role='driver')
+        self.ambulance = Ambulance.objects.create(
+            vehicle_number='T 101 AAA', license_number='L1', model='Land Cruiser', year=2021,
+            last_maintenance=timezone.localdate(), next_maintenance=timezone.localdate(),
+            insurance_expiry=timezone.localdate(),
+        )
+        roster_index.invalidate()
+    
+    def test_shift_changes_bump_the_marker(self):
+        now = timezone.now()
+        before = roster_marker()
+        shift = ShiftAssignment.objects.create(
+            user=self.driver, ambulance=self.ambulance, role='driver',
+            starts_at=now - timedelta(hours=1), ends_at=now + timedelta(hours=1),
+        )
+        after_create = roster_marker()
+        self.assertNotEqual(after_create, before)
+        self.assertEqual(roster_index.crewed_ambulance_ids(), frozenset({self.ambulance.id}))
+        shift.delete()
+        self.assertNotEqual(roster_marker(), after_create)
+        self.assertIsNone(roster_index.crewed_ambulance_ids())
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('roster/shifts/', views.ShiftAssignmentListCreateView.as_view(), name='shift-list-create'),
+    path('roster/shifts/<int:pk>/', views.ShiftAssignmentDetailView.as_view(), name='shift-detail'),
+    path('roster/on-duty/', views.on_duty, name='roster-on-duty'),
+    path('roster/crewed/', views.crewed_ambulances, name='roster-crewed'),
+]
@@ -0,0 +1,105 @@
+from rest_framework import generics, permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from ambulances.scoping import AmbulanceScopedMixin, visible_ambulance_ids
+from .index import roster_index
+from .models import ShiftAssignment
+from .serializers import ShiftAssignmentSerializer
+
+class ShiftAssignmentListCreateView(AmbulanceScopedMixin, generics.ListCreateAPIView):
+    serializer_class = ShiftAssignmentSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    crew_owner_field = 'user'
+    
+    def get_queryset(self):
+        queryset = ShiftAssignment.objects.select_related('user', 'ambulance')
+        
+        # Filter by query parameters
+        user_id = self.request.query_params.get('user_id')
+        ambulance_id = self.request.query_params.get('ambulance_id')
+        starts_before = self.request.query_params.get('starts_before')
+        ends_after = self.request.query_params.get('ends_after')
+        
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+        if ambulance_id:
+            queryset = queryset.filter(ambulance_id=ambulance_id)
+        if starts_before:
+            queryset = queryset.filter(starts_at__lt=starts_before)
+        if ends_after:
+            queryset = queryset.filter(ends_at__gt=ends_after)
+        
+        return queryset
+
+class ShiftAssignmentDetailView(AmbulanceScopedMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = ShiftAssignment.objects.select_related('user', 'ambulance')
+    serializer_class = ShiftAssignmentSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    crew_owner_field = 'user'
+
+def _moment(request):
+    """The ?at= timestamp (ISO 8601, default now); raises ValueError when malformed"""
+    value = request.query_params.get('at')
+    if not value:
+        return timezone.now()
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def on_duty(request):
+    """Get who is on which ambulance at a moment (query param at, ISO 8601; default now)"""
+    try:
+        at = _moment(request)
+    except ValueError:
+        return Response({'error': 'at must be an ISO 8601 datetime'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    visible = visible_ambulance_ids(request)
+    crewed = roster_index.crewed_ambulance_ids(at) or frozenset()
+    ambulances = {}
+    for shift in roster_index.on_duty(at):
+        if visible is not None and shift.ambulance_id not in visible:
+            continue
+        entry = ambulances.setdefault(shift.ambulance_id, {
+            'ambulance_id': shift.ambulance_id,
+            'vehicle_number': shift.vehicle_number,
+            'crewed': shift.ambulance_id in crewed,
+            'crew': [],
+        })
+        entry['crew'].append({
+            'shift_id': shift.shift_id,
+            'user_id': shift.user_id,
+            'name': shift.name,
+            'role': shift.role,
+            'starts_at': shift.starts_at,
+            'ends_at': shift.ends_at,
+        })
+    return Response({
+        'at': at,
+        'ambulances': sorted(ambulances.values(), key=lambda entry: entry['vehicle_number'])
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def crewed_ambulances(request):
+    """Get the ids of ambulances fully crewed at a moment (query param at, ISO 8601; default now)"""
+    try:
+        at = _moment(request)
+    except ValueError:
+        return Response({'error': 'at must be an ISO 8601 datetime'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    crewed = roster_index.crewed_ambulance_ids(at)
+    visible = visible_ambulance_ids(request)
+    if crewed is not None and visible is not None:
+        crewed = crewed & visible
+    return Response({
+        'at': at,
+        'roster_in_use': crewed is not None,
+        'ambulance_ids': sorted(crewed) if crewed is not None else None
+    })
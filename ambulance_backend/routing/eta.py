@@ -0,0 +1,171 @@
+"""
+Travel-time (ETA) engine.
+
+With ``settings.ROAD_NETWORK_FILE`` configured, points are snapped to the
+nearest road node and routed over a contraction hierarchy of the road
+graph (see ``routing.contraction``). The hierarchy is precomputed and kept
+in an ``.eta.npz`` cache next to the road file; see the ``build_eta_cache``
+management command. Node-to-node results are memoised in an LRU cache.
+
+Without a road network, or while its cache is missing or stale, estimates
+fall back to the great-circle distance scaled by a detour factor at an
+average urban speed.
+"""
+import logging
+import os
+import threading
+from collections import namedtuple
+import numpy as np
+from django.conf import settings
+from ambulance_management.lru import ExpiringLRUCache
+from .contraction import ContractionHierarchy
+from .geo import haversine_m
+from .graph import RoadGraph
+
+logger = logging.getLogger(__name__)
+
+Route = namedtuple('Route', ['seconds', 'meters'])
+
+INFINITY = float('inf')
+
+# Bumped whenever the contents of the .eta.npz cache change, so older caches are ignored until rebuilt
+CACHE_FORMAT = 2
+
+class RoadNetworkEngine:
+    def __init__(self, graph, hierarchy, cache_size=100000):
+        self.graph = graph
+        self.hierarchy = hierarchy
+        self._cache = ExpiringLRUCache(cache_size, INFINITY)
+        self.offroad_speed = getattr(settings, 'ETA_OFFROAD_SPEED_KPH', 15) / 3.6
+    
+    @classmethod
+    def precompute(cls, graph, **kwargs):
+        return cls(graph, ContractionHierarchy.build(graph), **kwargs)
+    
+    def save(self, path):
+        graph = self.graph
+        np.savez_compressed(
+            path,
+            format=CACHE_FORMAT,
+            latitudes=graph.latitudes, longitudes=graph.longitudes,
+            sources=graph.edge_sources(), targets=graph.indices,
+            lengths=graph.lengths, seconds=graph.seconds,
+            **self.hierarchy.arrays()
+        )
+    
+    @classmethod
+    def load(cls, path, **kwargs):
+        with np.load(path) as data:
+            graph = RoadGraph(
+                data['latitudes'], data['longitudes'], data['sources'],
+                data['targets'], data['lengths'], data['seconds']
+            )
+            return cls(graph, ContractionHierarchy.from_arrays(data), **kwargs)
+    
+    def _snap(self, point):
+        node, distance = self.graph.nearest_node(*point)
+        return node, distance
+    
+    def _node_route(self, source, target):
+        """Fastest route between two road nodes over the contraction hierarchy; None when unreachable"""
+        if source == target:
+            return Route(0.0, 0.0)
+        cached = self._cache.get((source, target))
+        if cached is not None:
+            return cached
+        found = self.hierarchy.route(source, target)
+        if found is None:
+            return None
+        route = Route(*found)
+        self._cache.set((source, target), route)
+        return route
+    
+    def route(self, origin, destination):
+        """Travel time and distance between two (latitude, longitude) points"""
+        source, source_offset = self._snap(origin)
+        target, target_offset = self._snap(destination)
+        route = self._node_route(source, target)
+        if route is None:
+            return None
+        offset = source_offset + target_offset
+        return Route(route.seconds + offset / self.offroad_speed, route.meters + offset)
+    
+    def routes_to(self, origins, destination):
+        """
+        Routes from many origins to one destination. The destination side of
+        the hierarchy is searched once and shared by every origin.
+        """
+        target, target_offset = self._snap(destination)
+        space = None
+        routes = []
+        for origin in origins:
+            source, offset = self._snap(origin)
+            route = Route(0.0, 0.0) if source == target else self._cache.get((source, target))
+            if route is None:
+                if space is None:
+                    space = self.hierarchy.search_space(target)
+                found = self.hierarchy.route_to(source, space)
+                if found is None:
+                    routes.append(None)
+                    continue
+                route = Route(*found)
+                self._cache.set((source, target), route)
+            offset += target_offset
+            routes.append(Route(route.seconds + offset / self.offroad_speed, route.meters + offset))
+        return routes
+
+class StraightLineEngine:
+    """Fallback estimates from great-circle distance when no road network is configured"""
+    
+    def __init__(self, speed_kph=40, detour_factor=1.3):
+        self.speed = speed_kph / 3.6
+        self.detour_factor = detour_factor
+    
+    def route(self, origin, destination):
+        meters = haversine_m(*origin, *destination) * self.detour_factor
+        return Route(meters / self.speed, meters)
+    
+    def routes_to(self, origins, destination):
+        return [self.route(origin, destination) for origin in origins]
+
+def cache_path_for(road_network_file):
+    return f'{road_network_file}.eta.npz'
+
+def _cache_is_current(cache_path, road_network_file):
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(road_network_file):
+        return False
+    with np.load(cache_path) as data:
+        return 'format' in data and int(data['format']) == CACHE_FORMAT
+
+def build_engine(road_network_file):
+    """
+    Load the road network engine from its precomputed contraction hierarchy,
+    or return None when the cache is missing or older than the road file.
+    Contraction takes minutes on a city network, so it only ever runs in
+    the build_eta_cache command, never on the request path.
+    """
+    cache_path = cache_path_for(road_network_file)
+    if not _cache_is_current(cache_path, road_network_file):
+        logger.error(
+            'No current ETA cache for %s; falling back to straight-line ETAs. '
+            'Run the build_eta_cache management command and restart the workers.', road_network_file
+        )
+        return None
+    return RoadNetworkEngine.load(cache_path, cache_size=getattr(settings, 'ETA_CACHE_SIZE', 100000))
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """The process-wide ETA engine, loaded on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                road_network_file = getattr(settings, 'ROAD_NETWORK_FILE', None)
+                engine = build_engine(road_network_file) if road_network_file else None
+                _engine = engine or StraightLineEngine(
+                    getattr(settings, 'ETA_FALLBACK_SPEED_KPH', 40),
+                    getattr(settings, 'ETA_DETOUR_FACTOR', 1.3)
+                )
+    return _engine
@@ -0,0 +1,76 @@
+import math
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in metres between two points given in degrees"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+def haversine_m_array(lat1, lon1, lat2, lon2):
+    """Vectorized haversine over NumPy arrays (or scalars that broadcast against them)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+def project_m(latitudes, longitudes, reference_latitude):
+    """
+    Equirectangular projection to planar metres around `reference_latitude`.
+    Accurate to well under 1% across a city, which is enough for radius tests.
+    """
+    scale = EARTH_RADIUS_M * math.pi / 180
+    x = np.asarray(longitudes, dtype=np.float64) * scale * math.cos(math.radians(reference_latitude))
+    y = np.asarray(latitudes, dtype=np.float64) * scale
+    return x, y
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_INDEX = {character: index for index, character in enumerate(GEOHASH_ALPHABET)}
+
+def geohash_encode(latitude, longitude, precision=7):
+    """Standard base-32 geohash of a point"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    characters = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(characters) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            characters.append(GEOHASH_ALPHABET[bits])
+            bits = bit_count = 0
+    return ''.join(characters)
+
+def geohash_bounds(cell):
+    """(south, west, north, east) of a geohash cell"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for character in cell:
+        index = GEOHASH_INDEX[character]
+        for shift in range(4, -1, -1):
+            bounds = lon_range if even else lat_range
+            middle = (bounds[0] + bounds[1]) / 2
+            if index >> shift & 1:
+                bounds[0] = middle
+            else:
+                bounds[1] = middle
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+def geohash_center(cell):
+    south, west, north, east = geohash_bounds(cell)
+    return (south + north) / 2, (west + east) / 2
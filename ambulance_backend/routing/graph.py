@@ -0,0 +1,202 @@
+"""
+Road network loading into a compact CSR (compressed sparse row) graph.
+
+Two input formats are supported:
+
+* CSV edge list with a header row and the columns
+  ``source_lat, source_lon, target_lat, target_lon, length_m, speed_kph``
+  and an optional ``oneway`` column (1/true/yes). Nodes are identified by
+  their coordinates; ``length_m`` may be left empty to use the
+  great-circle length.
+* OpenStreetMap XML extracts (``.osm``). Ways tagged ``highway`` become
+  edges, with speeds taken from ``maxspeed`` or the road class.
+"""
+import csv
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+from .geo import haversine_m, haversine_m_array
+
+# Default speeds (km/h) by OSM road class when a way has no usable maxspeed
+OSM_HIGHWAY_SPEEDS = {
+    'motorway': 90, 'motorway_link': 50,
+    'trunk': 70, 'trunk_link': 40,
+    'primary': 50, 'primary_link': 35,
+    'secondary': 40, 'secondary_link': 30,
+    'tertiary': 35, 'tertiary_link': 25,
+    'unclassified': 30, 'residential': 25,
+    'living_street': 10, 'service': 15, 'road': 30,
+}
+
+TRUE_VALUES = ('1', 'true', 'yes')
+
+# Size of the grid buckets used for nearest-node lookups, in degrees (~1 km)
+SPATIAL_CELL_DEGREES = 0.01
+
+class RoadGraph:
+    """
+    Directed road graph in CSR form. The outgoing edges of node ``u`` are
+    ``indices[indptr[u]:indptr[u + 1]]`` with matching ``seconds`` (travel
+    time) and ``lengths`` (metres).
+    """
+    
+    def __init__(self, latitudes, longitudes, sources, targets, lengths, seconds):
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        
+        order = np.argsort(sources, kind='stable')
+        self.indptr = np.zeros(self.node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=self.node_count), out=self.indptr[1:])
+        self.indices = targets[order].astype(np.int32)
+        self.lengths = np.asarray(lengths, dtype=np.float64)[order]
+        self.seconds = np.asarray(seconds, dtype=np.float64)[order]
+        
+        self._build_spatial_index()
+    
+    @property
+    def node_count(self):
+        return len(self.latitudes)
+    
+    @property
+    def edge_count(self):
+        return len(self.indices)
+    
+    def edge_sources(self):
+        return np.repeat(np.arange(self.node_count, dtype=np.int64), np.diff(self.indptr))
+    
+    def _build_spatial_index(self):
+        rows = np.floor(self.latitudes / SPATIAL_CELL_DEGREES).astype(np.int64)
+        cols = np.floor(self.longitudes / SPATIAL_CELL_DEGREES).astype(np.int64)
+        order = np.lexsort((cols, rows))
+        keys = np.stack([rows[order], cols[order]], axis=1)
+        boundaries = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+        self._cells = {}
+        for chunk in np.split(order, boundaries):
+            if len(chunk):
+                self._cells[(int(rows[chunk[0]]), int(cols[chunk[0]]))] = chunk
+    
+    def nearest_node(self, latitude, longitude, max_rings=3):
+        """Return (node, distance in metres) of the node closest to a point"""
+        row = int(np.floor(latitude / SPATIAL_CELL_DEGREES))
+        col = int(np.floor(longitude / SPATIAL_CELL_DEGREES))
+        for ring in range(max_rings + 1):
+            candidates = [
+                self._cells[(r, c)]
+                for r in range(row - ring, row + ring + 1)
+                for c in range(col - ring, col + ring + 1)
+                if (r, c) in self._cells
+            ]
+            if candidates:
+                # One more ring could still hold a closer node, so include it before choosing
+                candidates.extend(
+                    self._cells[(r, c)]
+                    for r in range(row - ring - 1, row + ring + 2)
+                    for c in range(col - ring - 1, col + ring + 2)
+                    if max(abs(r - row), abs(c - col)) == ring + 1 and (r, c) in self._cells
+                )
+                nodes = np.concatenate(candidates)
+                break
+        else:
+            nodes = np.arange(self.node_count)
+        
+        distances = haversine_m_array(latitude, longitude, self.latitudes[nodes], self.longitudes[nodes])
+        best = int(np.argmin(distances))
+        return int(nodes[best]), float(distances[best])
+
+class _NodeTable:
+    """Assigns dense node ids to coordinates or external ids while loading"""
+    
+    def __init__(self):
+        self.ids = {}
+        self.latitudes = []
+        self.longitudes = []
+    
+    def add(self, key, latitude, longitude):
+        node = self.ids.get(key)
+        if node is None:
+            node = self.ids[key] = len(self.latitudes)
+            self.latitudes.append(latitude)
+            self.longitudes.append(longitude)
+        return node
+
+def _edges_to_graph(nodes, edges):
+    """Build a RoadGraph from (source, target, length_m, speed_kph, oneway) tuples"""
+    sources, targets, lengths, seconds = [], [], [], []
+    for source, target, length, speed, oneway in edges:
+        if source == target or speed <= 0:
+            continue
+        travel_seconds = length / (speed / 3.6)
+        sources.append(source)
+        targets.append(target)
+        lengths.append(length)
+        seconds.append(travel_seconds)
+        if not oneway:
+            sources.append(target)
+            targets.append(source)
+            lengths.append(length)
+            seconds.append(travel_seconds)
+    if not sources:
+        raise ValueError('The road network contains no usable edges')
+    return RoadGraph(nodes.latitudes, nodes.longitudes, sources, targets, lengths, seconds)
+
+def load_csv(path):
+    nodes = _NodeTable()
+    edges = []
+    with open(path, newline='') as handle:
+        for row in csv.DictReader(handle):
+            source_lat, source_lon = float(row['source_lat']), float(row['source_lon'])
+            target_lat, target_lon = float(row['target_lat']), float(row['target_lon'])
+            source = nodes.add((round(source_lat, 6), round(source_lon, 6)), source_lat, source_lon)
+            target = nodes.add((round(target_lat, 6), round(target_lon, 6)), target_lat, target_lon)
+            length = row.get('length_m')
+            length = float(length) if length else haversine_m(source_lat, source_lon, target_lat, target_lon)
+            oneway = (row.get('oneway') or '').strip().lower() in TRUE_VALUES
+            edges.append((source, target, length, float(row['speed_kph']), oneway))
+    return _edges_to_graph(nodes, edges)
+
+def _parse_maxspeed(value):
+    if not value:
+        return None
+    try:
+        speed = float(value.split()[0])
+    except ValueError:
+        return None
+    return speed * 1.609344 if 'mph' in value else speed
+
+def load_osm(path):
+    coordinates = {}
+    ways = []
+    for _, element in ElementTree.iterparse(path, events=('end',)):
+        if element.tag == 'node':
+            coordinates[element.get('id')] = (float(element.get('lat')), float(element.get('lon')))
+        elif element.tag == 'way':
+            tags = {tag.get('k'): tag.get('v') for tag in element.iter('tag')}
+            highway = tags.get('highway')
+            if highway in OSM_HIGHWAY_SPEEDS:
+                refs = [nd.get('ref') for nd in element.iter('nd')]
+                speed = _parse_maxspeed(tags.get('maxspeed')) or OSM_HIGHWAY_SPEEDS[highway]
+                oneway = tags.get('oneway', '').lower()
+                if highway in ('motorway', 'motorway_link'):
+                    oneway = oneway or 'yes'
+                if oneway == '-1':
+                    refs.reverse()
+                ways.append((refs, speed, oneway in TRUE_VALUES or oneway == '-1'))
+        if element.tag in ('node', 'way', 'relation'):
+            element.clear()
+    
+    nodes = _NodeTable()
+    edges = []
+    for refs, speed, oneway in ways:
+        points = [(ref, coordinates[ref]) for ref in refs if ref in coordinates]
+        for (ref_a, (lat_a, lon_a)), (ref_b, (lat_b, lon_b)) in zip(points, points[1:]):
+            source = nodes.add(ref_a, lat_a, lon_a)
+            target = nodes.add(ref_b, lat_b, lon_b)
+            edges.append((source, target, haversine_m(lat_a, lon_a, lat_b, lon_b), speed, oneway))
+    return _edges_to_graph(nodes, edges)
+
+def load_road_network(path):
+    path = str(path)
+    if path.lower().endswith(('.osm', '.xml')):
+        return load_osm(path)
+    return load_csv(path)
@@ -0,0 +1,28 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from routing.eta import RoadNetworkEngine, cache_path_for
+from routing.graph import load_road_network
+
+class Command(BaseCommand):
+    help = 'Load the road network and precompute the contraction hierarchy used by the ETA engine'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='Road network file (defaults to settings.ROAD_NETWORK_FILE)')
+    
+    def handle(self, *args, **options):
+        road_network_file = options['file'] or getattr(settings, 'ROAD_NETWORK_FILE', None)
+        if not road_network_file:
+            raise CommandError('No road network configured; set ROAD_NETWORK_FILE or pass --file')
+        
+        started = time.perf_counter()
+        graph = load_road_network(road_network_file)
+        self.stdout.write(f'Loaded {graph.node_count} nodes and {graph.edge_count} edges')
+        
+        engine = RoadNetworkEngine.precompute(graph)
+        cache_path = cache_path_for(road_network_file)
+        engine.save(cache_path)
+        self.stdout.write(self.style.SUCCESS(
+            f'Contracted into {engine.hierarchy.edge_count} up/down edges in {time.perf_counter() - started:.1f}s; '
+            f'saved {cache_path}'
+        ))
@@ -0,0 +1,91 @@
+import heapq
+import numpy as np
+from django.test import SimpleTestCase
+from .contraction import ContractionHierarchy
+from .graph import RoadGraph
+
+def dijkstra(graph, source):
+    """(seconds, meters) of the fastest route from `source` to every reachable node"""
+    best = {source: (0.0, 0.0)}
+    heap = [(0.0, 0.0, source)]
+    while heap:
+        seconds, meters, node = heapq.heappop(heap)
+        if seconds > best[node][0]:
+            continue
+        for edge in range(graph.indptr[node], graph.indptr[node + 1]):
+            neighbour = int(graph.indices[edge])
+            candidate = seconds + graph.seconds[edge]
+            if neighbour not in best or candidate < best[neighbour][0]:
+                best[neighbour] = (candidate, meters + graph.lengths[edge])
+                heapq.heappush(heap, (candidate, best[neighbour][1], neighbour))
+    return best
+
+def random_grid(size, seed):
+    """A size x size street grid with random speeds, some one-way streets and one isolated node"""
+    rng = np.random.default_rng(seed)
+    node_count = size * size + 1
+    sources, targets, lengths, seconds = [], [], [], []
+    for row in range(size):
+        for column in range(size):
+            node = row * size + column
+            for neighbour in ((node + 1) if column + 1 < size else None, (node + size) if row + 1 < size else None):
+                if neighbour is None:
+                    continue
+                length = float(rng.uniform(80, 400))
+                travel = length / (float(rng.uniform(10, 80)) / 3.6)
+                directions = [(node, neighbour), (neighbour, node)]
+                if rng.random() < 0.2:
+                    directions = directions[:1] if rng.random() < 0.5 else directions[1:]
+                for source, target in directions:
+                    sources.append(source)
+                    targets.append(target)
+                    lengths.append(length)
+                    seconds.append(travel)
+    # A slower parallel edge, which the hierarchy must never prefer
+    sources.append(0)
+    targets.append(1)
+    lengths.append(1.0)
+    seconds.append(1e6)
+    latitudes = rng.uniform(-6.9, -6.7, node_count)
+    longitudes = rng.uniform(39.1, 39.3, node_count)
+    return RoadGraph(latitudes, longitudes, sources, targets, lengths, seconds)
+
+class ContractionHierarchyTests(SimpleTestCase):
+    """Hierarchy queries must match plain Dijkstra over the uncontracted graph"""
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.graph = random_grid(12, seed=7)
+        cls.hierarchy = ContractionHierarchy.build(cls.graph)
+    
+    def assertSameRoute(self, route, expected):
+        if expected is None:
+            self.assertIsNone(route)
+            return
+        self.assertIsNotNone(route)
+        self.assertAlmostEqual(route[0], expected[0], places=6)
+        self.assertAlmostEqual(route[1], expected[1], places=6)
+    
+    def test_routes_match_dijkstra(self):
+        rng = np.random.default_rng(11)
+        sources = rng.choice(self.graph.node_count, 15, replace=False).tolist() + [self.graph.node_count - 1]
+        for source in sources:
+            expected = dijkstra(self.graph, source)
+            for target in range(self.graph.node_count):
+                with self.subTest(source=source, target=target):
+                    self.assertSameRoute(self.hierarchy.route(source, target), expected.get(target))
+    
+    def test_search_space_matches_route(self):
+        for target in (0, 77, self.graph.node_count - 1):
+            space = self.hierarchy.search_space(target)
+            for source in range(self.graph.node_count):
+                with self.subTest(source=source, target=target):
+                    self.assertSameRoute(
+                        self.hierarchy.route_to(source, space), dijkstra(self.graph, source).get(target)
+                    )
+    
+    def test_arrays_round_trip(self):
+        restored = ContractionHierarchy.from_arrays(self.hierarchy.arrays())
+        for source, target in ((0, 143), (143, 0), (5, 60)):
+            self.assertEqual(restored.route(source, target), self.hierarchy.route(source, target))
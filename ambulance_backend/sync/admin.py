@@ -0,0 +1,15 @@
+from django.contrib import admin
+from .models import IdempotencyRecord, SyncMutation
+
+@admin.register(SyncMutation)
+class SyncMutationAdmin(admin.ModelAdmin):
+    list_display = ('device_id', 'user', 'mutation_type', 'status', 'client_timestamp', 'applied_at')
+    list_filter = ('mutation_type', 'status', 'applied_at')
+    search_fields = ('device_id', 'idempotency_key', 'user__username')
+    readonly_fields = ('applied_at',)
+
+@admin.register(IdempotencyRecord)
+class IdempotencyRecordAdmin(admin.ModelAdmin):
+    list_display = ('key', 'status', 'created_at')
+    list_filter = ('status',)
+    readonly_fields = ('created_at',)
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncMutation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('device_id', models.CharField(max_length=100)),
+                ('idempotency_key', models.CharField(max_length=100)),
+                ('mutation_type', models.CharField(max_length=50)),
+                ('client_timestamp', models.DateTimeField()),
+                ('status', models.CharField(choices=[('applied', 'Applied'), ('stale', 'Stale'), ('error', 'Error')], max_length=20)),
+                ('response', models.JSONField(default=dict)),
+                ('applied_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_mutations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-applied_at'],
+                'unique_together': {('user', 'device_id', 'idempotency_key')},
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+class SyncMutation(models.Model):
+    """A queued client mutation that has been applied, kept so replays are idempotent"""
+    STATUS_CHOICES = [
+        ('applied', 'Applied'),
+        ('stale', 'Stale'),
+        ('error', 'Error'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sync_mutations')
+    device_id = models.CharField(max_length=100)
+    idempotency_key = models.CharField(max_length=100)
+    mutation_type = models.CharField(max_length=50)
+    client_timestamp = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    
+    # Result returned to the device, replayed verbatim for duplicates
+    response = models.JSONField(default=dict)
+    
+    applied_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.device_id} - {self.mutation_type} - {self.idempotency_key}"
+    
+    class Meta:
+        ordering = ['-applied_at']
+        unique_together = ['user', 'device_id', 'idempotency_key']
+
+class IdempotencyRecord(models.Model):
+    """
+    A mutating request sent with an Idempotency-Key header. While the first
+    request runs, the row is its claim on the key (status is null). Afterwards
+    it holds the response that retries get back. One table serves every worker.
+    """
+    # sha256 of the caller's credentials, method, path and header value
+    key = models.CharField(max_length=64, unique=True)
+    fingerprint = models.CharField(max_length=64)
+    status = models.PositiveSmallIntegerField(null=True, blank=True)
+    headers = models.JSONField(default=list)
+    content = models.BinaryField(default=b'')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return f"{self.key[:12]} - {self.status or 'in flight'}"
+    
+    class Meta:
+        ordering = ['-created_at']
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+class SyncMutationSerializer(serializers.Serializer):
+    TYPE_CHOICES = [
+        ('driver_inspection', 'Driver Inspection'),
+        ('paramedic_inspection', 'Paramedic Inspection'),
+        ('ambulance_location', 'Ambulance Location'),
+        ('call_status', 'Call Status'),
+    ]
+    
+    idempotency_key = serializers.CharField(max_length=100)
+    type = serializers.ChoiceField(choices=TYPE_CHOICES)
+    client_timestamp = serializers.DateTimeField()
+    payload = serializers.DictField()
+
+class SyncRequestSerializer(serializers.Serializer):
+    device_id = serializers.CharField(max_length=100)
+    sync_token = serializers.CharField(required=False, allow_blank=True)
+    mutations = SyncMutationSerializer(many=True, required=False, default=list, max_length=500)
@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import permissions, serializers, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from ambulances.models import Ambulance
+from ambulances.scoping import CREW_ROLES, crew_scope_errors, scope_queryset
+from ambulances.serializers import AmbulanceLocationUpdateSerializer
+from dispatch.models import EmergencyCall, Trip
+from reports.serializers import DriverInspectionCreateSerializer, ParamedicInspectionCreateSerializer
+from .models import SyncMutation
+from .serializers import SyncRequestSerializer
+
+# Rows committed by concurrent transactions can carry an updated_at slightly older
+# than the token handed out, so deltas re-read a short window before the token.
+SYNC_TOKEN_OVERLAP = timedelta(seconds=5)
+
+# Calls in these states are closed; replayed status changes must not reopen them
+CLOSED_CALL_STATUSES = ('completed', 'cancelled')
+
+def encode_sync_token(moment):
+    return str(int(moment.timestamp() * 1000))
+
+def decode_sync_token(token):
+    """Return the datetime a token was issued at, or None for a first sync"""
+    if not token:
+        return None
+    return datetime.fromtimestamp(int(token) / 1000, tz=dt_timezone.utc)
+
+# Mutation handlers
+def _save_inspection(request, serializer_class, payload, owner_field):
+    # Crew devices always file under the signed-in user, and only for their own ambulances
+    if request.user.role in CREW_ROLES:
+        payload = {**payload, owner_field: request.user.pk}
+    serializer = serializer_class(data=payload)
+    serializer.is_valid(raise_exception=True)
+    errors = crew_scope_errors(request, serializer.validated_data, owner_field)
+    if errors:
+        raise serializers.ValidationError(errors)
+    instance = serializer.save()
+    return 'applied', {'id': instance.id}
+
+def _apply_driver_inspection(request, payload, client_timestamp):
+    return _save_inspection(request, DriverInspectionCreateSerializer, payload, 'driver')
+
+def _apply_paramedic_inspection(request, payload, client_timestamp):
+    return _save_inspection(request, ParamedicInspectionCreateSerializer, payload, 'paramedic')
+
+def _apply_ambulance_location(request, payload, client_timestamp):
+    try:
+        ambulance = scope_queryset(Ambulance.objects.all(), request, ('id',)).get(pk=payload.get('ambulance'))
+    except (Ambulance.DoesNotExist, ValueError, TypeError):
+        raise serializers.ValidationError({'ambulance': ['Ambulance not found']})
+    
+    serializer = AmbulanceLocationUpdateSerializer(
+        ambulance, data=payload, partial=True, context={'recorded_at': client_timestamp}
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return 'applied', {'id': ambulance.id}
+
+def _apply_call_status(request, payload, client_timestamp):
+    try:
+        call = scope_queryset(
+            EmergencyCall.objects.select_related('assigned_ambulance'), request, ('assigned_ambulance',)
+        ).get(pk=payload.get('call'))
+    except (EmergencyCall.DoesNotExist, ValueError, TypeError):
+        raise serializers.ValidationError({'call': ['Emergency call not found']})
+    
+    new_status = payload.get('status')
+    if new_status not in dict(EmergencyCall.STATUS_CHOICES):
+        raise serializers.ValidationError({'status': ['Invalid status']})
+    
+    # The call was closed on the server while the device was offline
+    if call.status in CLOSED_CALL_STATUSES and call.status != new_status:
+        return 'stale', {'id': call.id, 'server_status': call.status}
+    
+    call.update_status(new_status)
+    return 'applied', {'id': call.id}
+
+MUTATION_HANDLERS = {
+    'driver_inspection': _apply_driver_inspection,
+    'paramedic_inspection': _apply_paramedic_inspection,
+    'ambulance_location': _apply_ambulance_location,
+    'call_status': _apply_call_status,
+}
+
+def _apply_mutation(request, mutation):
+    handler = MUTATION_HANDLERS[mutation['type']]
+    try:
+        # Savepoint per mutation so one failure does not roll back the batch
+        with transaction.atomic():
+            mutation_status, data = handler(request, mutation['payload'], mutation['client_timestamp'])
+    except serializers.ValidationError as exc:
+        mutation_status, data = 'error', {'errors': exc.detail}
+    return {
+        'idempotency_key': mutation['idempotency_key'],
+        'status': mutation_status,
+        **data
+    }
+
+# Server-side delta
+def _changes_since(request, since):
+    # Crews only receive changes for the ambulances they are assigned to
+    ambulances = scope_queryset(Ambulance.objects.all(), request, ('id',))
+    calls = scope_queryset(EmergencyCall.objects.all(), request, ('assigned_ambulance',))
+    trips = scope_queryset(Trip.objects.all(), request)
+    
+    if since is None:
+        # First sync: send the current open state only
+        calls = calls.exclude(status__in=CLOSED_CALL_STATUSES)
+        trips = trips.filter(status='active')
+    else:
+        changed_after = since - SYNC_TOKEN_OVERLAP
+        ambulances = ambulances.filter(updated_at__gte=changed_after)
+        calls = calls.filter(updated_at__gte=changed_after)
+        trips = trips.filter(updated_at__gte=changed_after)
+    
+    return {
+        'ambulances': list(ambulances.values(
+            'id', 'status', 'latitude', 'longitude', 'assigned_driver', 'assigned_paramedic', 'updated_at'
+        )),
+        'emergency_calls': list(calls.values(
+            'id', 'status', 'priority', 'latitude', 'longitude', 'address',
+            'assigned_ambulance', 'patient', 'updated_at'
+        )),
+        'trips': list(trips.values(
+            'id', 'call', 'ambulance', 'patient', 'status', 'start_time', 'end_time', 'updated_at'
+        )),
+    }
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def sync(request):
+    """
+    Apply a device's queued mutations in client timestamp order inside one
+    transaction, then return the server-side changes since its last sync token.
+    Mutations whose idempotency key was already applied are answered from the
+    stored result instead of being re-applied.
+    """
+    serializer = SyncRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    device_id = serializer.validated_data['device_id']
+    try:
+        since = decode_sync_token(serializer.validated_data.get('sync_token'))
+    except (ValueError, OverflowError):
+        return Response({'error': 'Invalid sync_token'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Issued before anything is read, so changes made while this request runs are sent next time
+    next_token = timezone.now()
+    
+    mutations = sorted(serializer.validated_data['mutations'], key=lambda mutation: mutation['client_timestamp'])
+    results = []
+    with transaction.atomic():
+        applied = {
+            record.idempotency_key: record
+            for record in SyncMutation.objects.filter(
+                user=request.user,
+                device_id=device_id,
+                idempotency_key__in=[mutation['idempotency_key'] for mutation in mutations]
+            )
+        }
+        
+        for mutation in mutations:
+            record = applied.get(mutation['idempotency_key'])
+            if record is not None:
+                results.append({**record.response, 'duplicate': True})
+                continue
+            
+            result = _apply_mutation(request, mutation)
+            applied[mutation['idempotency_key']] = SyncMutation.objects.create(
+                user=request.user,
+                device_id=device_id,
+                idempotency_key=mutation['idempotency_key'],
+                mutation_type=mutation['type'],
+                client_timestamp=mutation['client_timestamp'],
+                status=result['status'],
+                response=result
+            )
+            results.append(result)
+    
+    return Response({
+        'sync_token': encode_sync_token(next_token),
+        'results': results,
+        'changes': _changes_since(request, since)
+    })